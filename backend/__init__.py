@@ -5,5 +5,18 @@ from .camera_handler import CameraHandler
 from .settings_manager import SettingsManager
 from .user_manager import UserManager
 from .face_recognition import FaceRecognition
+from .recognition_worker import RecognitionWorker
+from .attendance_log import AttendanceLog
+from .frame import Frame
+from .frame_scheduler import FrameScheduler
+from .recognition_pool import RecognitionPool
+from .face_loader import FaceLoader
+from .training_job import TrainingJob
+from .camera_manager import CameraManager
+from .gate_service import GateService
+from .http_api import GateAPI
+from .event_bus import EventBus
 
-__all__ = ['CameraHandler', 'SettingsManager', 'UserManager', 'FaceRecognition']
\ No newline at end of file
+__all__ = ['CameraHandler', 'SettingsManager', 'UserManager', 'FaceRecognition', 'RecognitionWorker',
+           'AttendanceLog', 'Frame', 'FrameScheduler',
+           'RecognitionPool', 'FaceLoader', 'TrainingJob', 'CameraManager', 'GateService', 'GateAPI', 'EventBus']
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Attendance Log - Log kehadiran append-only (SQLite WAL)
+
+Setiap siswa yang dikenali dicatat sebagai event "arrival", maksimal satu kali
+per config.ATTENDANCE_DEBOUNCE_SECONDS. Penulisan dilakukan batch di background
+thread, jadi UI / recognition worker tidak pernah menunggu disk.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+import config
+
+
+class AttendanceLog:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            ts REAL NOT NULL,
+            confidence REAL,
+            camera TEXT,
+            kind TEXT NOT NULL DEFAULT 'arrival'
+        );
+        CREATE INDEX IF NOT EXISTS idx_events_user_ts ON events (user_id, ts);
+        CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+    """
+
+    def __init__(self, db_path=None, debounce_seconds=None, flush_interval=None):
+        self.db_path = db_path or config.ATTENDANCE_DB
+        self.debounce_seconds = (config.ATTENDANCE_DEBOUNCE_SECONDS
+                                 if debounce_seconds is None else debounce_seconds)
+        self.flush_interval = (config.ATTENDANCE_FLUSH_INTERVAL
+                               if flush_interval is None else flush_interval)
+
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.last_seen = {}       # user_id -> ts sighting terakhir (semua frame)
+        self.last_event = {}      # user_id -> ts event terakhir yang ditulis
+
+        self.is_running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self):
+        """Buat tabel + load event terakhir per user"""
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.executescript(self.SCHEMA)
+                rows = conn.execute(
+                    "SELECT user_id, MAX(ts) FROM events GROUP BY user_id"
+                ).fetchall()
+            finally:
+                conn.close()
+
+            for user_id, ts in rows:
+                self.last_event[user_id] = ts
+                self.last_seen[user_id] = ts
+
+            print(f"✅ Attendance log ready: {self.db_path}")
+
+        except Exception as e:
+            print(f"❌ Error opening attendance log: {e}")
+
+    def start(self):
+        """Start writer thread"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop writer thread (flush sisa event)"""
+        self.is_running = False
+        self._stop_event.set()
+
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+        else:
+            self.flush()
+
+    def record(self, user_id, confidence=None, camera=None, ts=None):
+        """
+        Catat sighting. Return True jika menghasilkan event arrival baru,
+        False jika masih dalam jendela debounce.
+        """
+        ts = time.time() if ts is None else ts
+
+        with self.lock:
+            self.last_seen[user_id] = ts
+
+            last = self.last_event.get(user_id)
+            if last is not None and ts - last < self.debounce_seconds:
+                return False
+
+            self.last_event[user_id] = ts
+
+        self.queue.put((user_id, ts, confidence, camera, "arrival"))
+        return True
+
+    def get_last_seen(self, user_id):
+        """Waktu terakhir user terlihat (ISO string) atau None"""
+        ts = self.last_seen.get(user_id)
+        if ts is None:
+            return None
+        return datetime.fromtimestamp(ts).isoformat()
+
+    def recent_events(self, limit=50, user_id=None):
+        """Event terbaru yang sudah tertulis di disk"""
+        conn = self._connect()
+        try:
+            if user_id is None:
+                rows = conn.execute(
+                    "SELECT user_id, ts, confidence, camera, kind FROM events "
+                    "ORDER BY ts DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT user_id, ts, confidence, camera, kind FROM events "
+                    "WHERE user_id = ? ORDER BY ts DESC LIMIT ?", (user_id, limit)
+                ).fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "user_id": user_id,
+                "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                "confidence": confidence,
+                "camera": camera,
+                "kind": kind
+            }
+            for user_id, ts, confidence, camera, kind in rows
+        ]
+
+    def flush(self):
+        """Tulis semua event yang masih antri (blocking, dari thread pemanggil)"""
+        batch = self._drain()
+        if batch:
+            self._write(batch)
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _write(self, batch):
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO events (user_id, ts, confidence, camera, kind) "
+                        "VALUES (?, ?, ?, ?, ?)", batch
+                    )
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"❌ Error writing attendance: {e}")
+
+    def _writer_loop(self):
+        """Kumpulkan event lalu commit sekali per flush_interval"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+        self.flush()
@@ -0,0 +1,187 @@
+"""
+Camera Discovery - Daftar kamera tanpa membuka stream satu per satu
+
+Di Linux, /sys/class/video4linux memberi daftar node /dev/videoN beserta
+nama device. Kemampuan capture dicek dengan ioctl VIDIOC_QUERYCAP (node
+dibuka non-blocking, stream tidak dimulai), jadi node metadata yang dibuat
+driver UVC tidak ikut di-probe. Kandidat lalu di-probe paralel (buka + baca
+satu frame) dengan batas waktu, dan hasilnya di-cache per set device: cache
+otomatis kedaluwarsa saat kamera dicolok / dicabut.
+
+Tanpa sysfs (Windows / macOS) index 0..max_check-1 di-probe paralel tanpa cache.
+"""
+import glob
+import os
+import threading
+import time
+import cv2
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+SYSFS_ROOT = "/sys/class/video4linux"
+
+# struct v4l2_capability (104 byte): driver[16] card[32] bus_info[32] version
+# capabilities device_caps reserved[3]
+VIDIOC_QUERYCAP = 0x80685600
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _read(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def query_capture(dev_path):
+    """True/False dari VIDIOC_QUERYCAP, None jika tidak bisa dicek"""
+    if fcntl is None:
+        return None
+    try:
+        fd = os.open(dev_path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return None
+    try:
+        buf = bytearray(104)
+        fcntl.ioctl(fd, VIDIOC_QUERYCAP, buf)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+    capabilities = int.from_bytes(buf[84:88], "little")
+    device_caps = int.from_bytes(buf[88:92], "little")
+    caps = device_caps if capabilities & V4L2_CAP_DEVICE_CAPS else capabilities
+    return bool(caps & V4L2_CAP_VIDEO_CAPTURE)
+
+
+def list_video_devices(sysfs_root=SYSFS_ROOT):
+    """Node video dari sysfs: [{index, path, name, capture}], None jika tidak ada sysfs"""
+    if not os.path.isdir(sysfs_root):
+        return None
+
+    devices = []
+    for entry in glob.glob(os.path.join(sysfs_root, "video*")):
+        node = os.path.basename(entry)
+        if not node[5:].isdigit():
+            continue
+
+        path = os.path.join("/dev", node)
+        capture = query_capture(path)
+        if capture is None:
+            # Tanpa akses ioctl: node pertama tiap device (index 0) adalah node capture
+            capture = _read(os.path.join(entry, "index")) in (None, "0")
+
+        devices.append({
+            "index": int(node[5:]),
+            "path": path,
+            "name": _read(os.path.join(entry, "name")) or node,
+            "capture": capture
+        })
+
+    return sorted(devices, key=lambda d: d["index"])
+
+
+def probe(index):
+    """Buka device + baca satu frame"""
+    try:
+        if os.name == 'nt':
+            cap = cv2.VideoCapture(index, cv2.CAP_DSHOW)
+        elif os.path.isdir(SYSFS_ROOT):
+            cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+        else:
+            cap = cv2.VideoCapture(index)
+        try:
+            return cap.isOpened() and cap.read()[0]
+        finally:
+            cap.release()
+    except Exception:
+        return False
+
+
+def probe_all(indices, timeout):
+    """Probe paralel; device yang tidak menjawab dalam timeout dianggap tidak ada"""
+    results = {}
+    threads = []
+    for index in indices:
+        # Daemon: probe yang macet di driver tidak menahan aplikasi saat keluar
+        thread = threading.Thread(target=lambda i=index: results.__setitem__(i, probe(i)),
+                                  name=f"camera-probe-{index}", daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    return [index for index in indices if results.get(index)]
+
+
+def discover_cameras(current=None, max_check=None, timeout=None, refresh=False):
+    """
+    Kamera yang bisa dipakai: [{index, name, in_use}] urut index.
+    current: index device yang sedang terbuka di CameraHandler; ikut tanpa
+    di-probe (device yang sedang dipakai bisa gagal dibuka kedua kali).
+    Index yang hanya dikonfigurasi harus di-probe seperti kamera lain.
+    """
+    max_check = config.CAMERA_PROBE_MAX if max_check is None else max_check
+    timeout = config.CAMERA_PROBE_TIMEOUT if timeout is None else timeout
+
+    devices = list_video_devices()
+    if devices is None:
+        key = None
+        names = {}
+        candidates = list(range(max_check))
+    else:
+        key = tuple((d["path"], d["name"], d["capture"]) for d in devices)
+        names = {d["index"]: d["name"] for d in devices}
+        candidates = [d["index"] for d in devices if d["capture"]]
+
+    if key is not None and not refresh:
+        with _cache_lock:
+            cached = _cache.get((key, current))
+        if cached is not None:
+            return cached
+
+    candidates = [index for index in candidates if index != current]
+    found = probe_all(candidates, timeout)
+    if current is not None:
+        found.append(current)
+
+    cameras = [{"index": index, "name": names.get(index, f"Kamera {index}"), "in_use": index == current}
+               for index in sorted(set(found))]
+
+    if key is not None:
+        with _cache_lock:
+            _cache.clear()
+            _cache[(key, current)] = cameras
+    return cameras
+
+
+def discover_cameras_async(callback, **kwargs):
+    """discover_cameras di background thread, lalu callback(cameras) dari thread itu"""
+    def run():
+        try:
+            cameras = discover_cameras(**kwargs)
+        except Exception as e:
+            print(f"❌ Camera discovery error: {e}")
+            cameras = []
+        callback(cameras)
+
+    thread = threading.Thread(target=run, name="camera-discovery", daemon=True)
+    thread.start()
+    return thread
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
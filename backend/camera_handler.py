@@ -2,10 +2,16 @@
 Camera Handler
 """
 import cv2
+import numpy as np
 import threading
 import time
 import os
 import sys
+import config
+from .frame_ring import FrameRing
+from .frame_sources import FrameSource, DeviceSource, open_source
+from . import camera_discovery
+from .event_bus import CAMERA_DOWN, CAMERA_UP
 
 # Suppress ALL OpenCV warnings
 os.environ["OPENCV_LOG_LEVEL"] = "OFF"
@@ -27,20 +33,82 @@ class SuppressStream:
         self.null.close()
 
 
-class CameraHandler:
-    # Cache available cameras
-    _cached_cameras = None
+class CaptureStats:
+    """FPS grab/deliver (jendela 1 detik) + counter frame dibuang"""
+    
+    def __init__(self):
+        self.frames_grabbed = 0
+        self.frames_delivered = 0
+        self.frames_skipped = 0     # di-grab tapi tidak di-decode (tidak ada consumer)
+        self.frames_dropped = 0     # gagal decode / ring penuh
+        self.errors = 0
+        self.reconnects = 0
+        self.last_error = None
+        self.grab_fps = 0.0
+        self.delivered_fps = 0.0
+        
+        self._window_start = time.time()
+        self._window_grabbed = 0
+        self._window_delivered = 0
     
-    def __init__(self, camera_index=0, width=1920, height=1080):
+    def grabbed(self, now):
+        self.frames_grabbed += 1
+        self._window_grabbed += 1
+        
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.grab_fps = self._window_grabbed / elapsed
+            self.delivered_fps = self._window_delivered / elapsed
+            self._window_start = now
+            self._window_grabbed = 0
+            self._window_delivered = 0
+    
+    def delivered(self, now):
+        self.frames_delivered += 1
+        self._window_delivered += 1
+    
+    def to_dict(self):
+        return {
+            "grab_fps": round(self.grab_fps, 1),
+            "delivered_fps": round(self.delivered_fps, 1),
+            "frames_grabbed": self.frames_grabbed,
+            "frames_delivered": self.frames_delivered,
+            "frames_skipped": self.frames_skipped,
+            "frames_dropped": self.frames_dropped,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error
+        }
+
+
+class CameraHandler:
+    def __init__(self, camera_index=0, width=1920, height=1080, camera_id=None, pacing=None, loop=None,
+                 start_time=None):
+        """
+        camera_index: index device, path video, folder gambar, "synthetic" atau
+        FrameSource (lihat backend/frame_sources.py). pacing/loop/start_time untuk
+        sumber non-device; start_time=None = waktu start() (tetap saat reconnect)
+        """
         self.camera_index = camera_index
+        self._camera_id = camera_id
         self.width = width
         self.height = height
+        self.pacing = pacing
+        self.loop = loop
+        self.start_time = start_time
         
-        self.cap = None
-        self.frame = None
+        self.source = None
+        self._next_start = None  # start_time sumber saat dibuka (ulang), lanjut dari frame terakhir
+        self.ring = FrameRing(config.FRAME_RING_SIZE)
         self.is_running = False
         self.thread = None
         self.lock = threading.Lock()
+        self._scratch = None  # buffer baca sebelum di-flip ke slot ring
+        self._frame_shape = None
+        self._stop_event = threading.Event()
+        self.stats = CaptureStats()
+        self.event_bus = None   # opsional: publish camera_down / camera_up
+        self.frame_listener = None  # opsional: dipanggil (capture thread) setiap frame baru di ring
         
         # Flip settings
         self.flip_horizontal = False
@@ -52,27 +120,15 @@ class CameraHandler:
             return True
         
         try:
-            with SuppressStream():
-                # Use DSHOW on Windows
-                if os.name == 'nt':
-                    self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-                else:
-                    self.cap = cv2.VideoCapture(self.camera_index)
-            
-            if not self.cap.isOpened():
-                print(f"❌ Failed to open camera {self.camera_index}")
+            start_time = self.start_time
+            if start_time is None and isinstance(self.camera_index, FrameSource):
+                start_time = self.camera_index.start_time
+            self._next_start = time.time() if start_time is None else start_time
+            if not self._open():
                 return False
             
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-            
-            actual_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            print(f"✅ Camera {self.camera_index} started: {actual_w}x{actual_h}")
-            
             self.is_running = True
+            self._stop_event.clear()
             self.thread = threading.Thread(target=self._capture_loop, daemon=True)
             self.thread.start()
             
@@ -82,52 +138,194 @@ class CameraHandler:
             print(f"❌ Camera error: {e}")
             return False
     
+    def _open(self):
+        """Buka sumber frame (device + set resolusi). Return True jika berhasil"""
+        source = open_source(self.camera_index, width=self.width, height=self.height,
+                             pacing=self.pacing, loop=self.loop, start_time=self._next_start)
+        if source is self.camera_index:
+            source.start_time = self._next_start
+        with SuppressStream():
+            opened = source.open()
+        
+        if not opened:
+            print(f"❌ Failed to open camera {self.camera_index}")
+            source.release()
+            return False
+        
+        self.source = source
+        print(f"✅ Camera {self.camera_id} started: {source.describe()}, {source.fps:.0f} fps")
+        return True
+    
+    def _release(self):
+        if self.source:
+            with SuppressStream():
+                self.source.release()
+            self.source = None
+    
+    def _flip_code(self):
+        """Kode cv2.flip sesuai setting, None jika tidak di-flip"""
+        if self.flip_horizontal and self.flip_vertical:
+            return -1
+        if self.flip_horizontal:
+            return 1
+        if self.flip_vertical:
+            return 0
+        return None
+    
+    def _retrieve_into_ring(self):
+        """Decode frame yang sudah di-grab langsung ke slot ring (tanpa alokasi per frame)"""
+        flip_code = self._flip_code()
+        target = None
+        
+        if flip_code is None and self._frame_shape is not None:
+            target = self.ring.acquire(self._frame_shape)
+            if target is None:
+                # Semua slot sedang dipinjam
+                return False
+            ret, frame = self.source.retrieve(target)
+        else:
+            # Dengan flip / frame pertama: decode ke scratch lalu tulis ke slot
+            ret, frame = self.source.retrieve(self._scratch)
+            if ret:
+                self._scratch = frame
+        
+        if not ret or frame is None:
+            return False
+        
+        self._frame_shape = frame.shape
+        
+        # Frame pertama, resolusi berubah, atau flip: tulis dari scratch ke slot
+        if frame is not target:
+            target = self.ring.acquire(frame.shape)
+            if target is None:
+                return False
+            if flip_code is None:
+                np.copyto(target, frame)
+            else:
+                cv2.flip(frame, flip_code, dst=target)
+        
+        # Timestamp dari sumber (deterministik untuk file / synthetic)
+        self.ring.publish(self.source.timestamp())
+        if self.frame_listener is not None:
+            self.frame_listener(self)
+        return True
+    
     def _capture_loop(self):
-        """Capture loop"""
+        """
+        Capture loop: grab() memblok sampai device mengirim frame, decode
+        (retrieve) hanya jika ada consumer yang menginginkan frame baru.
+        """
+        failures = 0
+        backoff = config.CAMERA_RECONNECT_BACKOFF[0]
+        
         while self.is_running:
             try:
-                if self.cap and self.cap.isOpened():
-                    ret, frame = self.cap.read()
-                    
-                    if ret and frame is not None:
-                        # Apply flip
-                        if self.flip_horizontal and self.flip_vertical:
-                            frame = cv2.flip(frame, -1)
-                        elif self.flip_horizontal:
-                            frame = cv2.flip(frame, 1)
-                        elif self.flip_vertical:
-                            frame = cv2.flip(frame, 0)
-                        
-                        # Convert BGR to RGB
-                        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        
-                        with self.lock:
-                            self.frame = frame_rgb
+                if self.source is None or not self.source.is_opened():
+                    raise IOError("device tidak terbuka")
+                
+                # Sumber non-device: grab() juga menahan tempo (pacing realtime)
+                if not self.source.grab():
+                    if self.source.finished:
+                        # File / folder habis tanpa loop: berhenti, bukan error
+                        print(f"⏹️ Camera {self.camera_id}: {self.source.describe()} selesai")
+                        self.stats.last_error = "end of stream"
+                        self.is_running = False
+                        break
+                    raise IOError("grab gagal")
+                
+                now = time.time()
+                self.stats.grabbed(now)
+                
+                if not self.ring.has_demand():
+                    # Tidak ada yang membaca: frame dibuang tanpa decode
+                    self.stats.frames_skipped += 1
+                    continue
                 
-                time.sleep(0.01)
+                # BGR mentah ke ring, konversi (RGB/gray) dilakukan lazy di Frame
+                if self._retrieve_into_ring():
+                    self.stats.delivered(now)
+                else:
+                    self.stats.frames_dropped += 1
+                
+                failures = 0
+                backoff = config.CAMERA_RECONNECT_BACKOFF[0]
+                
+            except Exception as e:
+                failures += 1
+                self.stats.errors += 1
+                self.stats.last_error = str(e)
+                
+                if failures < config.CAMERA_MAX_FAILURES:
+                    continue
+                
+                # Device hilang / macet: tutup lalu buka ulang dengan backoff
+                print(f"❌ Camera {self.camera_index} error: {e} - reconnect dalam {backoff:.1f}s")
+                if self.source is not None:
+                    self._publish(CAMERA_DOWN, error=str(e), reconnects=self.stats.reconnects)
+                    if self.source.index >= 0:
+                        # Waktu media lanjut setelah reconnect (tidak mundur / reset ke jam dinding)
+                        self._next_start = self.source.timestamp() + 1.0 / self.source.fps
+                self._release()
+                if self._stop_event.wait(backoff):
+                    break
+                backoff = min(backoff * 2, config.CAMERA_RECONNECT_BACKOFF[1])
                 
-            except:
-                time.sleep(0.1)
+                with self.lock:
+                    if not self.is_running:
+                        break
+                    if self._open():
+                        self.stats.reconnects += 1
+                        failures = 0
+                        self._publish(CAMERA_UP, reconnects=self.stats.reconnects)
+    
+    def _publish(self, kind, **data):
+        if self.event_bus is not None:
+            self.event_bus.publish(kind, camera=self.camera_id, **data)
+    
+    @property
+    def camera_id(self):
+        """Id kamera di hasil / event (default: index device atau path file)"""
+        return self._camera_id if self._camera_id is not None else str(self.camera_index)
+    
+    def get_stats(self):
+        """FPS yang benar-benar di-deliver, frame dibuang, reconnect"""
+        return self.stats.to_dict()
+    
+    @property
+    def frame_seq(self):
+        return self.ring.seq
     
     def get_frame(self):
-        """Get current frame"""
-        with self.lock:
-            if self.frame is not None:
-                return self.frame.copy()
+        """Get current frame (RGB copy)"""
+        with self.ring.borrow() as (seq, frame):
+            if frame is not None:
+                return frame.rgb.copy()
         return None
     
+    def get_latest_frame(self):
+        """Frame terbaru (copy) + sequence number. Tanpa copy: borrow_frame()"""
+        return self.ring.get_latest()
+    
+    def wait_for_frame_newer_than(self, seq, timeout=None):
+        """Blok sampai ada frame dengan sequence > seq. Return (seq, Frame copy) / (seq, None)"""
+        return self.ring.wait_newer_than(seq, timeout)
+    
+    def borrow_frame(self, newer_than=None, timeout=None):
+        """Context manager: pinjam frame terbaru, slotnya tidak ditimpa selama dipakai"""
+        return self.ring.borrow(newer_than, timeout)
+    
     def stop(self):
         """Stop camera"""
         self.is_running = False
+        self._stop_event.set()
+        self.ring.wake_all()
         
         if self.thread:
             self.thread.join(timeout=1)
             self.thread = None
         
-        if self.cap:
-            with SuppressStream():
-                self.cap.release()
-            self.cap = None
+        with self.lock:
+            self._release()
         
         print(f"✅ Camera {self.camera_index} stopped")
     
@@ -149,46 +347,32 @@ class CameraHandler:
             return self.start()
         return True
     
-    def get_available_cameras(self, max_check=3):
-        """Get available cameras (cached, no warnings)"""
-        # Return cached if available
-        if CameraHandler._cached_cameras is not None:
-            return CameraHandler._cached_cameras
-        
-        available = []
-        
-        # Current camera is always available
-        available.append(self.camera_index)
-        
-        # Check others with suppressed output
+    def get_available_cameras(self, max_check=None):
+        """Index kamera yang bisa dipakai (sysfs + probe paralel, cache per set device)"""
+        return [camera["index"] for camera in self.discover_cameras(max_check=max_check)]
+    
+    def discover_cameras(self, max_check=None, refresh=False):
+        """[{index, name, in_use}] kamera yang bisa dipakai, device yang sedang terbuka tidak di-probe ulang"""
         with SuppressStream():
-            for i in range(max_check):
-                if i == self.camera_index:
-                    continue
-                try:
-                    if os.name == 'nt':
-                        cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
-                    else:
-                        cap = cv2.VideoCapture(i)
-                    
-                    if cap.isOpened():
-                        ret, _ = cap.read()
-                        if ret:
-                            available.append(i)
-                        cap.release()
-                except:
-                    pass
-        
-        # Sort and cache
-        available = sorted(list(set(available)))
-        CameraHandler._cached_cameras = available
-        
-        return available
+            return camera_discovery.discover_cameras(current=self._open_device(),
+                                                     max_check=max_check, refresh=refresh)
+    
+    def discover_cameras_async(self, callback, refresh=False):
+        """Seperti discover_cameras tapi di background; callback(cameras) dari thread lain"""
+        return camera_discovery.discover_cameras_async(callback, current=self._open_device(),
+                                                       refresh=refresh)
+    
+    def _open_device(self):
+        """Index device yang sedang terbuka di handler ini, None jika tidak ada"""
+        source = self.source
+        if isinstance(source, DeviceSource) and source.is_opened():
+            return source.device_index
+        return None
     
     @staticmethod
     def clear_camera_cache():
         """Clear camera cache"""
-        CameraHandler._cached_cameras = None
+        camera_discovery.clear_cache()
     
     def __del__(self):
         self.stop()
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Camera Manager - Beberapa kamera gate dalam satu proses
+
+Setiap kamera punya CameraHandler dan RecognitionWorker sendiri (tracker,
+hasil terakhir, statistik), tapi deteksi + rekognisi dikerjakan pool thread
+bersama. Pool memilih kamera secara adil: dari kamera yang punya frame baru
+dan sudah boleh direkognisi lagi (target fps per kamera), yang paling lama
+tidak dilayani didahulukan, dan satu kamera tidak pernah diproses dua thread
+sekaligus. Kamera dengan fps tinggi tidak bisa memonopoli pool.
+
+    manager = CameraManager({"masuk": 0, "keluar": "keluar.mp4"}, face_recognition)
+    manager.start()
+    manager.get_result("masuk")
+"""
+import os
+import threading
+import time
+import config
+from .camera_handler import CameraHandler
+from .recognition_worker import RecognitionWorker
+
+
+class CameraStream:
+    """Satu kamera di manager: handler + worker + state penjadwalan"""
+
+    def __init__(self, camera_id, camera_handler, worker):
+        self.camera_id = camera_id
+        self.camera_handler = camera_handler
+        self.worker = worker
+
+        self.busy = False       # sedang diproses salah satu thread pool
+        self.served_at = 0.0    # perf_counter terakhir kali dilayani
+        self.served = 0
+
+    def is_ready(self):
+        """Ada frame baru + scan aktif (target fps dicek terpisah)"""
+        return (not self.busy and self.worker.is_active()
+                and self.camera_handler.frame_seq > self.worker.last_seq)
+
+    def get_stats(self):
+        return {
+            "source": str(self.camera_handler.camera_index),
+            "running": self.camera_handler.is_running,
+            "served": self.served,
+            "camera": self.camera_handler.get_stats(),
+            "recognition": self.worker.get_stats()
+        }
+
+
+class CameraManager:
+    def __init__(self, sources, face_recognition, event_bus=None, workers=None,
+                 width=None, height=None, pacing=None, loop=None, start_time=None):
+        """
+        sources: dict camera_id -> sumber (index device, path video, folder
+        gambar, "synthetic"), atau list (camera_id = sumber sebagai string).
+        start_time: basis timestamp sumber non-device (None = waktu start)
+        """
+        if not isinstance(sources, dict):
+            sources = {str(source): source for source in sources}
+        if not sources:
+            raise ValueError("minimal satu kamera")
+
+        self.face_recognition = face_recognition
+        self.event_bus = event_bus
+
+        self.streams = {}
+        for camera_id, source in sources.items():
+            camera_handler = CameraHandler(
+                camera_index=source,
+                width=width or config.CAMERA_WIDTH,
+                height=height or config.CAMERA_HEIGHT,
+                camera_id=str(camera_id),
+                pacing=pacing,
+                loop=loop,
+                start_time=start_time
+            )
+            camera_handler.event_bus = event_bus
+            camera_handler.frame_listener = self._on_frame
+            worker = RecognitionWorker(camera_handler, face_recognition, event_bus=event_bus)
+            self.streams[str(camera_id)] = CameraStream(str(camera_id), camera_handler, worker)
+
+        workers = workers or config.MULTI_CAMERA_WORKERS
+        self.worker_count = workers or min(len(self.streams), os.cpu_count() or 1)
+
+        self.is_running = False
+        self.threads = []
+        self._cond = threading.Condition()
+
+    @property
+    def camera_handlers(self):
+        return [stream.camera_handler for stream in self.streams.values()]
+
+    def start(self):
+        """Start semua kamera + pool worker (scan aktif)"""
+        if self.is_running:
+            return
+
+        for stream in self.streams.values():
+            stream.camera_handler.start()
+            stream.worker.set_active(True)
+
+        self.is_running = True
+        self.threads = [
+            threading.Thread(target=self._worker_loop, name=f"camera-pool-{i}", daemon=True)
+            for i in range(self.worker_count)
+        ]
+        for thread in self.threads:
+            thread.start()
+        print(f"✅ Camera manager started: {len(self.streams)} cameras, {self.worker_count} workers")
+
+    def stop(self):
+        """Stop pool lalu semua kamera"""
+        with self._cond:
+            self.is_running = False
+            self._cond.notify_all()
+
+        for thread in self.threads:
+            thread.join(timeout=1)
+        self.threads = []
+
+        for stream in self.streams.values():
+            stream.camera_handler.stop()
+        print("✅ Camera manager stopped")
+
+    def set_active(self, active, camera_id=None):
+        """Aktifkan/nonaktifkan scanning (semua kamera atau satu)"""
+        for stream in self._select(camera_id):
+            stream.worker.set_active(active)
+        with self._cond:
+            self._cond.notify_all()
+
+    def _select(self, camera_id):
+        if camera_id is None:
+            return list(self.streams.values())
+        return [self.streams[camera_id]]
+
+    # ------------------------------------------------------------ scheduling
+    def _on_frame(self, camera_handler):
+        """Dipanggil capture thread setiap frame baru: bangunkan satu worker"""
+        with self._cond:
+            self._cond.notify()
+
+    def _claim(self):
+        """Kamera siap yang paling lama tidak dilayani; blok sampai ada (None saat stop)"""
+        with self._cond:
+            while self.is_running:
+                chosen = None
+                wait = config.FRAME_WAIT_TIMEOUT
+
+                for stream in self.streams.values():
+                    if not stream.is_ready():
+                        continue
+                    # Target fps rekognisi per kamera
+                    delay = stream.worker.scheduler.recognition_delay()
+                    if delay > 0:
+                        wait = min(wait, delay)
+                        continue
+                    if chosen is None or stream.served_at < chosen.served_at:
+                        chosen = stream
+
+                if chosen is not None:
+                    chosen.busy = True
+                    chosen.served_at = time.perf_counter()
+                    chosen.served += 1
+                    return chosen
+
+                self._cond.wait(wait)
+        return None
+
+    def _release(self, stream):
+        with self._cond:
+            stream.busy = False
+            self._cond.notify()
+
+    def _worker_loop(self):
+        while self.is_running:
+            stream = self._claim()
+            if stream is None:
+                break
+
+            try:
+                # Frame terbaru dipinjam selama diproses (slot tidak ditimpa capture)
+                with stream.camera_handler.borrow_frame() as (seq, frame):
+                    if frame is not None and seq > stream.worker.last_seq:
+                        stream.worker.process_frame(seq, frame)
+            except Exception as e:
+                print(f"❌ Camera {stream.camera_id} recognition error: {e}")
+                time.sleep(0.1)
+            finally:
+                self._release(stream)
+
+    # ----------------------------------------------------------------- query
+    def get_result(self, camera_id, max_age=None):
+        return self.streams[camera_id].worker.get_result(max_age)
+
+    def get_results(self, max_age=None):
+        """camera_id -> hasil terakhir (None jika tidak ada / terlalu lama)"""
+        return {camera_id: stream.worker.get_result(max_age)
+                for camera_id, stream in self.streams.items()}
+
+    def get_stats(self):
+        """Statistik per kamera (fps capture & rekognisi, latency) + pool"""
+        return {
+            "workers": self.worker_count,
+            "cameras": {camera_id: stream.get_stats() for camera_id, stream in self.streams.items()}
+        }
@@ -0,0 +1,257 @@
+"""
+Event Bus - Publish/subscribe event pipeline (asyncio)
+
+Pipeline (RecognitionWorker, CameraHandler) memanggil publish() dari thread
+mana saja tanpa pernah menunggu: event diserahkan ke event loop milik bus
+lewat call_soon_threadsafe. Setiap subscriber punya asyncio.Queue terbatas
+sendiri; jika penuh, event dibuang sesuai drop policy subscriber tersebut,
+jadi consumer yang lambat tidak pernah menahan kamera maupun consumer lain.
+
+    bus = EventBus()
+    bus.start()
+    bus.subscribe("attendance", handler, kinds=(STUDENT_RECOGNIZED,))
+    bus.publish(STUDENT_RECOGNIZED, camera="0", user_id=1, confidence=42.0)
+
+Handler coroutine dijalankan di loop bus (harus cepat / non-blocking),
+handler biasa dijalankan di thread executor.
+"""
+import asyncio
+import inspect
+import itertools
+import threading
+import time
+import config
+
+# Jenis event
+FACE_DETECTED = "face_detected"            # frame dengan >= 1 wajah
+STUDENT_RECOGNIZED = "student_recognized"  # satu wajah dikenali sebagai siswa
+UNKNOWN_FACE = "unknown_face"              # satu wajah tidak dikenali
+CAMERA_DOWN = "camera_down"                # kamera gagal, sedang reconnect
+CAMERA_UP = "camera_up"                    # kamera tersambung lagi
+
+EVENT_KINDS = (FACE_DETECTED, STUDENT_RECOGNIZED, UNKNOWN_FACE, CAMERA_DOWN, CAMERA_UP)
+
+# Drop policy saat antrian subscriber penuh
+DROP_OLDEST = "drop_oldest"  # buang event terlama (consumer selalu mendapat yang terbaru)
+DROP_NEWEST = "drop_newest"  # buang event yang baru datang (urutan awal dipertahankan)
+
+
+class Event:
+    """Satu event pipeline (immutable setelah dibuat)"""
+
+    __slots__ = ("event_id", "kind", "timestamp", "published_at", "data")
+
+    def __init__(self, event_id, kind, timestamp, data, published_at=None):
+        self.event_id = event_id
+        self.kind = kind
+        self.timestamp = timestamp  # waktu kejadian (mis. frame diambil, bisa waktu media)
+        self.published_at = time.time() if published_at is None else published_at
+        self.data = data
+
+    def to_dict(self):
+        return dict(self.data, id=self.event_id, kind=self.kind, timestamp=self.timestamp)
+
+
+class Subscription:
+    """Satu consumer: antrian terbatas + task yang memanggil handler"""
+
+    def __init__(self, name, handler, kinds, maxsize, policy):
+        if policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"drop policy tidak dikenal: {policy}")
+
+        self.name = name
+        self.handler = handler
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.maxsize = maxsize
+        self.policy = policy
+        self.is_async = inspect.iscoroutinefunction(handler)
+
+        self.queue = None   # dibuat di loop bus
+        self.task = None
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+
+    def accepts(self, event):
+        return self.kinds is None or event.kind in self.kinds
+
+    def to_dict(self):
+        return {
+            "kinds": sorted(self.kinds) if self.kinds is not None else None,
+            "policy": self.policy,
+            "maxsize": self.maxsize,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "received": self.received,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error
+        }
+
+
+class EventBus:
+    def __init__(self, queue_size=None):
+        self.queue_size = config.EVENT_QUEUE_SIZE if queue_size is None else queue_size
+
+        self.subscriptions = {}   # name -> Subscription
+        self.published = 0
+
+        self.loop = None
+        self.thread = None
+        self.is_running = False
+        self._ids = itertools.count(1)
+        self._ready = threading.Event()
+
+    def start(self):
+        """Start event loop bus di background thread"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._ready.clear()
+        self.thread = threading.Thread(target=self._run, name="event-bus", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        print("✅ Event bus started")
+
+    def stop(self, timeout=None):
+        """Stop bus; consumer diberi waktu menghabiskan antrian (mis. attendance)"""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        timeout = config.EVENT_STOP_TIMEOUT if timeout is None else timeout
+        loop = self.loop
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain(timeout), loop).result(timeout + 1)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+        print("✅ Event bus stopped")
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        for sub in list(self.subscriptions.values()):
+            self._attach(sub)
+        self._ready.set()
+
+        try:
+            self.loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+            self.loop = None
+
+    async def _drain(self, timeout):
+        waits = [sub.queue.join() for sub in self.subscriptions.values() if sub.queue is not None]
+        if waits:
+            try:
+                await asyncio.wait_for(asyncio.gather(*waits), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    # -------------------------------------------------------------- subscribe
+    def subscribe(self, name, handler, kinds=None, maxsize=None, policy=DROP_OLDEST):
+        """
+        Daftarkan consumer. kinds: jenis event yang diterima (None = semua).
+        Return fungsi unsubscribe
+        """
+        if name in self.subscriptions:
+            raise ValueError(f"subscriber {name} sudah terdaftar")
+
+        sub = Subscription(name, handler, kinds,
+                           self.queue_size if maxsize is None else maxsize, policy)
+        self.subscriptions[name] = sub
+        if self.is_running:
+            self.loop.call_soon_threadsafe(self._attach, sub)
+
+        def unsubscribe():
+            if self.subscriptions.get(name) is not sub:
+                return
+            del self.subscriptions[name]
+            loop = self.loop
+            if loop is not None and sub.task is not None:
+                loop.call_soon_threadsafe(sub.task.cancel)
+
+        return unsubscribe
+
+    def _attach(self, sub):
+        """Buat antrian + task consumer (di thread loop)"""
+        if self.subscriptions.get(sub.name) is not sub or sub.task is not None:
+            return
+        sub.queue = asyncio.Queue(sub.maxsize)
+        sub.task = self.loop.create_task(self._consume(sub))
+
+    # ---------------------------------------------------------------- publish
+    def publish(self, kind, timestamp=None, **data):
+        """Kirim event dari thread mana saja (tidak pernah blok). Return Event"""
+        event = Event(next(self._ids), kind, time.time() if timestamp is None else timestamp, data)
+
+        loop = self.loop
+        if loop is None or not self.is_running:
+            return event
+        try:
+            loop.call_soon_threadsafe(self._dispatch, event)
+        except RuntimeError:
+            # Loop sudah ditutup (bus sedang stop)
+            pass
+        return event
+
+    def _dispatch(self, event):
+        """Masukkan event ke antrian setiap subscriber (di thread loop, tidak pernah await)"""
+        self.published += 1
+
+        for sub in list(self.subscriptions.values()):
+            if sub.queue is None or not sub.accepts(event):
+                continue
+            sub.received += 1
+
+            if sub.queue.full():
+                sub.dropped += 1
+                if sub.policy == DROP_NEWEST:
+                    continue
+                sub.queue.get_nowait()
+                sub.queue.task_done()
+
+            sub.queue.put_nowait(event)
+
+    async def _consume(self, sub):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            event = await sub.queue.get()
+            try:
+                if sub.is_async:
+                    await sub.handler(event)
+                else:
+                    await loop.run_in_executor(None, sub.handler, event)
+                sub.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                sub.errors += 1
+                sub.last_error = str(e)
+                if sub.errors == 1:
+                    print(f"❌ Event consumer {sub.name} error: {e}")
+            finally:
+                sub.queue.task_done()
+
+    def get_stats(self):
+        """Counter per subscriber (received / delivered / dropped)"""
+        return {
+            "published": self.published,
+            "subscribers": {name: sub.to_dict() for name, sub in list(self.subscriptions.items())}
+        }
@@ -0,0 +1,174 @@
+"""
+Event Consumers - Subscriber standar untuk EventBus
+
+    OverlayConsumer     banner "Selamat datang" / kamera terputus di layar utama
+    AttendanceConsumer  catat kehadiran siswa yang dikenali (AttendanceLog)
+    WebhookConsumer     notifikasi orang tua: POST JSON ke config.WEBHOOK_URL
+    MetricsConsumer     counter per jenis event + delay publish -> consumer
+
+Masing-masing memilih ukuran antrian & drop policy sendiri (lihat attach).
+
+event.timestamp adalah waktu frame diambil dan bisa berupa waktu media
+(file / synthetic, --start-time). Semua yang dibandingkan dengan jam dinding
+(hold banner, waktu kehadiran, debounce) memakai event.published_at.
+"""
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+import config
+from .event_bus import (FACE_DETECTED, STUDENT_RECOGNIZED, UNKNOWN_FACE, CAMERA_DOWN, CAMERA_UP,
+                        EVENT_KINDS, DROP_OLDEST)
+from .recognition_worker import LatestSlot, StageStats
+
+
+class OverlayConsumer:
+    """Event terakhir untuk banner UI (dibaca loop Tk, tidak pernah antri)"""
+
+    KINDS = (STUDENT_RECOGNIZED, CAMERA_DOWN, CAMERA_UP)
+
+    def __init__(self, hold_seconds=None):
+        self.hold_seconds = config.OVERLAY_HOLD_SECONDS if hold_seconds is None else hold_seconds
+        self.latest = LatestSlot()
+
+    def attach(self, bus):
+        # Hanya event terbaru yang relevan untuk layar
+        return bus.subscribe("overlay", self.handle, kinds=self.KINDS, maxsize=1, policy=DROP_OLDEST)
+
+    async def handle(self, event):
+        self.latest.publish(event)
+
+    def get_banner(self, now=None):
+        """(text, warna) untuk banner, None jika tidak ada yang ditampilkan"""
+        event = self.latest.get()
+        if event is None or event.kind == CAMERA_UP:
+            return None
+        if event.kind == CAMERA_DOWN:
+            return "⚠️ Kamera terputus, menyambung ulang...", config.COLOR_DANGER
+
+        if (now or time.time()) - event.published_at > self.hold_seconds:
+            return None
+        return f"Selamat datang, {event.data.get('nama_anak')}", config.COLOR_SUCCESS
+
+
+class AttendanceConsumer:
+    """Sighting siswa -> UserManager.update_last_seen (debounce di AttendanceLog)"""
+
+    def __init__(self, user_manager):
+        self.user_manager = user_manager
+
+    def attach(self, bus):
+        return bus.subscribe("attendance", self.handle, kinds=(STUDENT_RECOGNIZED,), policy=DROP_OLDEST)
+
+    def handle(self, event):
+        # Handler biasa: dijalankan di executor (store JSON bisa menulis ke disk)
+        self.user_manager.update_last_seen(event.data["user_id"], event.data.get("confidence"),
+                                           event.data.get("camera"), ts=event.published_at)
+
+
+class WebhookConsumer:
+    """Notifikasi kedatangan siswa ke webhook lokal, sekali per siswa per debounce"""
+
+    def __init__(self, url=None, debounce_seconds=None, timeout=None):
+        self.url = url or config.WEBHOOK_URL
+        self.debounce_seconds = (config.WEBHOOK_DEBOUNCE_SECONDS
+                                 if debounce_seconds is None else debounce_seconds)
+        self.timeout = config.WEBHOOK_TIMEOUT if timeout is None else timeout
+
+        self.last_sent = {}   # user_id -> published_at event yang terakhir dikirim
+        self.sent = 0
+        self.failed = 0
+        self.last_error = None
+
+    def attach(self, bus):
+        return bus.subscribe("webhook", self.handle, kinds=(STUDENT_RECOGNIZED,), policy=DROP_OLDEST)
+
+    async def handle(self, event):
+        user_id = event.data["user_id"]
+        last = self.last_sent.get(user_id)
+        if last is not None and event.published_at - last < self.debounce_seconds:
+            return
+        # Dicatat sebelum kirim: webhook mati tidak memicu retry setiap frame
+        self.last_sent[user_id] = event.published_at
+
+        payload = {
+            "event": event.kind,
+            "user_id": user_id,
+            "nama_anak": event.data.get("nama_anak"),
+            "kelas": event.data.get("kelas"),
+            "camera": event.data.get("camera"),
+            "confidence": event.data.get("confidence"),
+            "timestamp": event.published_at,
+            "captured_at": event.timestamp   # waktu frame (media time untuk replay / latency)
+        }
+
+        try:
+            status = await asyncio.wait_for(self._post(payload), self.timeout)
+            if 200 <= status < 300:
+                self.sent += 1
+                return
+            raise IOError(f"HTTP {status}")
+        except (OSError, ValueError, asyncio.TimeoutError) as e:
+            self.failed += 1
+            self.last_error = str(e) or type(e).__name__
+            if self.failed == 1:
+                print(f"❌ Webhook {self.url} error: {self.last_error}")
+
+    async def _post(self, payload):
+        """POST JSON (HTTP/1.1 polos), return status code"""
+        url = urlsplit(self.url)
+        if url.scheme != "http":
+            raise ValueError("webhook hanya mendukung http://")
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"POST {url.path or '/'} HTTP/1.1\r\n"
+                f"Host: {url.netloc}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n")
+
+        reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+        try:
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+            status_line = await reader.readline()
+        finally:
+            writer.close()
+
+        return int(status_line.split()[1])
+
+    def to_dict(self):
+        return {"url": self.url, "sent": self.sent, "failed": self.failed, "last_error": self.last_error}
+
+
+class MetricsConsumer:
+    """Counter per jenis event + delay dari publish sampai event diterima consumer"""
+
+    def __init__(self):
+        self.counts = {kind: 0 for kind in EVENT_KINDS}
+        self.last_at = {}
+        self.delay = StageStats()
+        self.camera_down_since = None
+
+    def attach(self, bus):
+        return bus.subscribe("metrics", self.handle, policy=DROP_OLDEST)
+
+    async def handle(self, event):
+        self.counts[event.kind] = self.counts.get(event.kind, 0) + 1
+        self.last_at[event.kind] = event.published_at
+        self.delay.add((time.time() - event.published_at) * 1000)
+
+        if event.kind == CAMERA_DOWN and self.camera_down_since is None:
+            self.camera_down_since = event.published_at
+        elif event.kind == CAMERA_UP:
+            self.camera_down_since = None
+
+    def to_dict(self):
+        faces = self.counts[STUDENT_RECOGNIZED] + self.counts[UNKNOWN_FACE]
+        return {
+            "counts": dict(self.counts),
+            "unknown_ratio": round(self.counts[UNKNOWN_FACE] / faces, 3) if faces else None,
+            "frames_with_faces": self.counts[FACE_DETECTED],
+            "camera_down_since": self.camera_down_since,
+            "delay": self.delay.to_dict()
+        }
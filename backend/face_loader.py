@@ -0,0 +1,130 @@
+"""
+Face Loader - Baca dataset wajah untuk training (paralel + streaming + cache)
+
+Foto .jpg setiap user di-decode di thread pool (cv2.imread melepas GIL) dan
+dikirim dalam chunk, jadi training tidak perlu menampung semua foto sekaligus.
+Hasil preprocessing (grayscale 200x200) disimpan sebagai satu file .npy packed
+per user di config.FACE_CACHE_DIR. Cache dipakai lagi selama tidak ada file
+wajah (atau folder user) yang lebih baru dari file cache.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+import config
+from .persistence import save_npy
+
+FACE_SIZE = (200, 200)
+
+
+def _read_face(path):
+    """Decode satu foto -> grayscale 200x200 (None jika gagal)"""
+    face = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if face is None:
+        return None
+    if face.shape[:2] != FACE_SIZE:
+        face = cv2.resize(face, FACE_SIZE)
+    return face
+
+
+class FaceLoader:
+    def __init__(self, cache_dir=None, threads=None, chunk_size=None):
+        self.cache_dir = cache_dir or config.FACE_CACHE_DIR
+        self.threads = threads or config.FACE_LOADER_THREADS or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.FACE_LOADER_CHUNK_SIZE
+
+    @staticmethod
+    def list_faces(user):
+        """Path semua foto wajah satu user (urut nama file)"""
+        face_dir = user["face_dir"]
+        if not os.path.isdir(face_dir):
+            return []
+        return [os.path.join(face_dir, name)
+                for name in sorted(os.listdir(face_dir)) if name.endswith('.jpg')]
+
+    def _cache_path(self, user):
+        return os.path.join(self.cache_dir, f"user_{user['id']}.npy")
+
+    def _load_cache(self, user, paths):
+        """Array cache jika masih valid (tidak ada file lebih baru, jumlah sama)"""
+        cache_path = self._cache_path(user)
+        try:
+            cache_mtime = os.stat(cache_path).st_mtime_ns
+            newest = max([os.stat(path).st_mtime_ns for path in paths] +
+                         [os.stat(user["face_dir"]).st_mtime_ns])
+            if newest >= cache_mtime:
+                return None
+
+            faces = np.load(cache_path)
+            if faces.shape[1:] != FACE_SIZE or len(faces) != len(paths):
+                return None
+            return faces
+
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache(self, user, faces):
+        try:
+            save_npy(self._cache_path(user), faces)
+        except OSError as e:
+            print(f"⚠️ Error saving face cache: {e}")
+
+    def drop_cache(self, user_id):
+        """Hapus cache satu user (mis. saat user dihapus)"""
+        try:
+            os.remove(os.path.join(self.cache_dir, f"user_{user_id}.npy"))
+        except OSError:
+            pass
+
+    def iter_chunks(self, users, progress=None):
+        """
+        Stream wajah semua user: yield (user, faces) dengan faces (K, 200, 200) uint8,
+        K <= chunk_size. progress(done, total) dipanggil setelah setiap chunk.
+        """
+        plan = [(user, self.list_faces(user)) for user in users]
+        total = sum(len(paths) for _, paths in plan)
+        done = 0
+
+        if progress:
+            progress(0, total)
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            for user, paths in plan:
+                if not paths:
+                    continue
+
+                cached = self._load_cache(user, paths)
+                if cached is not None:
+                    for start in range(0, len(cached), self.chunk_size):
+                        chunk = cached[start:start + self.chunk_size]
+                        done += len(chunk)
+                        yield user, chunk
+                        if progress:
+                            progress(done, total)
+                    continue
+
+                # Semua foto user di-submit sekaligus: decode jalan terus selama
+                # consumer memproses chunk sebelumnya. Hasil lalu disimpan ke cache.
+                results = executor.map(_read_face, paths)
+                decoded = []
+                for start in range(0, len(paths), self.chunk_size):
+                    batch = [next(results) for _ in paths[start:start + self.chunk_size]]
+                    faces = [face for face in batch if face is not None]
+                    done += len(batch)
+
+                    if faces:
+                        chunk = np.stack(faces)
+                        decoded.append(chunk)
+                        yield user, chunk
+                    if progress:
+                        progress(done, total)
+
+                if decoded and sum(len(chunk) for chunk in decoded) == len(paths):
+                    self._save_cache(user, np.concatenate(decoded))
+
+    def load_user(self, user, progress=None):
+        """Semua wajah satu user sebagai satu array (K, 200, 200)"""
+        chunks = [faces for _, faces in self.iter_chunks([user], progress)]
+        if not chunks:
+            return np.zeros((0,) + FACE_SIZE, dtype=np.uint8)
+        return np.concatenate(chunks)
@@ -5,20 +5,46 @@ import cv2
 import numpy as np
 import os
 import json
+import threading
 import config
+from . import lbph
+from .model_store import (ModelStore, convert_legacy_model, params_from_header,
+                          pack_labels, unpack_labels)
+from .persistence import write_json
+from .matcher import LBPHMatcher
+from .training_manifest import TrainingManifest
+from .frame import Frame
+from .face_loader import FaceLoader
+from .training_job import TrainingJob, TrainingCancelled
 
 
 class FaceRecognition:
     def __init__(self):
         self.face_cascade = None
-        self.recognizer = None
+        self.cascade_path = None
+        self._thread_cascades = threading.local()  # CascadeClassifier tidak thread-safe
+        self.params = lbph.default_params()
+        self.matcher = LBPHMatcher()
         self.is_trained = False
         self.label_to_user = {}
+        # Tuning (bisa diganti live, lihat apply_settings)
+        self.detection_width = config.DETECTION_WIDTH
+        self.scale_factor = config.FACE_SCALE_FACTOR
+        self.min_neighbors = config.FACE_MIN_NEIGHBORS
+        self.confidence_threshold = config.CONFIDENCE_THRESHOLD
+        self.model_store = ModelStore()
+        self.manifest = TrainingManifest()
+        self.model_generation = 0
+        self.stored_model = None  # (generation, histograms matcher) yang sama dengan isi ModelStore
+        self.face_loader = FaceLoader()
+        self.model_lock = threading.RLock()  # serialisasi train/sync/enroll/remove
+        self.jobs = []
+        self.recognition_pool = None  # RecognitionPool opsional untuk banyak wajah per frame
         
         self._ensure_directories()
         self._load_cascade()
-        self._init_recognizer()
         self._load_model()  # Auto load model saat startup
+        self.manifest.load()
     
     def _ensure_directories(self):
         """Buat folder yang diperlukan"""
@@ -28,10 +54,11 @@ class FaceRecognition:
         """Load Haarcascade"""
         try:
             if os.path.exists(config.HAARCASCADE_FILE):
-                self.face_cascade = cv2.CascadeClassifier(config.HAARCASCADE_FILE)
+                self.cascade_path = config.HAARCASCADE_FILE
             else:
-                cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-                self.face_cascade = cv2.CascadeClassifier(cascade_path)
+                self.cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            self.face_cascade = cv2.CascadeClassifier(self.cascade_path)
+            self._thread_cascades.cascade = self.face_cascade
             
             if self.face_cascade.empty():
                 print("❌ Failed to load Haarcascade")
@@ -43,39 +70,38 @@ class FaceRecognition:
             print(f"❌ Error loading cascade: {e}")
             self.face_cascade = None
     
-    def _init_recognizer(self):
-        """Initialize LBPH Recognizer"""
-        try:
-            if not hasattr(cv2, 'face'):
-                print("❌ cv2.face module not found!")
-                self.recognizer = None
-                return
-            
-            if not hasattr(cv2.face, 'LBPHFaceRecognizer_create'):
-                print("❌ LBPHFaceRecognizer_create not found!")
-                self.recognizer = None
-                return
-            
-            self.recognizer = cv2.face.LBPHFaceRecognizer_create(
-                radius=config.LBPH_RADIUS,
-                neighbors=config.LBPH_NEIGHBORS,
-                grid_x=config.LBPH_GRID_X,
-                grid_y=config.LBPH_GRID_Y
-            )
-            print("✅ LBPH Recognizer initialized")
-            
-        except Exception as e:
-            print(f"❌ Error initializing recognizer: {e}")
-            self.recognizer = None
+    def apply_settings(self, key, value):
+        """Subscriber SettingsManager: update tuning deteksi/rekognisi tanpa restart"""
+        attribute = {
+            "face_scale_factor": "scale_factor",
+            "face_min_neighbors": "min_neighbors",
+            "confidence_threshold": "confidence_threshold",
+            "detection_width": "detection_width"
+        }.get(key)
+        if attribute:
+            setattr(self, attribute, value)
+    
+    def _cascade(self):
+        """Cascade milik thread pemanggil (worker, UI dan API bisa deteksi bersamaan)"""
+        cascade = getattr(self._thread_cascades, "cascade", None)
+        if cascade is None:
+            cascade = cv2.CascadeClassifier(self.cascade_path)
+            self._thread_cascades.cascade = cascade
+        return cascade
     
     def is_ready(self):
         """Check if face recognition is ready"""
-        return self.face_cascade is not None and self.recognizer is not None
+        return self.face_cascade is not None
     
     def _load_model(self):
-        """Load trained model dari file"""
+        """Load trained model dari file (binary, memory-mapped)"""
         try:
-            if not os.path.exists(config.MODEL_FILE):
+            # Konversi satu kali dari model YAML lama
+            if not self.model_store.exists() and os.path.exists(config.LEGACY_MODEL_FILE):
+                print("🔄 Converting legacy YAML model...")
+                convert_legacy_model(store=self.model_store)
+            
+            if not self.model_store.exists():
                 print("ℹ️ No saved model found")
                 return False
             
@@ -83,21 +109,23 @@ class FaceRecognition:
                 print("ℹ️ No saved labels found")
                 return False
             
-            if self.recognizer is None:
-                print("❌ Recognizer not initialized")
-                return False
+            # Load labels (string keys -> int) + generasi model pasangannya
+            with open(config.LABELS_FILE, 'r', encoding='utf-8') as f:
+                generation, label_to_user = unpack_labels(json.load(f))
             
-            # Load model
-            self.recognizer.read(config.MODEL_FILE)
+            # Load model generasi yang sama (generasi sebelumnya jika save terputus)
+            histograms, labels, header = self.model_store.load(mmap=True, generation=generation)
             
-            # Load labels
-            with open(config.LABELS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Convert string keys back to int
-                self.label_to_user = {int(k): v for k, v in data.items()}
+            if params_from_header(header) != self.params:
+                print("⚠️ Saved model uses different LBPH params, retrain needed")
+                return False
             
-            self.is_trained = True
-            print(f"✅ Model loaded: {len(self.label_to_user)} users")
+            self.label_to_user = label_to_user
+            self.model_generation = header.get("generation", 0)
+            self.matcher.set_model(histograms, labels)
+            self._mark_stored()
+            self.is_trained = len(self.matcher) > 0
+            print(f"✅ Model loaded: {len(self.label_to_user)} users, {len(labels)} samples")
             return True
             
         except Exception as e:
@@ -107,59 +135,115 @@ class FaceRecognition:
     def _save_model(self):
         """Save trained model ke file"""
         try:
-            if self.recognizer is None:
-                print("❌ Recognizer not initialized")
-                return False
-            
             if not self.is_trained:
                 print("❌ Model not trained yet")
                 return False
             
             # Save model
-            self.recognizer.write(config.MODEL_FILE)
+            self._store_model()
             
-            # Save labels
-            with open(config.LABELS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.label_to_user, f, indent=2, ensure_ascii=False)
+            # Save labels + manifest
+            self._save_labels()
+            self.manifest.save()
             
-            print(f"✅ Model saved: {config.MODEL_FILE}")
+            print(f"✅ Model saved: {self.model_store.model_dir}")
             return True
             
         except Exception as e:
             print(f"❌ Error saving model: {e}")
             return False
     
-    def detect_faces(self, frame):
-        """Detect faces in frame"""
+    def _store_model(self):
+        """Tulis matcher sebagai generasi model baru (labels.json harus ikut disimpan)"""
+        header = self.model_store.save(self.matcher.histograms, self.matcher.labels, self.params)
+        self.model_generation = header["generation"]
+        self._mark_stored()
+    
+    def _mark_stored(self):
+        """Matcher sekarang = generasi model_generation di disk (boleh dipakai RecognitionPool)"""
+        self.stored_model = (self.model_generation, self.matcher.histograms)
+    
+    def _save_labels(self):
+        """Save mapping label -> user (atomic, ditandai generasi model)"""
+        write_json(config.LABELS_FILE, pack_labels(self.label_to_user, self.model_generation))
+    
+    def detect_faces(self, frame, detection_width=None, min_size=None, max_size=None):
+        """
+        Detect faces in frame.
+        Deteksi dijalankan di frame yang diperkecil ke detection_width (default
+        self.detection_width), lalu box dikembalikan ke koordinat frame asli.
+        min_size / max_size dalam pixel frame asli (default config.FACE_MIN_SIZE / tanpa batas).
+        """
         if self.face_cascade is None:
             return []
         
         try:
-            if len(frame.shape) == 3:
-                gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = frame
+            if detection_width is None:
+                detection_width = self.detection_width
+            
+            src_h, src_w = frame.shape[:2]
+            gray, scale = self._detection_gray(frame, detection_width)
             
-            faces = self.face_cascade.detectMultiScale(
+            min_size = tuple(max(1, int(v * scale)) for v in (min_size or config.FACE_MIN_SIZE))
+            max_size = tuple(int(v * scale) for v in max_size) if max_size else (0, 0)
+            
+            faces = self._cascade().detectMultiScale(
                 gray,
-                scaleFactor=config.FACE_SCALE_FACTOR,
-                minNeighbors=config.FACE_MIN_NEIGHBORS,
-                minSize=config.FACE_MIN_SIZE
+                scaleFactor=self.scale_factor,
+                minNeighbors=self.min_neighbors,
+                minSize=min_size,
+                maxSize=max_size
             )
             
+            if scale != 1.0 and len(faces) > 0:
+                faces = self._scale_boxes(faces, 1.0 / scale, src_w, src_h)
+            
             return faces
             
         except Exception as e:
             return []
     
+    def _detection_gray(self, frame, detection_width):
+        """Grayscale (diperkecil) untuk deteksi. Return (gray, scale)"""
+        # Frame: pakai view yang sudah di-cache
+        if isinstance(frame, Frame):
+            return frame.gray_scaled(detection_width)
+        
+        gray = self.to_gray(frame)
+        src_h, src_w = gray.shape[:2]
+        
+        if not detection_width or src_w <= detection_width:
+            return gray, 1.0
+        
+        scale = detection_width / src_w
+        gray = cv2.resize(gray, (detection_width, max(1, round(src_h * scale))),
+                          interpolation=cv2.INTER_AREA)
+        return gray, scale
+    
+    @staticmethod
+    def to_gray(frame):
+        """Grayscale resolusi penuh dari Frame, array RGB, atau array gray"""
+        if isinstance(frame, Frame):
+            return frame.gray
+        if len(frame.shape) == 3:
+            return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        return frame
+    
+    @staticmethod
+    def _scale_boxes(faces, factor, max_w, max_h):
+        """Skala box (x, y, w, h) ke resolusi asli, di-clip ke batas frame"""
+        boxes = np.round(np.asarray(faces, dtype=np.float64) * factor).astype(np.int32)
+        boxes[:, 0] = np.clip(boxes[:, 0], 0, max_w - 1)
+        boxes[:, 1] = np.clip(boxes[:, 1], 0, max_h - 1)
+        boxes[:, 2] = np.minimum(boxes[:, 2], max_w - boxes[:, 0])
+        boxes[:, 3] = np.minimum(boxes[:, 3], max_h - boxes[:, 1])
+        return boxes
+    
     def extract_face(self, frame, face_rect):
         """Extract face region from frame"""
         x, y, w, h = face_rect
         
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = frame
+        gray = self.to_gray(frame)
         
         face = gray[y:y+h, x:x+w]
         face = cv2.resize(face, (200, 200))
@@ -183,78 +267,268 @@ class FaceRecognition:
             print(f"❌ Error saving face: {e}")
             return -1
     
-    def train(self, users):
-        """Train recognizer dengan semua user faces"""
-        if self.recognizer is None:
-            print("❌ Recognizer not initialized!")
-            return False
-        
+    def _histograms(self, faces):
+        """(K, 200, 200) wajah -> list histogram LBPH"""
+        return [lbph.compute_histogram(face, self.params) for face in faces]
+    
+    def _load_user_histograms(self, user, progress=None):
+        """Baca semua foto wajah satu user -> list histogram LBPH"""
+        return self._histograms(self.face_loader.load_user(user, progress))
+    
+    def start_job(self, method, *args):
+        """
+        Jalankan train / sync / add_user di background thread.
+        Return TrainingJob (status, progress, cancel); model lama tetap melayani rekognisi.
+        """
+        job = TrainingJob(getattr(self, method), *args, name=method)
+        self.jobs = [j for j in self.jobs if not j.is_finished] + [job]
+        return job.start()
+    
+    def cancel_jobs(self):
+        """Batalkan semua training job yang masih berjalan"""
+        for job in self.jobs:
+            job.cancel()
+    
+    def train(self, users, progress=None):
+        """
+        Train recognizer dengan semua user faces.
+        Foto di-stream per chunk dari FaceLoader; progress(done, total) opsional.
+        Model baru dipasang sekaligus setelah semua histogram selesai.
+        """
         if not users:
             print("⚠️ No users to train")
             return False
         
-        try:
-            faces = []
-            labels = []
-            self.label_to_user = {}
-            
-            for user in users:
-                user_id = user["id"]
-                face_dir = user["face_dir"]
+        with self.model_lock:
+            try:
+                histograms = []
+                labels = []
+                label_to_user = {}
+                manifest = TrainingManifest(self.manifest.path)
+                manifest.reset(self.params)
+                
+                # Snapshot sebelum baca foto: file yang ditambah saat training ikut sync berikutnya
+                for user in users:
+                    manifest.set_user(user, manifest.scan_user(user))
+                
+                for user, faces in self.face_loader.iter_chunks(users, progress):
+                    histograms.extend(self._histograms(faces))
+                    labels.extend([user["id"]] * len(faces))
+                    label_to_user[user["id"]] = user
                 
-                if not os.path.exists(face_dir):
-                    continue
+                if not histograms:
+                    print("⚠️ No face images found")
+                    return False
                 
-                for filename in os.listdir(face_dir):
-                    if filename.endswith('.jpg'):
-                        filepath = os.path.join(face_dir, filename)
-                        face = cv2.imread(filepath, cv2.IMREAD_GRAYSCALE)
-                        
-                        if face is not None:
-                            face = cv2.resize(face, (200, 200))
-                            faces.append(face)
-                            labels.append(user_id)
-                            self.label_to_user[user_id] = user
-            
-            if not faces:
-                print("⚠️ No face images found")
+                # Train (LBPH = simpan histogram setiap sample)
+                # Label baru digabung dulu supaya rekognisi tidak melihat label tanpa user
+                self.label_to_user = {**self.label_to_user, **label_to_user}
+                self.matcher.set_model(np.vstack(histograms), np.array(labels, dtype=np.int32))
+                self.label_to_user = label_to_user
+                self.manifest = manifest
+                self.is_trained = True
+                
+                # Save model ke file
+                self._save_model()
+                
+                print(f"✅ Trained with {len(labels)} faces from {len(self.label_to_user)} users")
+                return True
+                
+            except TrainingCancelled:
+                print("⚠️ Training cancelled, keeping previous model")
                 return False
             
-            # Train
-            self.recognizer.train(faces, np.array(labels))
-            self.is_trained = True
-            
-            # Save model ke file
-            self._save_model()
+            except Exception as e:
+                print(f"❌ Error training: {e}")
+                return False
+    
+    def sync(self, users, progress=None):
+        """
+        Samakan model dengan dataset wajah memakai manifest.
+        Hanya user yang file wajahnya berubah yang dihitung ulang;
+        full train hanya jika belum ada model/manifest atau parameter LBPH berubah.
+        """
+        with self.model_lock:
+            if not self.is_trained or not self.manifest.matches_params(self.params):
+                print("🔄 No valid model/manifest, full training...")
+                return self.train(users, progress)
+            
+            try:
+                changed, removed = self.manifest.diff(users)
+                
+                # Metadata user (nama, kelas, ...) selalu ikut yang terbaru
+                labels_changed = False
+                for user in users:
+                    if user["id"] in self.label_to_user and self.label_to_user[user["id"]] != user:
+                        self.label_to_user[user["id"]] = user
+                        labels_changed = True
+                
+                if not changed and not removed:
+                    if labels_changed:
+                        self._save_labels()
+                    print("✅ Model up to date, no training needed")
+                    return True
+                
+                # Hitung semua histogram dulu, baru model diubah (cancel = model utuh)
+                updates = [(user, snapshot, self._load_user_histograms(user, progress))
+                           for user, snapshot in changed]
+                
+                for user_id in removed:
+                    self.matcher.remove_label(user_id)
+                    self.label_to_user.pop(user_id, None)
+                    self.manifest.remove_user(user_id)
+                
+                for user, snapshot, histograms in updates:
+                    self._apply_user(user, snapshot, histograms)
+                
+                self.is_trained = len(self.matcher) > 0
+                self._store_model()
+                self._save_labels()
+                self.manifest.save()
+                
+                print(f"✅ Model synced: {len(changed)} users updated, {len(removed)} removed")
+                return True
+                
+            except TrainingCancelled:
+                print("⚠️ Sync cancelled, keeping previous model")
+                return False
             
-            print(f"✅ Trained with {len(faces)} faces from {len(self.label_to_user)} users")
-            return True
+            except Exception as e:
+                print(f"❌ Error syncing model: {e}")
+                return False
+    
+    def _apply_user(self, user, snapshot, histograms):
+        """
+        Ganti sample satu user di matcher dalam satu swap (tanpa persist).
+        Return (histograms, labels, replaced)
+        """
+        user_id = user["id"]
+        
+        if not histograms:
+            replaced = self.matcher.replace_label(user_id, None)
+            self.label_to_user.pop(user_id, None)
+            self.manifest.set_user(user, snapshot)
+            return None, None, replaced
+        
+        histograms = np.vstack(histograms)
+        labels = np.full(len(histograms), user_id, dtype=np.int32)
+        
+        # Label dipasang sebelum matcher supaya rekognisi tidak melihat label tanpa user
+        self.label_to_user[user_id] = user
+        replaced = self.matcher.replace_label(user_id, histograms)
+        self.manifest.set_user(user, snapshot)
+        return histograms, labels, replaced
+    
+    def add_user(self, user, progress=None):
+        """Enroll satu user tanpa retrain semua (hanya sample user ini yang dihitung)"""
+        with self.model_lock:
+            try:
+                snapshot = self.manifest.scan_user(user)
+                histograms, labels, replaced = self._apply_user(
+                    user, snapshot, self._load_user_histograms(user, progress))
+                
+                if histograms is None:
+                    print(f"⚠️ No face images found for user {user['id']}")
+                    return False
+                
+                self.is_trained = True
+                
+                # Persist: append delta, atau tulis ulang jika ada sample yang diganti
+                if replaced or not self.model_store.exists():
+                    self._store_model()
+                else:
+                    header = self.model_store.append(histograms, labels, self.params)
+                    self.model_generation = header["generation"]
+                    self._mark_stored()
+                self._save_labels()
+                self.manifest.save()
+                
+                print(f"✅ Enrolled user {user['id']}: {len(labels)} faces")
+                return True
+                
+            except TrainingCancelled:
+                print("⚠️ Enrollment cancelled, keeping previous model")
+                return False
             
-        except Exception as e:
-            print(f"❌ Error training: {e}")
-            return False
+            except Exception as e:
+                print(f"❌ Error enrolling user: {e}")
+                return False
+    
+    def remove_user(self, user_id):
+        """Hapus semua histogram milik satu user dari model"""
+        with self.model_lock:
+            try:
+                removed = self.matcher.remove_label(user_id)
+                self.label_to_user.pop(user_id, None)
+                self.manifest.remove_user(user_id)
+                self.face_loader.drop_cache(user_id)
+                self.is_trained = len(self.matcher) > 0
+                
+                if removed:
+                    self._store_model()
+                    self._save_labels()
+                    print(f"✅ Removed user {user_id} from model: {removed} faces")
+                self.manifest.save()
+                return True
+                
+            except Exception as e:
+                print(f"❌ Error removing user: {e}")
+                return False
     
     def recognize(self, frame, face_rect):
         """Recognize face"""
-        if self.recognizer is None:
-            return None, 0
+        results = self.recognize_faces(frame, [face_rect])
+        return results[0] if results else (None, 0)
+    
+    def recognize_faces(self, frame, face_rects):
+        """Recognize beberapa wajah sekaligus (satu pass matcher untuk semua probe)"""
+        if not self.is_trained or len(face_rects) == 0:
+            return [(None, 0) for _ in face_rects]
         
+        try:
+            # Konversi grayscale sekali untuk semua wajah
+            gray = self.to_gray(frame)
+            faces = [self.extract_face(gray, rect) for rect in face_rects]
+            
+            best = None
+            pool = self.recognition_pool
+            stored = self.stored_model
+            if (pool is not None and pool.should_use(len(faces))
+                    and stored is not None and stored[1] is self.matcher.histograms):
+                # Banyak wajah: histogram + search dibagi ke beberapa process (model di-mmap worker)
+                best = pool.predict(self.model_store.model_dir, stored[0], self.params, faces)
+            
+            if best is None:
+                queries = np.vstack([lbph.compute_histogram(face, self.params) for face in faces])
+                best = [candidates[0] for candidates in self.matcher.search_users(queries, k=1)]
+            
+            results = []
+            for label, confidence in best:
+                if confidence < self.confidence_threshold:
+                    user = self.label_to_user.get(label)
+                    results.append((user, confidence))
+                else:
+                    results.append((None, confidence))
+            
+            return results
+            
+        except Exception as e:
+            return [(None, 0) for _ in face_rects]
+    
+    def match(self, frame, face_rect, k=3):
+        """Top-k kandidat user untuk satu wajah: list of (user, distance)"""
         if not self.is_trained:
-            return None, 0
+            return []
         
         try:
             face = self.extract_face(frame, face_rect)
+            query = lbph.compute_histogram(face, self.params)
+            candidates = self.matcher.search_users(query, k=k)[0]
             
-            label, confidence = self.recognizer.predict(face)
+            return [(self.label_to_user.get(label), dist) for label, dist in candidates]
             
-            if confidence < config.CONFIDENCE_THRESHOLD:
-                user = self.label_to_user.get(label)
-                return user, confidence
-            else:
-                return None, confidence
-                
         except Exception as e:
-            return None, 0
+            return []
     
     def draw_faces(self, frame, faces, recognized_users=None):
         """Draw rectangles around faces"""
@@ -286,11 +560,12 @@ class FaceRecognition:
     def delete_model(self):
         """Hapus model file"""
         try:
-            if os.path.exists(config.MODEL_FILE):
-                os.remove(config.MODEL_FILE)
+            self.model_store.delete()
             if os.path.exists(config.LABELS_FILE):
                 os.remove(config.LABELS_FILE)
             
+            self.matcher = LBPHMatcher()
+            self.stored_model = None
             self.is_trained = False
             self.label_to_user = {}
             
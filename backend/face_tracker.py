@@ -0,0 +1,207 @@
+"""
+Face Tracker - Deteksi berbasis ROI di antara full-frame scan
+
+Setelah wajah terdeteksi, frame berikutnya hanya dicari di sekitar box
+sebelumnya (ROI diperluas). Full-frame scan tetap dijalankan setiap
+config.TRACK_FULL_SCAN_INTERVAL frame atau saat track hilang, supaya wajah
+baru tetap tertangkap. Identitas yang sudah dikenali dengan yakin menempel
+di track sehingga recognize tidak diulang setiap frame.
+"""
+import time
+import config
+
+
+class Track:
+    """Satu wajah yang diikuti antar frame"""
+
+    def __init__(self, track_id, box):
+        self.track_id = track_id
+        self.box = box              # (x, y, w, h) di koordinat frame asli
+        self.user = None
+        self.confidence = 0
+        self.misses = 0
+        self.recognized_at = 0.0    # waktu recognize terakhir
+        self.failed = False         # recognize terakhir gagal (error / belum ada model), bukan wajah asing
+        self.locked = False         # identitas cukup yakin, recognize bisa dilewati
+
+    def needs_recognition(self, now, recheck_seconds):
+        if not self.locked:
+            return True
+        return now - self.recognized_at >= recheck_seconds
+
+
+def iou(a, b):
+    """Intersection over union dua box (x, y, w, h)"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+class FaceTracker:
+    def __init__(self, face_recognition):
+        self.face_recognition = face_recognition
+
+        self.full_scan_interval = config.TRACK_FULL_SCAN_INTERVAL
+        self.roi_margin = config.TRACK_ROI_MARGIN
+        self.max_misses = config.TRACK_MAX_MISSES
+        self.iou_threshold = config.TRACK_IOU_THRESHOLD
+        self.lock_confidence = config.TRACK_LOCK_CONFIDENCE
+        self.recheck_seconds = config.TRACK_RECHECK_SECONDS
+        self.size_range = config.TRACK_SIZE_RANGE
+
+        self.tracks = []
+        self.frame_count = 0
+        self.force_full_scan = True
+        self._next_id = 1
+
+        # Statistik
+        self.full_scans = 0
+        self.roi_scans = 0
+        self.recognitions = 0
+        self.recognitions_skipped = 0
+
+    def reset(self):
+        """Buang semua track (mis. saat scan dimatikan)"""
+        self.tracks = []
+        self.frame_count = 0
+        self.force_full_scan = True
+
+    def get_stats(self):
+        return {
+            "tracks": len(self.tracks),
+            "full_scans": self.full_scans,
+            "roi_scans": self.roi_scans,
+            "recognitions": self.recognitions,
+            "recognitions_skipped": self.recognitions_skipped
+        }
+
+    def detect(self, frame):
+        """Update posisi track dari frame ini. Return list track aktif"""
+        self.frame_count += 1
+
+        full_scan = (self.force_full_scan or not self.tracks or
+                     self.frame_count % self.full_scan_interval == 0)
+
+        if full_scan:
+            detections = [tuple(int(v) for v in f) for f in self.face_recognition.detect_faces(frame)]
+            self.full_scans += 1
+        else:
+            detections = self._detect_in_rois(frame)
+            self.roi_scans += 1
+
+        self._associate(detections, allow_new=full_scan)
+
+        # Semua track hilang di ROI -> full scan di frame berikutnya
+        self.force_full_scan = not full_scan and not any(t.misses == 0 for t in self.tracks)
+        return [t for t in self.tracks if t.misses == 0]
+
+    def recognize(self, frame, tracks=None, now=None):
+        """Recognize track yang belum punya identitas yakin (batch satu kali)"""
+        now = now or time.time()
+        tracks = [t for t in self.tracks if t.misses == 0] if tracks is None else tracks
+
+        pending = [t for t in tracks if t.needs_recognition(now, self.recheck_seconds)]
+        self.recognitions_skipped += len(tracks) - len(pending)
+
+        if not pending:
+            return tracks
+
+        results = self.face_recognition.recognize_faces(frame, [t.box for t in pending])
+        self.recognitions += len(pending)
+
+        for track, (user, confidence) in zip(pending, results):
+            track.user = user
+            track.confidence = confidence
+            track.recognized_at = now
+            # recognize_faces memberi (None, 0) jika prediksi gagal; wajah asing selalu punya jarak
+            track.failed = user is None and not confidence
+            track.locked = user is not None and confidence <= self.lock_confidence
+
+        return tracks
+
+    def _roi(self, box, frame_w, frame_h):
+        """Box diperluas roi_margin di setiap sisi, di-clip ke frame"""
+        x, y, w, h = box
+        mx = int(w * self.roi_margin)
+        my = int(h * self.roi_margin)
+        x0 = max(0, x - mx)
+        y0 = max(0, y - my)
+        x1 = min(frame_w, x + w + mx)
+        y1 = min(frame_h, y + h + my)
+        return x0, y0, x1, y1
+
+    def _detect_in_rois(self, frame):
+        """Jalankan detector hanya di ROI sekitar setiap track"""
+        frame_h, frame_w = frame.shape[:2]
+        detections = []
+
+        # ROI diambil dari grayscale penuh (di-cache di Frame), bukan dari frame warna
+        gray = self.face_recognition.to_gray(frame)
+
+        # Skala deteksi sama dengan full scan, supaya ROI selalu lebih murah
+        detection_width = self.face_recognition.detection_width
+        scale = detection_width / frame_w if detection_width and frame_w > detection_width else 1.0
+
+        for track in self.tracks:
+            x0, y0, x1, y1 = self._roi(track.box, frame_w, frame_h)
+            if x1 - x0 < 2 or y1 - y0 < 2:
+                continue
+
+            # Cari hanya ukuran wajah di sekitar ukuran track sebelumnya
+            size = max(track.box[2], track.box[3])
+            min_size = max(config.FACE_MIN_SIZE[0], int(size * self.size_range[0]))
+            max_size = int(size * self.size_range[1])
+
+            crop = gray[y0:y1, x0:x1]
+            faces = self.face_recognition.detect_faces(
+                crop,
+                detection_width=max(1, int((x1 - x0) * scale)),
+                min_size=(min_size, min_size),
+                max_size=(max_size, max_size)
+            )
+            for fx, fy, fw, fh in faces:
+                box = (int(fx) + x0, int(fy) + y0, int(fw), int(fh))
+
+                # ROI yang overlap bisa menemukan wajah yang sama dua kali
+                if all(iou(box, d) < self.iou_threshold for d in detections):
+                    detections.append(box)
+
+        return detections
+
+    def _associate(self, detections, allow_new):
+        """Greedy IoU matching deteksi -> track"""
+        pairs = []
+        for ti, track in enumerate(self.tracks):
+            for di, box in enumerate(detections):
+                score = iou(track.box, box)
+                if score >= self.iou_threshold:
+                    pairs.append((score, ti, di))
+        pairs.sort(reverse=True)
+
+        matched_tracks = set()
+        matched_detections = set()
+        for score, ti, di in pairs:
+            if ti in matched_tracks or di in matched_detections:
+                continue
+            matched_tracks.add(ti)
+            matched_detections.add(di)
+
+            track = self.tracks[ti]
+            track.box = detections[di]
+            track.misses = 0
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.misses += 1
+
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        if allow_new:
+            for di, box in enumerate(detections):
+                if di not in matched_detections:
+                    self.tracks.append(Track(self._next_id, box))
+                    self._next_id += 1
@@ -0,0 +1,87 @@
+"""
+Frame - Frame kamera mentah (BGR) + view turunan yang dihitung sekali
+
+Setiap konversi (RGB untuk display, grayscale, grayscale yang diperkecil untuk
+deteksi) baru dihitung saat pertama diminta lalu di-cache di objek frame,
+jadi detect, extract, recognize dan display berbagi hasil yang sama
+berapapun jumlah wajah di frame.
+"""
+import threading
+import time
+import cv2
+
+
+class Frame:
+    def __init__(self, bgr, seq=0, timestamp=None):
+        self.bgr = bgr
+        self.seq = seq
+        # Waktu sumber (file/synthetic: waktu media, 0.0 valid)
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.received_at = time.time()  # waktu frame masuk pipeline (untuk latency)
+
+        self._rgb = None
+        self._gray = None
+        self._gray_scaled = {}
+        self._lock = threading.Lock()
+
+    def copy(self):
+        """Frame baru di atas copy buffer (seq, timestamp & received_at tetap)"""
+        frame = Frame(self.bgr.copy(), seq=self.seq, timestamp=self.timestamp)
+        frame.received_at = self.received_at
+        return frame
+
+    @property
+    def shape(self):
+        return self.bgr.shape
+
+    @property
+    def width(self):
+        return self.bgr.shape[1]
+
+    @property
+    def height(self):
+        return self.bgr.shape[0]
+
+    @property
+    def rgb(self):
+        """RGB untuk display (read-only, jangan diubah in-place)"""
+        if self._rgb is None:
+            with self._lock:
+                if self._rgb is None:
+                    if self.bgr.ndim == 2:
+                        self._rgb = cv2.cvtColor(self.bgr, cv2.COLOR_GRAY2RGB)
+                    else:
+                        self._rgb = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB)
+        return self._rgb
+
+    @property
+    def gray(self):
+        """Grayscale resolusi penuh"""
+        if self._gray is None:
+            with self._lock:
+                if self._gray is None:
+                    if self.bgr.ndim == 2:
+                        self._gray = self.bgr
+                    else:
+                        self._gray = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    def gray_scaled(self, width):
+        """
+        Grayscale diperkecil ke lebar `width` (INTER_AREA).
+        Return (image, scale). Tidak diperbesar jika frame lebih kecil.
+        """
+        gray = self.gray
+        src_h, src_w = gray.shape[:2]
+
+        if not width or src_w <= width:
+            return gray, 1.0
+
+        cached = self._gray_scaled.get(width)
+        if cached is None:
+            scale = width / src_w
+            small = cv2.resize(gray, (width, max(1, round(src_h * scale))),
+                               interpolation=cv2.INTER_AREA)
+            cached = (small, scale)
+            self._gray_scaled[width] = cached
+        return cached
@@ -0,0 +1,158 @@
+"""
+Frame Ring - Ring buffer frame kamera yang dialokasikan sekali
+
+Capture thread menulis langsung ke buffer slot berikutnya, consumer meminjam
+(borrow) view read-only + sequence number tanpa copy; slot yang sedang
+dipinjam tidak akan ditimpa writer. get_latest() / wait_newer_than() tidak
+meminjam slot, jadi mengembalikan copy (slot bisa dipakai ulang beberapa
+frame kemudian). wait_newer_than() / borrow(newer_than=...) memblok sampai
+ada frame dengan sequence lebih baru dari yang sudah diproses.
+
+has_demand() memberi tahu capture thread apakah ada consumer yang menunggu
+frame baru (atau sudah membaca frame terbaru), supaya decode bisa dilewati
+saat tidak ada yang membaca.
+"""
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+from .frame import Frame
+
+
+class _Slot:
+    def __init__(self, index):
+        self.index = index
+        self.buffer = None      # ndarray milik ring, dipakai ulang
+        self.frame = None       # Frame di atas view read-only dari buffer
+        self.pins = 0           # jumlah consumer yang sedang meminjam
+
+
+class FrameRing:
+    def __init__(self, size=4):
+        if size < 3:
+            raise ValueError("Ring minimal 3 slot (tulis, terbaru, dipinjam)")
+
+        self.slots = [_Slot(i) for i in range(size)]
+        self.seq = 0
+        self.latest = None
+        self.frames_skipped = 0     # frame dibuang karena semua slot dipinjam
+
+        self._next = 0
+        self._writing = None
+        self._waiters = 0           # consumer yang sedang menunggu frame baru
+        self._latest_read = False   # frame terbaru sudah dibaca consumer
+        self._cond = threading.Condition()
+
+    def acquire(self, shape, dtype=np.uint8):
+        """
+        Ambil buffer slot berikutnya untuk ditulis capture thread.
+        Return None jika semua slot sedang dipakai (frame harus dibuang).
+        """
+        with self._cond:
+            for _ in range(len(self.slots)):
+                slot = self.slots[self._next]
+                self._next = (self._next + 1) % len(self.slots)
+
+                if slot.pins == 0 and slot is not self.latest:
+                    break
+            else:
+                self.frames_skipped += 1
+                return None
+
+            # Slot lama tidak lagi valid untuk pembaca baru
+            slot.frame = None
+            self._writing = slot
+
+        if slot.buffer is None or slot.buffer.shape != tuple(shape) or slot.buffer.dtype != dtype:
+            slot.buffer = np.empty(shape, dtype=dtype)
+        return slot.buffer
+
+    def publish(self, timestamp=None):
+        """Tandai buffer yang di-acquire sebagai frame terbaru. Return seq"""
+        with self._cond:
+            slot = self._writing
+            if slot is None:
+                raise RuntimeError("publish() tanpa acquire()")
+            self._writing = None
+
+            view = slot.buffer.view()
+            view.setflags(write=False)
+
+            self.seq += 1
+            if timestamp is None:
+                timestamp = time.time()
+            slot.frame = Frame(view, seq=self.seq, timestamp=timestamp)
+            self.latest = slot
+            self._latest_read = False
+            self._cond.notify_all()
+            return self.seq
+
+    def get_latest(self):
+        """(seq, Frame) terbaru (copy, aman disimpan), atau (0, None). Tanpa copy: borrow()"""
+        with self._cond:
+            if self.latest is None:
+                return self.seq, None
+            self._latest_read = True
+            return self.seq, self.latest.frame.copy()
+
+    def wait_newer_than(self, seq, timeout=None):
+        """
+        Tunggu frame dengan sequence > seq.
+        Return (seq, Frame copy), atau (seq_terakhir, None) jika timeout.
+        """
+        with self._cond:
+            if not self._wait(seq, timeout):
+                return self.seq, None
+            self._latest_read = True
+            return self.seq, self.latest.frame.copy()
+
+    @contextmanager
+    def borrow(self, newer_than=None, timeout=None):
+        """
+        Pinjam frame terbaru; slotnya tidak ditimpa sampai blok with selesai.
+        Yield (seq, Frame) atau (seq, None) jika belum ada / timeout.
+        """
+        with self._cond:
+            if newer_than is not None:
+                self._wait(newer_than, timeout)
+
+            slot = self.latest
+            if slot is None or (newer_than is not None and self.seq <= newer_than):
+                slot = None
+                seq, frame = self.seq, None
+            else:
+                slot.pins += 1
+                seq, frame = self.seq, slot.frame
+                self._latest_read = True
+
+        try:
+            yield seq, frame
+        finally:
+            if slot is not None:
+                with self._cond:
+                    slot.pins -= 1
+
+    def _wait(self, seq, timeout):
+        """Tunggu (lock sudah dipegang) sampai ada frame > seq"""
+        self._waiters += 1
+        try:
+            return self._cond.wait_for(lambda: self.seq > seq and self.latest is not None, timeout)
+        finally:
+            self._waiters -= 1
+
+    def has_demand(self):
+        """True jika ada consumer yang menunggu / sudah membaca frame terbaru"""
+        with self._cond:
+            return self.latest is None or self._waiters > 0 or self._latest_read
+
+    def wake_all(self):
+        """Bangunkan semua thread yang sedang menunggu (mis. saat stop)"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def clear(self):
+        """Lupakan frame terbaru (buffer tetap dialokasikan)"""
+        with self._cond:
+            self.latest = None
+            for slot in self.slots:
+                slot.frame = None
@@ -0,0 +1,124 @@
+"""
+Frame Scheduler - Pacing loop display (Tk) dan loop rekognisi
+
+Display ditargetkan config.DISPLAY_FPS, rekognisi config.RECOGNITION_FPS
+(lebih rendah). Setiap tick display mengukur lama kerjanya sendiri: jadwal
+berikutnya dihitung dari deadline (bukan delay tetap), tick yang sudah
+terlewat dibuang, dan Tk selalu mendapat jeda minimal untuk input.
+
+Jika loop display kewalahan (load tinggi / fps di bawah target), target
+rekognisi diturunkan lebih dulu sampai config.RECOGNITION_MIN_FPS, lalu
+dinaikkan lagi perlahan saat beban turun.
+"""
+import threading
+import time
+import config
+
+
+class RateMeter:
+    """Jumlah event per detik (jendela ~1 detik)"""
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.rate = 0.0
+        self._start = time.perf_counter()
+        self._count = 0
+
+    def tick(self, now=None):
+        """Catat satu event. Return True jika jendela baru saja ditutup"""
+        now = now or time.perf_counter()
+        self._count += 1
+
+        elapsed = now - self._start
+        if elapsed >= self.window:
+            self.rate = self._count / elapsed
+            self._start = now
+            self._count = 0
+            return True
+        return False
+
+    def current(self, now=None):
+        """Rate terakhir; turun ke 0 jika event berhenti datang"""
+        now = now or time.perf_counter()
+        elapsed = now - self._start
+        if elapsed >= 2 * self.window:
+            return self._count / elapsed
+        return self.rate
+
+
+class FrameScheduler:
+    def __init__(self, display_fps=None, recognition_fps=None, min_recognition_fps=None):
+        self.display_fps = display_fps or config.DISPLAY_FPS
+        self.max_recognition_fps = recognition_fps or config.RECOGNITION_FPS
+        self.min_recognition_fps = min(min_recognition_fps or config.RECOGNITION_MIN_FPS,
+                                       self.max_recognition_fps)
+        self.recognition_fps = self.max_recognition_fps
+
+        self.display_period = 1.0 / self.display_fps
+        self.display_meter = RateMeter()
+        self.recognition_meter = RateMeter()
+        self.display_skipped = 0
+        self.load = 0.0             # EMA lama kerja tick display / periode
+
+        self._display_due = None
+        self._recognition_due = 0.0
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------------- display
+    def display_tick(self, started, rendered=True):
+        """
+        Panggil di akhir tick display dengan waktu mulai (time.perf_counter()).
+        Return delay (ms) untuk after() berikutnya.
+        """
+        now = time.perf_counter()
+        work = now - started
+        self.load = 0.8 * self.load + 0.2 * (work / self.display_period)
+
+        if rendered and self.display_meter.tick(now):
+            self._adapt_recognition()
+
+        # Jadwal berbasis deadline; tick yang sudah lewat dibuang, tidak dikejar
+        due = (self._display_due or started) + self.display_period
+        if due < now:
+            missed = int((now - due) / self.display_period) + 1
+            self.display_skipped += missed
+            due += missed * self.display_period
+        self._display_due = due
+
+        return max(config.DISPLAY_MIN_IDLE_MS, int((due - now) * 1000))
+
+    def reset_display(self):
+        """Mulai ulang jadwal display (mis. setelah ganti halaman)"""
+        self._display_due = None
+
+    def _adapt_recognition(self):
+        """Turunkan rekognisi dulu saat display kewalahan, naikkan perlahan saat longgar"""
+        behind = self.display_meter.rate < self.display_fps * 0.9
+        with self._lock:
+            if self.load > config.SCHEDULER_LOAD_HIGH or (behind and self.load > config.SCHEDULER_LOAD_LOW):
+                self.recognition_fps = max(self.min_recognition_fps, self.recognition_fps * 0.7)
+            elif self.load < config.SCHEDULER_LOAD_LOW:
+                self.recognition_fps = min(self.max_recognition_fps, self.recognition_fps * 1.1)
+
+    # ------------------------------------------------------------ recognition
+    def recognition_delay(self):
+        """Detik sampai rekognisi berikutnya boleh jalan (0 = sekarang)"""
+        return max(0.0, self._recognition_due - time.perf_counter())
+
+    def recognition_tick(self, started):
+        """Panggil setelah satu frame direkognisi (started = time.perf_counter())"""
+        with self._lock:
+            period = 1.0 / self.recognition_fps
+        self._recognition_due = started + period
+        self.recognition_meter.tick()
+
+    # ------------------------------------------------------------------ stats
+    def get_rates(self):
+        return {
+            "display_fps": round(self.display_meter.current(), 1),
+            "display_target": self.display_fps,
+            "display_skipped": self.display_skipped,
+            "display_load": round(self.load, 2),
+            "recognition_fps": round(self.recognition_meter.current(), 1),
+            "recognition_target": round(self.recognition_fps, 1)
+        }
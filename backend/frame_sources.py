@@ -0,0 +1,339 @@
+"""
+Frame Sources - Sumber frame yang bisa dipasang di CameraHandler
+
+    DeviceSource     kamera (index device, cv2.VideoCapture)
+    VideoFileSource  file video rekaman
+    ImageDirSource   folder .jpg / .png (urut nama file)
+    SyntheticSource  frame buatan deterministik (tanpa kamera / file)
+
+Semua sumber punya interface yang dipakai capture loop: open / grab /
+retrieve / release. Selain DeviceSource, pacing bisa "realtime" (frame ke-N
+dirilis N/fps detik setelah open, seperti kamera asli) atau "fast" (secepat
+mungkin, untuk profiling), dan bisa diputar ulang (loop) saat habis.
+
+Timestamp frame non-device deterministik: start_time + index / fps (waktu
+media, index tidak reset saat loop). Dengan start_time tetap, dua run di
+mesin CI menghasilkan timestamp yang sama persis.
+
+    open_source(0)                          -> DeviceSource
+    open_source("gate.mp4", pacing="fast")  -> VideoFileSource
+    open_source("frames/")                  -> ImageDirSource
+    open_source("synthetic")                -> SyntheticSource
+"""
+import glob
+import os
+import time
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+import config
+
+REALTIME = "realtime"
+FAST = "fast"
+PACINGS = (REALTIME, FAST)
+
+SYNTHETIC = "synthetic"
+
+
+class FrameSource(ABC):
+    """Basis sumber frame: pacing, loop & timestamp deterministik (subclass wajib lengkap)"""
+
+    def __init__(self, fps=None, pacing=None, loop=None, start_time=None):
+        pacing = pacing or config.SOURCE_PACING
+        if pacing not in PACINGS:
+            raise ValueError(f"pacing tidak dikenal: {pacing}")
+
+        self.fps = fps or config.CAMERA_FPS
+        self.pacing = pacing
+        self.loop = config.SOURCE_LOOP if loop is None else loop
+        self.start_time = start_time
+
+        self.index = -1         # frame terakhir yang di-grab (tidak reset saat loop)
+        self.finished = False   # sumber habis dan tidak di-loop
+        self._base_time = 0.0
+        self._clock_start = 0.0
+
+    def describe(self):
+        return type(self).__name__
+
+    def open(self):
+        """Buka sumber. Return True jika berhasil"""
+        if not self._open():
+            return False
+        self.index = -1
+        self.finished = False
+        self._base_time = time.time() if self.start_time is None else self.start_time
+        self._clock_start = time.perf_counter()
+        return True
+
+    @abstractmethod
+    def is_opened(self):
+        """True jika sumber terbuka"""
+
+    def grab(self):
+        """Maju ke frame berikutnya (blok sesuai pacing). False jika habis / gagal"""
+        if not self._grab_next():
+            if not self.loop or not self._rewind() or not self._grab_next():
+                # Habis normal (bukan error) hanya jika tidak di-loop
+                self.finished = not self.loop and self.is_opened()
+                return False
+
+        self.index += 1
+        if self.pacing == REALTIME:
+            delay = self._clock_start + self.index / self.fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return True
+
+    def timestamp(self):
+        """Timestamp frame yang terakhir di-grab"""
+        return self._base_time + self.index / self.fps
+
+    @abstractmethod
+    def retrieve(self, dst=None):
+        """Decode frame yang sudah di-grab (BGR). Return (ok, frame); frame boleh bukan dst"""
+
+    def release(self):
+        pass
+
+    @abstractmethod
+    def _open(self):
+        """Buka sumber. Return True jika berhasil"""
+
+    @abstractmethod
+    def _grab_next(self):
+        """Maju satu frame tanpa pacing. False jika habis / gagal"""
+
+    def _rewind(self):
+        return False
+
+
+class DeviceSource(FrameSource):
+    """Kamera fisik: device sendiri yang menentukan tempo, timestamp = waktu grab"""
+
+    def __init__(self, index, width=None, height=None, fps=None):
+        super().__init__(fps=fps, pacing=FAST, loop=False)
+        self.device_index = index
+        self.width = width or config.CAMERA_WIDTH
+        self.height = height or config.CAMERA_HEIGHT
+        self.cap = None
+        self._grabbed_at = 0.0
+
+    def describe(self):
+        return f"camera {self.device_index} {self.width}x{self.height}"
+
+    def _open(self):
+        # Use DSHOW on Windows
+        if os.name == 'nt':
+            self.cap = cv2.VideoCapture(self.device_index, cv2.CAP_DSHOW)
+        else:
+            self.cap = cv2.VideoCapture(self.device_index)
+
+        if not self.cap.isOpened():
+            self.release()
+            return False
+
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # Resolusi yang benar-benar diberikan device
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return True
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def _grab_next(self):
+        return self.cap is not None and self.cap.grab()
+
+    def grab(self):
+        # Device menentukan tempo sendiri: tanpa pacing / loop
+        if not self._grab_next():
+            return False
+        self.index += 1
+        self._grabbed_at = time.time()
+        return True
+
+    def timestamp(self):
+        return self._grabbed_at
+
+    def retrieve(self, dst=None):
+        return self.cap.retrieve(dst)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class VideoFileSource(FrameSource):
+    """File video rekaman; fps dari metadata file (fallback config.CAMERA_FPS)"""
+
+    def __init__(self, path, pacing=None, loop=None, start_time=None):
+        super().__init__(pacing=pacing, loop=loop, start_time=start_time)
+        self.path = path
+        self.cap = None
+
+    def describe(self):
+        return f"video {self.path}"
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            self.release()
+            return False
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        if fps and 0 < fps < 1000:
+            self.fps = fps
+        return True
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def _grab_next(self):
+        return self.cap is not None and self.cap.grab()
+
+    def _rewind(self):
+        return self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def retrieve(self, dst=None):
+        return self.cap.retrieve(dst)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageDirSource(FrameSource):
+    """Folder gambar .jpg / .png, diputar urut nama file"""
+
+    PATTERNS = ("*.jpg", "*.jpeg", "*.png")
+
+    def __init__(self, path, fps=None, pacing=None, loop=None, start_time=None):
+        super().__init__(fps=fps, pacing=pacing, loop=loop, start_time=start_time)
+        self.path = path
+        self.files = []
+        self._position = -1
+
+    def describe(self):
+        return f"images {self.path} ({len(self.files)} files)"
+
+    def _open(self):
+        self.files = sorted(
+            path for pattern in self.PATTERNS for path in glob.glob(os.path.join(self.path, pattern))
+        )
+        self._position = -1
+        return bool(self.files)
+
+    def is_opened(self):
+        return bool(self.files)
+
+    def _grab_next(self):
+        if self._position + 1 >= len(self.files):
+            return False
+        self._position += 1
+        return True
+
+    def _rewind(self):
+        self._position = -1
+        return True
+
+    def retrieve(self, dst=None):
+        frame = cv2.imread(self.files[self._position], cv2.IMREAD_COLOR)
+        if frame is None:
+            return False, None
+        if dst is not None and dst.shape == frame.shape:
+            np.copyto(dst, frame)
+            return True, dst
+        return True, frame
+
+    def release(self):
+        self.files = []
+
+
+class SyntheticSource(FrameSource):
+    """
+    Frame buatan: background noise (seed tetap) + foto wajah dari faces_dir
+    yang bergeser pelan. Frame ke-N selalu identik untuk seed yang sama.
+    """
+
+    def __init__(self, width=None, height=None, fps=None, pacing=None, loop=None,
+                 start_time=None, faces_dir=None, seed=0, frames=None):
+        super().__init__(fps=fps, pacing=pacing, loop=loop, start_time=start_time)
+        self.width = width or config.CAMERA_WIDTH
+        self.height = height or config.CAMERA_HEIGHT
+        self.faces_dir = faces_dir or config.FACES_DIR
+        self.seed = seed
+        self.frames = frames or config.SYNTHETIC_FRAMES   # panjang satu putaran
+        self.faces = []
+        self._background = None
+        self._position = -1
+
+    def describe(self):
+        return f"synthetic {self.width}x{self.height} ({len(self.faces)} faces)"
+
+    def _open(self):
+        rng = np.random.default_rng(self.seed)
+        self._background = rng.integers(40, 90, size=(self.height, self.width, 3), dtype=np.uint8)
+
+        size = max(1, self.height // 3)
+        self.faces = []
+        for path in sorted(glob.glob(os.path.join(self.faces_dir, "*", "*.jpg")))[:config.SYNTHETIC_MAX_FACES]:
+            img = cv2.imread(path, cv2.IMREAD_COLOR)
+            if img is not None:
+                self.faces.append(cv2.resize(img, (size, size)))
+        self._position = -1
+        return True
+
+    def is_opened(self):
+        return self._background is not None
+
+    def _grab_next(self):
+        if self._position + 1 >= self.frames:
+            return False
+        self._position += 1
+        return True
+
+    def _rewind(self):
+        self._position = -1
+        return True
+
+    def retrieve(self, dst=None):
+        if dst is None or dst.shape != self._background.shape:
+            dst = np.empty_like(self._background)
+        np.copyto(dst, self._background)
+
+        if self.faces:
+            # Ganti wajah setiap detik, geser horizontal bolak-balik
+            per_face = max(1, int(self.fps))
+            face = self.faces[(self._position // per_face) % len(self.faces)]
+            size = face.shape[0]
+            span = max(1, self.width - size)
+            step = (self._position * 8) % (2 * span)
+            x = step if step < span else 2 * span - step
+            y = (self.height - size) // 2
+            dst[y:y + size, x:x + size] = face
+        return True, dst
+
+    def release(self):
+        self._background = None
+
+
+def open_source(spec, width=None, height=None, pacing=None, loop=None, start_time=None):
+    """
+    FrameSource dari index device (int), "synthetic", folder gambar, path
+    video, atau FrameSource yang sudah jadi. Belum dibuka (panggil open())
+    """
+    if isinstance(spec, FrameSource):
+        return spec
+    if isinstance(spec, int):
+        return DeviceSource(spec, width=width, height=height)
+    if spec == SYNTHETIC:
+        return SyntheticSource(width=width, height=height, pacing=pacing, loop=loop, start_time=start_time)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, pacing=pacing, loop=loop, start_time=start_time)
+    return VideoFileSource(spec, pacing=pacing, loop=loop, start_time=start_time)
@@ -0,0 +1,235 @@
+"""
+Gate Service - Pipeline gate tanpa Tkinter (mode headless)
+
+Menghubungkan CameraHandler, FaceRecognition, UserManager dan AttendanceLog
+seperti MainUI, tapi scanning selalu aktif. Hasil rekognisi dibaca API (lihat
+backend/http_api.py) dan disebar lewat EventBus ke attendance, webhook &
+metrics. Bisa beberapa kamera sekaligus (CameraManager, mis. gate masuk &
+keluar); sumber kamera berupa index device atau path file video rekaman.
+"""
+import base64
+import threading
+import time
+import cv2
+import numpy as np
+import config
+from .camera_manager import CameraManager
+from .settings_manager import SettingsManager
+from .user_manager import UserManager
+from .face_recognition import FaceRecognition
+from .attendance_log import AttendanceLog
+from .frame import Frame
+from .event_bus import EventBus
+from .event_consumers import AttendanceConsumer, WebhookConsumer, MetricsConsumer
+
+
+class EnrollmentError(Exception):
+    """Request enroll tidak valid (pesan dikirim ke client)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class GateService:
+    def __init__(self, source=None, settings_manager=None, pacing=None, loop=None, start_time=None):
+        """
+        source: sumber satu kamera (index / path / folder / "synthetic"), list,
+        atau dict camera_id -> sumber (None = kamera dari settings).
+        pacing / loop / start_time untuk sumber non-device (lihat backend/frame_sources.py)
+        """
+        self.settings_manager = settings_manager or SettingsManager()
+        self.attendance_log = AttendanceLog()
+        self.user_manager = UserManager(attendance_log=self.attendance_log)
+        self.face_recognition = FaceRecognition()
+        self.user_manager.add_delete_callback(self.face_recognition.remove_user)
+
+        for key, value in self.settings_manager.get_recognition_settings().items():
+            self.face_recognition.apply_settings(key, value)
+        self.settings_manager.subscribe(self.face_recognition.apply_settings,
+                                        self.settings_manager.get_recognition_settings().keys())
+
+        # Event bus: attendance, notifikasi orang tua & metrics sebagai subscriber
+        self.event_bus = EventBus()
+        AttendanceConsumer(self.user_manager).attach(self.event_bus)
+        self.metrics = MetricsConsumer()
+        self.metrics.attach(self.event_bus)
+        self.webhook = None
+        if config.WEBHOOK_URL:
+            self.webhook = WebhookConsumer()
+            self.webhook.attach(self.event_bus)
+
+        # Semua kamera berbagi satu pool rekognisi (penjadwalan adil antar kamera)
+        if source is None:
+            source = self.settings_manager.get_camera_index()
+        sources = source if isinstance(source, (dict, list, tuple)) else [source]
+        self.camera_manager = CameraManager(sources, self.face_recognition, event_bus=self.event_bus,
+                                            pacing=pacing, loop=loop, start_time=start_time)
+        for camera_handler in self.camera_manager.camera_handlers:
+            camera_handler.flip_horizontal = self.settings_manager.get_camera_flip_horizontal()
+            camera_handler.flip_vertical = self.settings_manager.get_camera_flip_vertical()
+
+        self.jobs = {}            # job_id -> TrainingJob (enroll via API)
+        self.started_at = None
+        self.is_running = False
+        self._job_id = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start kamera, sync model di background, lalu scanning terus-menerus"""
+        if self.is_running:
+            return
+
+        self.started_at = time.time()
+        self.attendance_log.start()
+        self.event_bus.start()
+
+        users = self.user_manager.get_all_users()
+        if users:
+            self.face_recognition.start_job("sync", users)
+
+        self.camera_manager.start()
+
+        self.is_running = True
+        print("✅ Gate service started")
+
+    def stop(self):
+        """Stop semua komponen (urutan sama dengan MainUI._on_close)"""
+        self.is_running = False
+        self.camera_manager.stop()
+        self.face_recognition.cancel_jobs()
+        # Bus dulu: sisa sighting masuk attendance log sebelum log di-flush
+        self.event_bus.stop()
+        self.attendance_log.stop()
+        self.settings_manager.close()
+        print("✅ Gate service stopped")
+
+    # ------------------------------------------------------------------ API
+    def health(self):
+        cameras = self.camera_manager.get_stats()
+        cameras_ok = all(
+            camera["running"] and camera["camera"]["delivered_fps"] + camera["camera"]["grab_fps"] > 0
+            for camera in cameras["cameras"].values()
+        )
+        return {
+            "status": "ok" if cameras_ok and self.face_recognition.is_ready() else "degraded",
+            "uptime": round(time.time() - self.started_at, 1) if self.started_at else 0,
+            "cameras": cameras["cameras"],
+            "recognition_workers": cameras["workers"],
+            "model": {
+                "trained": self.face_recognition.is_trained,
+                "users": len(self.face_recognition.label_to_user),
+                "samples": len(self.face_recognition.matcher),
+                "generation": self.face_recognition.model_generation
+            },
+            "users": self.user_manager.get_user_count(),
+            "events": dict(self.event_bus.get_stats(), metrics=self.metrics.to_dict(),
+                           webhook=self.webhook.to_dict() if self.webhook else None)
+        }
+
+    def current_recognitions(self, max_age=None, camera_id=None):
+        """Hasil rekognisi terakhir per kamera (kosong jika lebih lama dari max_age detik)"""
+        max_age = config.SERVICE_RESULT_MAX_AGE if max_age is None else max_age
+        results = self.camera_manager.get_results()
+        if camera_id is not None:
+            if camera_id not in results:
+                return None
+            results = {camera_id: results[camera_id]}
+
+        return {"cameras": {camera: self._result_dict(result, max_age)
+                            for camera, result in results.items()}}
+
+    @staticmethod
+    def _result_dict(result, max_age):
+        if result is None or result.age() > max_age:
+            return {"frame_seq": None, "age": None, "faces": []}
+
+        faces = []
+        for (x, y, w, h), (user, conf) in zip(result.faces, result.recognized):
+            faces.append({
+                "box": [int(x), int(y), int(w), int(h)],
+                "user_id": user["id"] if user else None,
+                "nama_anak": user["nama_anak"] if user else None,
+                "kelas": user.get("kelas") if user else None,
+                "confidence": round(float(conf), 2) if conf is not None else None
+            })
+
+        return {
+            "frame_seq": result.frame_seq,
+            "age": round(result.age(), 3),
+            "latency": round(result.latency, 3),
+            "faces": faces
+        }
+
+    def recent_events(self, limit=50, user_id=None):
+        self.attendance_log.flush()
+        events = self.attendance_log.recent_events(limit=limit, user_id=user_id)
+        for event in events:
+            user = self.user_manager.get_user(event["user_id"])
+            event["nama_anak"] = user["nama_anak"] if user else None
+        return events
+
+    def enroll(self, nama_ortu, nama_anak, kelas, images):
+        """
+        Daftarkan user dari foto (bytes JPEG/PNG, satu wajah per foto).
+        Model di-update di background; return (user, job_id)
+        """
+        if not nama_ortu or not nama_anak:
+            raise EnrollmentError("nama_ortu dan nama_anak harus diisi")
+        if self.user_manager.get_user_by_name(nama_anak):
+            raise EnrollmentError("nama anak sudah terdaftar", status=409)
+
+        # Validasi semua foto dulu supaya tidak ada user setengah jadi
+        faces = []
+        for i, data in enumerate(images):
+            bgr = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if bgr is None:
+                raise EnrollmentError(f"foto {i + 1} tidak bisa dibaca")
+            frame = Frame(bgr)
+            rects = self.face_recognition.detect_faces(frame)
+            if len(rects) != 1:
+                raise EnrollmentError(f"foto {i + 1}: harus tepat 1 wajah (terdeteksi {len(rects)})")
+            faces.append((frame, rects[0]))
+
+        if len(faces) < config.ENROLL_MIN_FACES:
+            raise EnrollmentError(f"minimal {config.ENROLL_MIN_FACES} foto wajah")
+
+        # Cek nama + alokasi ID + insert dalam satu lock: enroll paralel (thread HTTP)
+        # tidak boleh mendapat ID yang sama lalu menyimpan wajah ke folder user lain
+        with self.user_manager.lock:
+            if self.user_manager.get_user_by_name(nama_anak):
+                raise EnrollmentError("nama anak sudah terdaftar", status=409)
+            user = self.user_manager.add_user(nama_ortu, nama_anak, kelas)
+        if user is None:
+            raise EnrollmentError("user gagal disimpan", status=500)
+        count = 0
+        for frame, rect in faces:
+            count = self.face_recognition.save_face(frame, rect, user["id"], user["face_dir"])
+        self.user_manager.update_face_count(user["id"], count)
+
+        job = self.face_recognition.start_job("add_user", self.user_manager.get_user(user["id"]))
+        with self._lock:
+            self._job_id += 1
+            job_id = self._job_id
+            self.jobs[job_id] = job
+        return self.user_manager.get_user(user["id"]), job_id
+
+    def job_status(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        return {
+            "id": job_id,
+            "name": job.name,
+            "status": job.status,
+            "done": job.done,
+            "total": job.total
+        }
+
+    @staticmethod
+    def decode_images(encoded):
+        """List string base64 -> list bytes"""
+        try:
+            return [base64.b64decode(item, validate=True) for item in encoded]
+        except (TypeError, ValueError):
+            raise EnrollmentError("images harus list string base64")
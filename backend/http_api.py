@@ -0,0 +1,208 @@
+"""
+HTTP API - JSON API lokal untuk GateService (asyncio, tanpa dependency)
+
+    GET  /health                    status per kamera, worker, model
+    GET  /recognitions?camera=      wajah di hasil rekognisi terakhir per kamera
+    GET  /events?limit=50&user_id=  event attendance terbaru
+    POST /enroll                    {"nama_ortu", "nama_anak", "kelas", "images": [base64]}
+    GET  /jobs/<id>                 status training job dari /enroll
+
+Handler yang menyentuh disk / OpenCV dijalankan di thread executor supaya
+event loop tidak pernah terblokir.
+"""
+import asyncio
+import json
+from urllib.parse import urlsplit, parse_qs
+import config
+from .gate_service import EnrollmentError
+
+REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class GateAPI:
+    def __init__(self, service, host=None, port=None):
+        self.service = service
+        self.host = host or config.API_HOST
+        self.port = config.API_PORT if port is None else port
+        self.server = None
+
+        self.routes = {
+            ("GET", "/health"): self._health,
+            ("GET", "/recognitions"): self._recognitions,
+            ("GET", "/events"): self._events,
+            ("POST", "/enroll"): self._enroll,
+        }
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        print(f"✅ HTTP API listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    # ------------------------------------------------------------ transport
+    async def _handle(self, reader, writer):
+        try:
+            status, payload = await self._respond(reader)
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n")
+        try:
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), config.API_REQUEST_TIMEOUT)
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), config.API_REQUEST_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            if length > config.API_MAX_BODY_BYTES:
+                raise HTTPError(413, "body terlalu besar")
+            body = await asyncio.wait_for(reader.readexactly(length), config.API_REQUEST_TIMEOUT) \
+                if length else b""
+
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except (ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return 400, {"error": "request tidak valid"}
+
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            return await self._dispatch(method.upper(), url.path.rstrip("/") or "/", query, body)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+
+    async def _dispatch(self, method, path, query, body):
+        handler = self.routes.get((method, path))
+
+        if handler is None and path.startswith("/jobs/") and method == "GET":
+            return await self._job(path[len("/jobs/"):])
+
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HTTPError(405, "method tidak didukung")
+            raise HTTPError(404, "tidak ditemukan")
+
+        return await handler(query, body)
+
+    @staticmethod
+    async def _blocking(fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    @staticmethod
+    def _int(query, key, default=None):
+        if key not in query:
+            return default
+        try:
+            return int(query[key])
+        except ValueError:
+            raise HTTPError(400, f"{key} harus angka")
+
+    # ------------------------------------------------------------- handlers
+    async def _health(self, query, body):
+        return 200, await self._blocking(self.service.health)
+
+    async def _recognitions(self, query, body):
+        recognitions = self.service.current_recognitions(camera_id=query.get("camera"))
+        if recognitions is None:
+            raise HTTPError(404, "kamera tidak ditemukan")
+        return 200, recognitions
+
+    async def _events(self, query, body):
+        limit = max(1, min(self._int(query, "limit", 50), config.API_MAX_EVENTS))
+        user_id = self._int(query, "user_id")
+        events = await self._blocking(self.service.recent_events, limit, user_id)
+        return 200, {"events": events}
+
+    async def _enroll(self, query, body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body harus JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "body harus JSON object")
+
+        try:
+            images = self.service.decode_images(data.get("images") or [])
+            user, job_id = await self._blocking(
+                self.service.enroll,
+                str(data.get("nama_ortu", "")).strip(),
+                str(data.get("nama_anak", "")).strip(),
+                str(data.get("kelas", "")).strip(),
+                images
+            )
+        except EnrollmentError as e:
+            raise HTTPError(e.status, str(e))
+
+        return 202, {"user": user, "job": self.service.job_status(job_id)}
+
+    async def _job(self, job_id):
+        try:
+            status = self.service.job_status(int(job_id))
+        except ValueError:
+            status = None
+        if status is None:
+            raise HTTPError(404, "job tidak ditemukan")
+        return 200, status
+
+
+class WebhookStub(GateAPI):
+    """Penerima webhook lokal untuk uji notifikasi orang tua (print + simpan payload)"""
+
+    def __init__(self, host=None, port=None):
+        super().__init__(None, host=host or "127.0.0.1",
+                         port=config.WEBHOOK_STUB_PORT if port is None else port)
+        self.received = []
+        self.routes = {("POST", "/notify"): self._notify}
+
+    async def _notify(self, query, body):
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body harus JSON")
+
+        self.received.append(payload)
+        print(f"📨 Notifikasi: {payload.get('nama_anak')} ({payload.get('kelas')}) "
+              f"di kamera {payload.get('camera')}")
+        return 200, {"received": len(self.received)}
@@ -0,0 +1,100 @@
+"""
+LBPH Descriptor - Implementasi NumPy dari Local Binary Patterns Histograms
+(kompatibel dengan cv2.face.LBPHFaceRecognizer: elbp + spatial histogram + chi-square)
+"""
+import math
+import numpy as np
+import config
+
+
+def default_params():
+    """Parameter LBPH dari config"""
+    return {
+        "radius": config.LBPH_RADIUS,
+        "neighbors": config.LBPH_NEIGHBORS,
+        "grid_x": config.LBPH_GRID_X,
+        "grid_y": config.LBPH_GRID_Y
+    }
+
+
+def histogram_size(params):
+    """Panjang vektor histogram (grid_x * grid_y * 2^neighbors)"""
+    return params["grid_x"] * params["grid_y"] * (2 ** params["neighbors"])
+
+
+def elbp(gray, radius=1, neighbors=8):
+    """Extended LBP (circular, bilinear interpolation) - sama dengan elbp_ di OpenCV"""
+    src = gray.astype(np.float32)
+    rows, cols = src.shape
+    out_h = rows - 2 * radius
+    out_w = cols - 2 * radius
+
+    center = src[radius:radius + out_h, radius:radius + out_w]
+    dst = np.zeros((out_h, out_w), dtype=np.int32)
+    eps = np.finfo(np.float32).eps
+
+    for n in range(neighbors):
+        x = np.float32(radius * math.cos(2.0 * math.pi * n / float(neighbors)))
+        y = np.float32(-radius * math.sin(2.0 * math.pi * n / float(neighbors)))
+
+        fx = int(math.floor(x))
+        fy = int(math.floor(y))
+        cx = int(math.ceil(x))
+        cy = int(math.ceil(y))
+
+        ty = y - np.float32(fy)
+        tx = x - np.float32(fx)
+
+        w1 = (1 - tx) * (1 - ty)
+        w2 = tx * (1 - ty)
+        w3 = (1 - tx) * ty
+        w4 = tx * ty
+
+        def shifted(dy, dx):
+            return src[radius + dy:radius + dy + out_h, radius + dx:radius + dx + out_w]
+
+        t = (w1 * shifted(fy, fx) + w2 * shifted(fy, cx) +
+             w3 * shifted(cy, fx) + w4 * shifted(cy, cx))
+
+        bit = (t > center) | (np.abs(t - center) < eps)
+        dst += bit.astype(np.int32) << n
+
+    return dst
+
+
+def spatial_histogram(lbp, num_patterns, grid_x, grid_y):
+    """Histogram per cell grid, dinormalisasi per jumlah pixel cell"""
+    rows, cols = lbp.shape
+    width = cols // grid_x
+    height = rows // grid_y
+
+    cells = lbp[:grid_y * height, :grid_x * width]
+    cells = cells.reshape(grid_y, height, grid_x, width).transpose(0, 2, 1, 3)
+    cells = cells.reshape(grid_y * grid_x, height * width)
+
+    offsets = (np.arange(grid_y * grid_x, dtype=np.int64) * num_patterns)[:, None]
+    counts = np.bincount((cells + offsets).ravel(), minlength=grid_y * grid_x * num_patterns)
+
+    hist = counts.astype(np.float32) / np.float32(height * width)
+    return hist
+
+
+def compute_histogram(face, params=None):
+    """Hitung histogram LBPH (float32, 1-D) dari wajah grayscale"""
+    params = params or default_params()
+    lbp = elbp(face, params["radius"], params["neighbors"])
+    return spatial_histogram(
+        lbp,
+        2 ** params["neighbors"],
+        params["grid_x"],
+        params["grid_y"]
+    )
+
+
+def chi_square(histograms, query):
+    """Jarak chi-square (HISTCMP_CHISQR_ALT) antara setiap baris histograms dan query"""
+    diff = histograms - query
+    total = histograms + query
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(total > 0, diff * diff / total, 0.0)
+    return 2.0 * terms.sum(axis=-1, dtype=np.float64)
@@ -0,0 +1,207 @@
+"""
+LBPH Matcher - Pencarian chi-square vektorisasi NumPy (pengganti recognizer.predict)
+"""
+import numpy as np
+import config
+
+
+class LBPHMatcher:
+    """
+    Menyimpan semua histogram training sebagai satu matrix float32 kontigu
+    dan menghitung jarak ke satu atau beberapa probe sekaligus.
+
+    Semua state disimpan dalam satu tuple yang diganti sekaligus, jadi thread
+    lain yang sedang search selalu melihat histogram & label yang konsisten.
+    """
+
+    _EMPTY = (None, None, None, None, None)
+
+    def __init__(self, histograms=None, labels=None, block_bytes=None):
+        self.block_bytes = block_bytes or config.MATCHER_BLOCK_BYTES
+        self._model = self._EMPTY
+
+        if histograms is not None:
+            self.set_model(histograms, labels)
+
+    @property
+    def histograms(self):
+        return self._model[0]
+
+    @property
+    def labels(self):
+        return self._model[1]
+
+    def set_model(self, histograms, labels):
+        """Ganti isi matcher (histograms: (N, D), labels: (N,))"""
+        histograms = np.ascontiguousarray(histograms, dtype=np.float32)
+        labels = np.ascontiguousarray(labels, dtype=np.int32).ravel()
+
+        if histograms.ndim != 2 or histograms.shape[0] != labels.shape[0]:
+            raise ValueError(f"Shape tidak cocok: {histograms.shape} vs {labels.shape}")
+
+        # Index per user untuk agregasi best-of-N (label diurutkan, lalu reduceat)
+        order = np.argsort(labels, kind="stable")
+        sorted_labels = labels[order]
+        if len(sorted_labels):
+            starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+
+        self._model = (histograms, labels, order, starts, sorted_labels[starts])
+
+    def add(self, histograms, labels):
+        """Tambah sample baru (append di akhir matrix)"""
+        histograms = np.atleast_2d(np.asarray(histograms, dtype=np.float32))
+        labels = np.asarray(labels, dtype=np.int32).ravel()
+
+        current, current_labels = self._model[:2]
+
+        if current is None or len(current_labels) == 0:
+            self.set_model(histograms, labels)
+        else:
+            self.set_model(
+                np.concatenate([current, histograms]),
+                np.concatenate([current_labels, labels])
+            )
+
+    def remove_label(self, label):
+        """Hapus semua sample milik satu label. Return jumlah sample yang dihapus"""
+        histograms, labels = self._model[:2]
+        if labels is None or len(labels) == 0:
+            return 0
+
+        keep = labels != label
+        removed = int(len(labels) - np.count_nonzero(keep))
+        if removed:
+            self.set_model(histograms[keep], labels[keep])
+        return removed
+
+    def replace_label(self, label, histograms):
+        """
+        Ganti semua sample satu label dengan histograms baru (None/kosong = hapus)
+        dalam satu kali swap model. Return jumlah sample lama yang diganti
+        """
+        current, current_labels = self._model[:2]
+        keep_hist, keep_labels, replaced = current, current_labels, 0
+
+        if current_labels is not None and len(current_labels):
+            keep = current_labels != label
+            replaced = int(len(current_labels) - np.count_nonzero(keep))
+            if replaced:
+                keep_hist, keep_labels = current[keep], current_labels[keep]
+
+        if histograms is None or len(histograms) == 0:
+            if replaced:
+                self.set_model(keep_hist, keep_labels)
+            return replaced
+
+        histograms = np.atleast_2d(np.asarray(histograms, dtype=np.float32))
+        labels = np.full(len(histograms), label, dtype=np.int32)
+
+        if keep_labels is None or len(keep_labels) == 0:
+            self.set_model(histograms, labels)
+        else:
+            self.set_model(np.concatenate([keep_hist, histograms]),
+                           np.concatenate([keep_labels, labels]))
+        return replaced
+
+    def has_label(self, label):
+        labels = self.labels
+        return labels is not None and bool(np.any(labels == label))
+
+    def __len__(self):
+        labels = self.labels
+        return 0 if labels is None else int(labels.shape[0])
+
+    def user_count(self):
+        user_labels = self._model[4]
+        return 0 if user_labels is None else int(user_labels.shape[0])
+
+    def distances(self, queries):
+        """
+        Jarak chi-square (HISTCMP_CHISQR_ALT) semua probe ke semua sample.
+        queries: (D,) atau (Q, D). Return (Q, N) float64.
+        """
+        return self._distances(self._model[0], queries)
+
+    def _distances(self, histograms, queries):
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        n = 0 if histograms is None else histograms.shape[0]
+        result = np.empty((queries.shape[0], n), dtype=np.float64)
+        if n == 0:
+            return result
+
+        # Proses per blok baris supaya buffer (Q, rows, D) tetap kecil
+        dim = histograms.shape[1]
+        rows = max(1, self.block_bytes // (4 * dim * queries.shape[0]))
+
+        probe = queries[:, None, :]
+        for start in range(0, n, rows):
+            block = histograms[start:start + rows][None, :, :]
+
+            diff = block - probe
+            total = block + probe
+            np.square(diff, out=diff)
+            # total == 0 hanya jika kedua bin 0, dan di situ diff juga 0
+            np.divide(diff, total, out=diff, where=total > 0)
+
+            result[:, start:start + rows] = diff.sum(axis=2, dtype=np.float64)
+
+        result *= 2.0
+        return result
+
+    def search(self, queries, k=1):
+        """
+        Top-k sample terdekat per probe.
+        Return list (per probe) of list[(label, distance)], jarak menaik.
+        """
+        histograms, labels = self._model[:2]
+        dist = self._distances(histograms, queries)
+        return self._top_k(dist, labels, k)
+
+    def search_users(self, queries, k=1):
+        """
+        Top-k user terdekat per probe, jarak user = sample terbaik (best-of-N).
+        Return list (per probe) of list[(label, distance)], jarak menaik.
+        """
+        model = self._model
+        dist = self._user_distances(model, queries)
+        return self._top_k(dist, model[4], k)
+
+    def user_distances(self, queries):
+        """Jarak minimum per user: (Q, U), urutan kolom sesuai user_labels()"""
+        return self._user_distances(self._model, queries)
+
+    def _user_distances(self, model, queries):
+        histograms, _, order, starts, _ = model
+        dist = self._distances(histograms, queries)
+        if dist.shape[1] == 0:
+            return dist
+        return np.minimum.reduceat(dist[:, order], starts, axis=1)
+
+    def user_labels(self):
+        return self._model[4]
+
+    @staticmethod
+    def _top_k(dist, labels, k):
+        """Ambil k kolom terkecil per baris"""
+        results = []
+        n = dist.shape[1]
+        k = min(k, n)
+        if labels is None:
+            labels = np.zeros(0, dtype=np.int32)
+
+        for row in dist:
+            if k <= 0:
+                results.append([])
+                continue
+
+            if k < n:
+                idx = np.argpartition(row, k - 1)[:k]
+            else:
+                idx = np.arange(n)
+            idx = idx[np.argsort(row[idx], kind="stable")]
+
+            results.append([(int(labels[i]), float(row[i])) for i in idx])
+
+        return results
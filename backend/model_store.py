@@ -0,0 +1,354 @@
+"""
+Model Store - Format model biner (NumPy) yang bisa di-memory-map
+
+Layout di config.MODEL_DIR:
+    histograms.<G>.npy  float32 (N, grid_x * grid_y * 2^neighbors)
+    labels.<G>.npy      int32 (N,)
+    model_header.json   versi format + parameter LBPH + generasi + jumlah sample
+
+Setiap save/append menaikkan nomor generasi. model_header.json adalah titik
+commit: file data generasi baru ditulis dulu (atomic), baru header diganti.
+Header juga mencatat generasi sebelumnya (file + jumlah sample) yang datanya
+tetap disimpan, jadi jika labels.json ternyata masih generasi lama (crash di
+antara keduanya) model generasi lama bisa dipakai. Model versi 1 (tanpa
+generasi) memakai histograms.npy / labels.npy.
+
+Jalankan `python convert_model.py` untuk konversi satu kali
+dari face_model.yml (OpenCV LBPH) lama.
+"""
+import glob
+import io
+import json
+import os
+import numpy as np
+import config
+from . import lbph
+from .persistence import write_json, save_npy
+
+
+class ModelStore:
+    FORMAT = "face-gate-lbph"
+    VERSION = 2
+
+    def __init__(self, model_dir=None):
+        self.model_dir = model_dir or config.MODEL_DIR
+        self.header_file = os.path.join(self.model_dir, config.MODEL_HEADER_NAME)
+
+    def _data_files(self, files):
+        """Path (histograms, labels) untuk id file generasi (None = layout versi 1)"""
+        names = []
+        for name in (config.MODEL_HISTOGRAMS_NAME, config.MODEL_LABELS_VECTOR_NAME):
+            if files is not None:
+                stem, ext = os.path.splitext(name)
+                name = f"{stem}.{files}{ext}"
+            names.append(os.path.join(self.model_dir, name))
+        return names
+
+    def read_header(self):
+        """Header model sekarang (None jika belum ada)"""
+        if not os.path.exists(self.header_file):
+            return None
+
+        with open(self.header_file, 'r', encoding='utf-8') as f:
+            header = json.load(f)
+
+        if header.get("format") != self.FORMAT:
+            raise ValueError(f"Format model tidak dikenal: {header.get('format')}")
+
+        if header.get("version", 0) > self.VERSION:
+            raise ValueError(f"Versi model {header.get('version')} tidak didukung")
+
+        return header
+
+    def exists(self):
+        """Cek apakah header + file data model ada"""
+        try:
+            header = self.read_header()
+        except (OSError, ValueError):
+            return False
+        return header is not None and all(
+            os.path.exists(p) for p in self._data_files(header.get("files"))
+        )
+
+    def _header(self, params, histograms, count, generation, files, previous):
+        return {
+            "format": self.FORMAT,
+            "version": self.VERSION,
+            "radius": params["radius"],
+            "neighbors": params["neighbors"],
+            "grid_x": params["grid_x"],
+            "grid_y": params["grid_y"],
+            "hist_size": int(histograms.shape[1]),
+            "count": int(count),
+            "dtype": "float32",
+            "generation": generation,
+            "files": files,
+            "previous": previous
+        }
+
+    @staticmethod
+    def _snapshot(header):
+        """Ringkasan generasi untuk field "previous" di header berikutnya"""
+        if header is None:
+            return None
+        return {
+            "generation": header.get("generation", 0),
+            "files": header.get("files"),
+            "count": header["count"]
+        }
+
+    def _current_header(self):
+        try:
+            return self.read_header()
+        except (OSError, ValueError):
+            return None
+
+    def save(self, histograms, labels, params):
+        """Simpan matrix histogram + vektor label sebagai generasi baru"""
+        histograms = np.ascontiguousarray(histograms, dtype=np.float32)
+        labels = np.ascontiguousarray(labels, dtype=np.int32).ravel()
+
+        if histograms.ndim != 2 or histograms.shape[0] != labels.shape[0]:
+            raise ValueError(f"Shape tidak cocok: {histograms.shape} vs {labels.shape}")
+
+        os.makedirs(self.model_dir, exist_ok=True)
+
+        current = self._current_header()
+        generation = (current.get("generation", 0) if current else 0) + 1
+        previous = self._snapshot(current)
+
+        # File data baru dulu, lalu header (commit). Model lama yang sedang di-mmap tetap valid
+        hist_path, labels_path = self._data_files(generation)
+        save_npy(hist_path, histograms)
+        save_npy(labels_path, labels)
+
+        header = self._header(params, histograms, histograms.shape[0],
+                              generation, generation, previous)
+        write_json(self.header_file, header)
+
+        self._cleanup(header)
+        return header
+
+    def append(self, histograms, labels, params):
+        """
+        Tambah sample di akhir file tanpa menulis ulang seluruh model.
+        Header .npy punya ruang cadangan untuk shape, jadi cukup diupdate in-place.
+        Generasi sebelumnya = baris [:count lama] dari file yang sama.
+        """
+        if not self.exists():
+            return self.save(histograms, labels, params)
+
+        histograms = np.ascontiguousarray(histograms, dtype=np.float32)
+        labels = np.ascontiguousarray(labels, dtype=np.int32).ravel()
+
+        current = self.read_header()
+
+        if params_from_header(current) != params:
+            raise ValueError("Parameter LBPH berbeda dengan model tersimpan")
+
+        if histograms.ndim != 2 or histograms.shape[1] != current["hist_size"]:
+            raise ValueError(f"Histogram shape {histograms.shape} tidak sesuai header")
+
+        if histograms.shape[0] != labels.shape[0]:
+            raise ValueError(f"Shape tidak cocok: {histograms.shape} vs {labels.shape}")
+
+        files = current.get("files")
+        hist_path, labels_path = self._data_files(files)
+        _append_npy(hist_path, histograms, current["count"])
+        _append_npy(labels_path, labels, current["count"])
+
+        header = self._header(params, histograms, current["count"] + histograms.shape[0],
+                              current.get("generation", 0) + 1, files, self._snapshot(current))
+        write_json(self.header_file, header)
+
+        self._cleanup(header)
+        return header
+
+    def load(self, mmap=True, generation=None):
+        """
+        Load model. Return (histograms, labels, header) atau None.
+        generation: load generasi tertentu (sekarang atau sebelumnya), ValueError jika tidak ada.
+        Dengan mmap=True histogram tidak dibaca ke RAM sampai dipakai.
+        """
+        header = self.read_header()
+        if header is None:
+            return None
+
+        entry = self._snapshot(header)
+        if generation is not None and generation != entry["generation"]:
+            entry = header.get("previous")
+            if entry is None or entry["generation"] != generation:
+                raise ValueError(f"Generasi model {generation} tidak tersedia")
+            header = dict(header, count=entry["count"], generation=entry["generation"],
+                          files=entry["files"], previous=None)
+            print(f"⚠️ Model newer than labels, using previous generation {generation}")
+
+        hist_path, labels_path = self._data_files(entry["files"])
+        histograms = np.load(hist_path, mmap_mode='r' if mmap else None)
+        labels = np.load(labels_path)
+
+        count = entry["count"]
+        if histograms.ndim != 2 or histograms.shape[1] != header["hist_size"] \
+                or histograms.shape[0] < count:
+            raise ValueError(f"Histogram shape {histograms.shape} tidak sesuai header")
+
+        if labels.shape[0] < count:
+            raise ValueError(f"Jumlah label {labels.shape[0]} tidak sesuai header")
+
+        # Baris setelah count = append yang belum di-commit (atau generasi lebih baru)
+        return histograms[:count], labels[:count], header
+
+    def _cleanup(self, header=None):
+        """Hapus file data yang bukan milik generasi sekarang / sebelumnya (header=None: semua)"""
+        keep = set()
+        if header is not None:
+            keep.update(self._data_files(header.get("files")))
+            if header.get("previous"):
+                keep.update(self._data_files(header["previous"]["files"]))
+
+        patterns = []
+        for name in (config.MODEL_HISTOGRAMS_NAME, config.MODEL_LABELS_VECTOR_NAME):
+            stem, ext = os.path.splitext(name)
+            patterns += [os.path.join(self.model_dir, name),
+                         os.path.join(self.model_dir, f"{stem}.*{ext}")]
+
+        for pattern in patterns:
+            for path in glob.glob(pattern):
+                if path not in keep:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def delete(self):
+        """Hapus file model"""
+        if os.path.exists(self.header_file):
+            os.remove(self.header_file)
+        self._cleanup()
+
+
+def _append_npy(path, rows, count):
+    """
+    Tulis baris di posisi count (axis 0) file .npy; baris sisa crash sebelumnya ditimpa
+    (atau dibiarkan di belakang shape baru jika lebih panjang).
+    Fallback tulis ulang jika header tidak muat.
+    """
+    fmt = np.lib.format
+
+    with open(path, 'r+b') as f:
+        version = fmt.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = fmt.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = fmt.read_array_header_2_0(f)
+        header_len = f.tell()
+
+        if fortran_order or dtype != rows.dtype or tuple(shape[1:]) != rows.shape[1:] \
+                or shape[0] < count:
+            raise ValueError(f"Tidak bisa append ke {path}")
+
+        new_shape = (count + rows.shape[0],) + tuple(shape[1:])
+        buf = io.BytesIO()
+        header = {
+            "descr": fmt.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": new_shape
+        }
+        if version == (1, 0):
+            fmt.write_array_header_1_0(buf, header)
+        else:
+            fmt.write_array_header_2_0(buf, header)
+
+        if len(buf.getvalue()) == header_len:
+            # Data dulu, baru header - kalau terputus di tengah, shape lama tetap valid
+            row_bytes = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+            f.seek(header_len + count * row_bytes)
+            f.write(rows.tobytes())
+            # Tanpa truncate: file hanya boleh tumbuh, process lain mungkin masih mmap
+            # generasi ini (mengecilkan file yang di-map bisa SIGBUS). Byte sisa di
+            # belakang shape header diabaikan np.load
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(buf.getvalue())
+            f.flush()
+            os.fsync(f.fileno())
+            return
+
+    existing = np.load(path)[:count]
+    save_npy(path, np.concatenate([existing, rows]))
+
+
+def pack_labels(label_to_user, generation):
+    """Isi labels.json: mapping label -> user + generasi model pasangannya"""
+    return {"generation": generation, "users": label_to_user}
+
+
+def unpack_labels(data):
+    """labels.json -> (generation, {label: user}). Format lama (tanpa generasi) -> None"""
+    if "users" in data and "generation" in data:
+        return data["generation"], {int(k): v for k, v in data["users"].items()}
+    return None, {int(k): v for k, v in data.items()}
+
+
+def params_from_header(header):
+    """Ambil parameter LBPH dari header"""
+    return {key: header[key] for key in ("radius", "neighbors", "grid_x", "grid_y")}
+
+
+def read_legacy_model(yaml_path):
+    """Baca face_model.yml (OpenCV LBPH) -> (histograms, labels, params)"""
+    import cv2
+
+    fs = cv2.FileStorage(yaml_path, cv2.FILE_STORAGE_READ)
+    try:
+        root = fs.getNode("opencv_lbphfaces")
+        if root.empty():
+            raise ValueError("Node opencv_lbphfaces tidak ditemukan")
+
+        params = {
+            "radius": int(root.getNode("radius").real()),
+            "neighbors": int(root.getNode("neighbors").real()),
+            "grid_x": int(root.getNode("grid_x").real()),
+            "grid_y": int(root.getNode("grid_y").real())
+        }
+
+        hist_node = root.getNode("histograms")
+        histograms = [hist_node.at(i).mat().ravel() for i in range(hist_node.size())]
+        labels = root.getNode("labels").mat()
+    finally:
+        fs.release()
+
+    size = lbph.histogram_size(params)
+    if not histograms:
+        histograms = np.zeros((0, size), dtype=np.float32)
+    else:
+        histograms = np.vstack(histograms).astype(np.float32)
+
+    labels = np.zeros(0, dtype=np.int32) if labels is None else labels.astype(np.int32).ravel()
+    return histograms, labels, params
+
+
+def convert_legacy_model(yaml_path=None, labels_path=None, store=None):
+    """Konversi satu kali face_model.yml + labels.json ke format biner"""
+    yaml_path = yaml_path or config.LEGACY_MODEL_FILE
+    labels_path = labels_path or config.LABELS_FILE
+    store = store or ModelStore()
+
+    if not os.path.exists(yaml_path):
+        print(f"ℹ️ Legacy model not found: {yaml_path}")
+        return False
+
+    histograms, labels, params = read_legacy_model(yaml_path)
+
+    # Pastikan setiap label punya data user di labels.json
+    if os.path.exists(labels_path):
+        with open(labels_path, 'r', encoding='utf-8') as f:
+            known = {int(k) for k in unpack_labels(json.load(f))[1]}
+        missing = sorted(set(labels.tolist()) - known)
+        if missing:
+            print(f"⚠️ Labels without user data: {missing}")
+
+    store.save(histograms, labels, params)
+    print(f"✅ Converted {len(labels)} samples: {yaml_path} -> {store.model_dir}")
+    return True
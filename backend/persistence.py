@@ -0,0 +1,68 @@
+"""
+Persistence - Penulisan file yang aman terhadap mati listrik
+
+Data ditulis ke file sementara di folder yang sama, di-fsync, lalu di-rename
+ke tujuan (os.replace atomic). Setelah crash, file tujuan selalu berisi versi
+lama atau versi baru secara utuh - tidak pernah setengah tertulis.
+"""
+import json
+import os
+from contextlib import contextmanager
+import numpy as np
+
+
+def fsync_dir(path):
+    """fsync folder supaya rename-nya ikut tersimpan (diabaikan jika OS tidak mendukung)"""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path, mode='w', encoding=None):
+    """
+    with atomic_write(path) as f: ...
+    File tujuan baru diganti jika blok selesai tanpa exception.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    if 'b' not in mode and encoding is None:
+        encoding = 'utf-8'
+
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    fsync_dir(directory)
+
+
+def write_json(path, data, **kwargs):
+    """json.dump atomic (default indent=2, ensure_ascii=False)"""
+    kwargs.setdefault("indent", 2)
+    kwargs.setdefault("ensure_ascii", False)
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **kwargs)
+
+
+def save_npy(path, array):
+    """np.save atomic"""
+    with atomic_write(path, 'wb') as f:
+        np.save(f, array)
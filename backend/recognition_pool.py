@@ -0,0 +1,124 @@
+"""
+Recognition Pool - Prediksi banyak wajah per frame secara paralel (multi-process)
+
+Crop wajah 200x200 dibagi ke beberapa process; setiap process menghitung
+histogram LBPH dan mencari user terdekat. Histogram model tidak dikirim ke
+worker dan tidak disalin: worker memory-map file generasi model dari
+ModelStore berdasarkan nomor generasi, jadi semua process berbagi page cache
+yang sama dengan main process. Model yang belum tersimpan (mis. di tengah
+enrollment) diprediksi di thread pemanggil saja.
+"""
+import math
+import multiprocessing
+import os
+import threading
+import numpy as np
+import config
+from . import lbph
+from .matcher import LBPHMatcher
+from .model_store import ModelStore
+
+
+# --------------------------------------------------------------------- worker
+_worker_state = {"model": None, "matcher": None}
+
+
+def _worker_init():
+    """Satu thread OpenCV per process, paralelisme dari jumlah process"""
+    import cv2
+    cv2.setNumThreads(1)
+
+
+def _attach(model_dir, generation):
+    """Memory-map model generasi ini dari ModelStore (sekali per generasi)"""
+    state = _worker_state
+    if state["model"] == (model_dir, generation):
+        return state["matcher"]
+
+    loaded = ModelStore(model_dir).load(mmap=True, generation=generation)
+    if loaded is None:
+        raise ValueError(f"Model generasi {generation} tidak tersedia")
+    histograms, labels, _ = loaded
+
+    state["matcher"] = LBPHMatcher(histograms, labels)
+    state["model"] = (model_dir, generation)
+    return state["matcher"]
+
+
+def _predict_chunk(model_dir, generation, params, faces):
+    """faces: (K, 200, 200) uint8 -> list of (label, distance)"""
+    matcher = _attach(model_dir, generation)
+    queries = np.vstack([lbph.compute_histogram(face, params) for face in faces])
+    return [candidates[0] for candidates in matcher.search_users(queries, k=1)]
+
+
+# ---------------------------------------------------------------------- pool
+class RecognitionPool:
+    def __init__(self, processes=None, min_faces=None):
+        if processes is None:
+            processes = config.RECOGNITION_POOL_PROCESSES or max(1, (os.cpu_count() or 1) - 1)
+        self.processes = processes
+        self.min_faces = min_faces or config.RECOGNITION_POOL_MIN_FACES
+
+        self.pool = None
+        self._active = 0    # predict() yang sedang memakai pool
+        self._cond = threading.Condition()
+
+    @property
+    def is_running(self):
+        return self.pool is not None
+
+    def start(self):
+        """Start worker processes (spawn: aman meski main process punya thread)"""
+        if self.pool is not None or self.processes < 2:
+            return False
+
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(self.processes, initializer=_worker_init)
+        print(f"✅ Recognition pool started: {self.processes} processes")
+        return True
+
+    def stop(self):
+        """Stop workers; predict() baru langsung return None, yang sedang jalan ditunggu sebentar"""
+        with self._cond:
+            pool, self.pool = self.pool, None
+            if pool is None:
+                return
+            self._cond.wait_for(lambda: self._active == 0, timeout=2)
+
+        pool.terminate()
+        pool.join()
+        print("✅ Recognition pool stopped")
+
+    def should_use(self, face_count):
+        return self.pool is not None and face_count >= self.min_faces
+
+    def predict(self, model_dir, generation, params, faces):
+        """
+        Prediksi crop wajah (list/array (K, 200, 200) uint8) secara paralel
+        dengan model generasi `generation` di model_dir.
+        Return list of (label, distance) sesuai urutan input, atau None jika
+        pool sudah berhenti / generasi itu sudah tidak tersedia (pemanggil
+        prediksi sendiri).
+        """
+        with self._cond:
+            pool = self.pool
+            if pool is None:
+                return None
+            self._active += 1
+
+        faces = np.asarray(faces, dtype=np.uint8)
+        chunk = math.ceil(len(faces) / self.processes)
+        chunks = [faces[i:i + chunk] for i in range(0, len(faces), chunk)]
+
+        try:
+            results = pool.starmap(_predict_chunk,
+                                   [(model_dir, generation, params, c) for c in chunks])
+        except (OSError, ValueError):
+            return None
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+        return [candidate for part in results for candidate in part]
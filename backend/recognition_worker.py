@@ -0,0 +1,277 @@
+"""
+Recognition Worker - Deteksi & rekognisi wajah di background thread
+"""
+import threading
+import time
+import config
+from .face_tracker import FaceTracker
+from .frame_scheduler import FrameScheduler
+from .event_bus import FACE_DETECTED, STUDENT_RECOGNIZED, UNKNOWN_FACE
+
+
+class StageStats:
+    """Latency counter untuk satu stage pipeline (ms)"""
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self.count = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        """Catat satu sample latency"""
+        self.count += 1
+        self.last_ms = ms
+        if self.count == 1:
+            self.avg_ms = ms
+        else:
+            self.avg_ms += self.alpha * (ms - self.avg_ms)
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "last_ms": round(self.last_ms, 2),
+            "avg_ms": round(self.avg_ms, 2),
+            "max_ms": round(self.max_ms, 2)
+        }
+
+
+class RecognitionResult:
+    """Hasil rekognisi untuk satu frame (immutable setelah dibuat)"""
+
+    def __init__(self, result_id, frame_seq, faces, recognized, captured_at, finished_at, camera_id=None,
+                 latency=None):
+        self.result_id = result_id
+        self.camera_id = camera_id
+        self.frame_seq = frame_seq
+        self.faces = faces              # list of (x, y, w, h)
+        self.recognized = recognized    # list of (user, confidence)
+        self.captured_at = captured_at  # waktu frame diambil dari kamera
+        self.finished_at = finished_at  # waktu rekognisi selesai
+        # Detik dari frame masuk pipeline sampai hasil siap (captured_at bisa waktu media)
+        self.latency = finished_at - captured_at if latency is None else latency
+
+    def age(self, now=None):
+        """Umur hasil dalam detik"""
+        return (now or time.time()) - self.finished_at
+
+
+class LatestSlot:
+    """
+    Slot "hasil terakhir" tanpa lock.
+    Rebinding satu referensi atomic di CPython, jadi reader
+    selalu melihat objek lengkap (lama atau baru), tidak pernah setengah jadi.
+    """
+
+    def __init__(self):
+        self._value = None
+
+    def publish(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def clear(self):
+        self._value = None
+
+
+class RecognitionWorker:
+    """
+    Background stage: ambil frame terbaru dari CameraHandler, deteksi + rekognisi,
+    lalu publish ke LatestSlot. Frame lama tidak diantrikan - selalu pakai yang terbaru.
+    Dengan event_bus, setiap hasil juga dikirim sebagai event (face detected,
+    student recognized, unknown face) untuk consumer lain.
+    """
+
+    STAGES = ("detect", "recognize", "total", "latency")  # latency: frame diambil -> hasil siap
+
+    def __init__(self, camera_handler, face_recognition, scheduler=None, event_bus=None):
+        self.camera_handler = camera_handler
+        self.face_recognition = face_recognition
+        self.scheduler = scheduler or FrameScheduler()
+        self.event_bus = event_bus
+        self.tracker = FaceTracker(face_recognition)
+
+        self.latest = LatestSlot()
+        self.stats = {name: StageStats() for name in self.STAGES}
+        self.frames_processed = 0
+        self.frames_dropped = 0
+
+        self.is_running = False
+        self.thread = None
+        self._active = threading.Event()
+        self._last_seq = 0
+        self._result_id = 0
+        self._reset_tracker = False
+
+    def start(self):
+        """Start worker thread"""
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self.thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.thread.start()
+        print("✅ Recognition worker started")
+
+    def stop(self):
+        """Stop worker thread"""
+        self.is_running = False
+        self._active.set()  # Bangunkan thread supaya bisa keluar
+
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+
+        print("✅ Recognition worker stopped")
+
+    def set_active(self, active):
+        """Aktifkan/nonaktifkan scanning"""
+        if active:
+            self._active.set()
+        else:
+            self._active.clear()
+            self.latest.clear()
+            self._reset_tracker = True
+
+    def is_active(self):
+        return self._active.is_set()
+
+    def get_result(self, max_age=None):
+        """Ambil hasil terakhir (None jika tidak ada / terlalu lama)"""
+        result = self.latest.get()
+        if result is None:
+            return None
+        if max_age is not None and result.age() > max_age:
+            return None
+        return result
+
+    @property
+    def last_seq(self):
+        """Sequence frame terakhir yang diproses"""
+        return self._last_seq
+
+    def get_stats(self):
+        """Latency per stage + counter frame"""
+        stats = {name: s.to_dict() for name, s in self.stats.items()}
+        stats["frames_processed"] = self.frames_processed
+        stats["frames_dropped"] = self.frames_dropped
+        stats["tracker"] = self.tracker.get_stats()
+        stats["rates"] = self.scheduler.get_rates()
+        return stats
+
+    def _worker_loop(self):
+        """Worker loop"""
+        while self.is_running:
+            if not self._active.wait(timeout=0.2):
+                continue
+
+            try:
+                # Batasi ke target fps rekognisi (diturunkan scheduler saat UI kewalahan)
+                delay = self.scheduler.recognition_delay()
+                if delay > 0:
+                    time.sleep(min(delay, config.FRAME_WAIT_TIMEOUT))
+                    continue
+
+                # Blok sampai ada frame baru; slot-nya dipinjam selama diproses
+                with self.camera_handler.borrow_frame(
+                        newer_than=self._last_seq, timeout=config.FRAME_WAIT_TIMEOUT) as (seq, frame):
+                    if frame is None:
+                        continue
+                    self.process_frame(seq, frame)
+
+            except Exception as e:
+                print(f"❌ Recognition worker error: {e}")
+                time.sleep(0.1)
+
+    def process_frame(self, seq, frame):
+        """
+        Proses satu frame dari thread pemanggil (worker loop sendiri, atau pool
+        bersama CameraManager). Satu kamera tidak boleh diproses dua thread sekaligus.
+        """
+        # Frame yang terlewat (stale) dihitung, tidak diproses
+        if self._last_seq and seq > self._last_seq + 1:
+            self.frames_dropped += seq - self._last_seq - 1
+        self._last_seq = seq
+
+        if self._reset_tracker:
+            self._reset_tracker = False
+            self.tracker.reset()
+
+        self._process(seq, frame)
+
+    def _process(self, seq, frame):
+        """Deteksi + rekognisi satu Frame lalu publish hasilnya"""
+        captured_at = getattr(frame, "timestamp", None)
+        if captured_at is None:
+            captured_at = time.time()
+        received_at = getattr(frame, "received_at", None)
+        if received_at is None:
+            received_at = captured_at
+        t0 = time.perf_counter()
+
+        # Tracker: full scan / ROI scan, recognize hanya track yang perlu
+        tracks = self.tracker.detect(frame)
+        t1 = time.perf_counter()
+
+        self.tracker.recognize(frame, tracks)
+        t2 = time.perf_counter()
+
+        self.stats["detect"].add((t1 - t0) * 1000)
+        self.stats["recognize"].add((t2 - t1) * 1000)
+        self.stats["total"].add((t2 - t0) * 1000)
+        self.frames_processed += 1
+        self.scheduler.recognition_tick(t0)
+
+        # Scan dimatikan saat sedang proses - buang hasil
+        if not self._active.is_set():
+            return
+
+        self._result_id += 1
+        finished_at = time.time()
+        result = RecognitionResult(
+            result_id=self._result_id,
+            frame_seq=seq,
+            faces=[t.box for t in tracks],
+            recognized=[(t.user, t.confidence) for t in tracks],
+            captured_at=captured_at,
+            finished_at=finished_at,
+            camera_id=self.camera_handler.camera_id,
+            latency=finished_at - received_at
+        )
+        self.latest.publish(result)
+        self.stats["latency"].add(result.latency * 1000)
+
+        if self.event_bus is not None and tracks:
+            self._publish_events(result, tracks)
+
+    def _publish_events(self, result, tracks):
+        """Satu event per frame berwajah + satu per wajah (timestamp = waktu frame diambil)"""
+        bus = self.event_bus
+        camera = result.camera_id
+        ts = result.captured_at
+        latency = round(result.latency * 1000, 2)
+
+        bus.publish(FACE_DETECTED, timestamp=ts, camera=camera, frame_seq=result.frame_seq,
+                    faces=len(tracks), latency_ms=latency)
+
+        for track in tracks:
+            # Prediksi gagal (error / belum ada model) bukan wajah asing: tidak dilaporkan
+            if track.failed:
+                continue
+            data = {
+                "camera": camera,
+                "frame_seq": result.frame_seq,
+                "track_id": track.track_id,
+                "box": [int(v) for v in track.box],
+                "confidence": round(float(track.confidence), 2)
+            }
+            if track.user:
+                bus.publish(STUDENT_RECOGNIZED, timestamp=ts, user_id=track.user["id"],
+                            nama_anak=track.user["nama_anak"], kelas=track.user.get("kelas"), **data)
+            else:
+                bus.publish(UNKNOWN_FACE, timestamp=ts, **data)
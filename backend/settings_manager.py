@@ -1,8 +1,16 @@
 """
 Settings Manager
+
+Nilai setting disimpan di memori (tipe mengikuti DEFAULT). Setter tidak
+langsung menulis file: perubahan dikumpulkan lalu ditulis sekali oleh timer
+background (config.SETTINGS_FLUSH_DELAY). Komponen lain cukup subscribe()
+untuk bereaksi langsung saat nilai berubah.
 """
 import json
 import os
+import threading
+import config
+from .persistence import write_json
 
 class SettingsManager:
     DEFAULT = {
@@ -10,22 +18,42 @@ class SettingsManager:
         "flip_horizontal": False,
         "flip_vertical": False,
         "fullscreen": False,
-        "show_fps": False
+        "show_fps": False,
+        # Tuning rekognisi (default dari config.py)
+        "face_scale_factor": config.FACE_SCALE_FACTOR,
+        "face_min_neighbors": config.FACE_MIN_NEIGHBORS,
+        "confidence_threshold": float(config.CONFIDENCE_THRESHOLD),
+        "detection_width": config.DETECTION_WIDTH
     }
-    
-    def __init__(self, filepath="data/settings.json"):
+
+    # Setting yang boleh None (mis. detection_width = resolusi penuh)
+    NULLABLE = {"detection_width"}
+
+    def __init__(self, filepath="data/settings.json", flush_delay=None):
         self.filepath = filepath
+        self.flush_delay = config.SETTINGS_FLUSH_DELAY if flush_delay is None else flush_delay
         self.settings = {}
+        self.lock = threading.RLock()
+        self.subscribers = []     # list of (callback, keys atau None)
+        self.dirty = False
+        self.timer = None
         self._load()
-    
+
     def _load(self):
         """Load settings"""
         try:
             os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-            
+
             if os.path.exists(self.filepath) and os.path.getsize(self.filepath) > 0:
                 with open(self.filepath, 'r') as f:
-                    self.settings = json.load(f)
+                    stored = json.load(f)
+                self.settings = self.DEFAULT.copy()
+                for key, value in stored.items():
+                    try:
+                        self.settings[key] = self._coerce(key, value)
+                    except (TypeError, ValueError) as e:
+                        # Nilai rusak (mis. file diedit manual): pakai default untuk key ini saja
+                        print(f"⚠️ Setting {key} diabaikan: {e}")
                 print(f"✅ Settings loaded")
             else:
                 self.settings = self.DEFAULT.copy()
@@ -33,53 +61,161 @@ class SettingsManager:
                 print(f"📝 Default settings created")
         except:
             self.settings = self.DEFAULT.copy()
-    
+
     def _save(self):
         """Save settings"""
         try:
-            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-            with open(self.filepath, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            with self.lock:
+                data = dict(self.settings)
+                self.dirty = False
+            write_json(self.filepath, data)
         except Exception as e:
             print(f"❌ Save error: {e}")
-    
+
+    def _coerce(self, key, value):
+        """Samakan tipe dengan DEFAULT (nilai dari JSON / widget). ValueError jika tidak valid"""
+        default = self.DEFAULT.get(key)
+        if value is None:
+            return None if key in self.NULLABLE else default
+        if isinstance(default, bool):
+            return self._to_bool(value)
+        if isinstance(default, int) or key in self.NULLABLE:
+            return int(value)
+        if isinstance(default, float):
+            return float(value)
+        return value
+
+    @staticmethod
+    def _to_bool(value):
+        # bool("false") == True: string di-parse eksplisit
+        if isinstance(value, str):
+            text = value.strip().lower()
+            if text in ("1", "true", "yes", "on"):
+                return True
+            if text in ("0", "false", "no", "off"):
+                return False
+            raise ValueError(f"bukan nilai boolean: {value!r}")
+        if isinstance(value, (bool, int, float)):
+            return bool(value)
+        raise ValueError(f"bukan nilai boolean: {value!r}")
+
+    # Store generik
+    def get(self, key, default=None):
+        return self.settings.get(key, self.DEFAULT.get(key, default))
+
+    def set(self, key, value):
+        """Set satu nilai. Return True jika berubah"""
+        return bool(self.update(**{key: value}))
+
+    def update(self, **values):
+        """
+        Set beberapa nilai sekaligus (satu flush).
+        Subscriber dipanggil untuk setiap key yang berubah. Return dict perubahan
+        """
+        with self.lock:
+            changed = {}
+            for key, value in values.items():
+                value = self._coerce(key, value)
+                if self.settings.get(key) != value or key not in self.settings:
+                    self.settings[key] = value
+                    changed[key] = value
+
+            if changed:
+                self._schedule_flush()
+
+        for key, value in changed.items():
+            self._notify(key, value)
+        return changed
+
+    def subscribe(self, callback, keys=None):
+        """
+        callback(key, value) dipanggil (di thread pemanggil setter) setiap ada perubahan.
+        keys: iterable key yang diikuti (None = semua). Return fungsi unsubscribe
+        """
+        entry = (callback, frozenset(keys) if keys is not None else None)
+        with self.lock:
+            self.subscribers = self.subscribers + [entry]
+
+        def unsubscribe():
+            with self.lock:
+                self.subscribers = [s for s in self.subscribers if s is not entry]
+
+        return unsubscribe
+
+    def _notify(self, key, value):
+        for callback, keys in self.subscribers:
+            if keys is None or key in keys:
+                try:
+                    callback(key, value)
+                except Exception as e:
+                    print(f"❌ Settings subscriber error ({key}): {e}")
+
+    def _schedule_flush(self):
+        """Tulis file setelah flush_delay; perubahan berikutnya ikut batch yang sama"""
+        self.dirty = True
+        if self.flush_delay <= 0:
+            self._save()
+            return
+        if self.timer is None:
+            self.timer = threading.Timer(self.flush_delay, self._flush_timer)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _flush_timer(self):
+        with self.lock:
+            self.timer = None
+        self._save()
+
+    def flush(self):
+        """Tulis perubahan yang tertunda sekarang juga"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            dirty = self.dirty
+        if dirty:
+            self._save()
+
+    def close(self):
+        self.flush()
+
     # Getters
     def get_camera_index(self):
-        return self.settings.get("camera_index", 0)
-    
+        return self.get("camera_index")
+
     def get_camera_flip_horizontal(self):
-        return self.settings.get("flip_horizontal", False)
-    
+        return self.get("flip_horizontal")
+
     def get_camera_flip_vertical(self):
-        return self.settings.get("flip_vertical", False)
-    
+        return self.get("flip_vertical")
+
     def get_fullscreen(self):
-        return self.settings.get("fullscreen", False)
-    
+        return self.get("fullscreen")
+
     def get_show_fps(self):
-        return self.settings.get("show_fps", False)
-    
+        return self.get("show_fps")
+
+    def get_recognition_settings(self):
+        """Tuning deteksi/rekognisi: dict key -> nilai"""
+        return {key: self.get(key) for key in (
+            "face_scale_factor", "face_min_neighbors", "confidence_threshold", "detection_width"
+        )}
+
     # Setters
     def set_camera_index(self, val):
-        self.settings["camera_index"] = val
-        self._save()
-    
+        self.set("camera_index", val)
+
     def set_camera_flip_horizontal(self, val):
-        self.settings["flip_horizontal"] = val
-        self._save()
-    
+        self.set("flip_horizontal", val)
+
     def set_camera_flip_vertical(self, val):
-        self.settings["flip_vertical"] = val
-        self._save()
-    
+        self.set("flip_vertical", val)
+
     def set_fullscreen(self, val):
-        self.settings["fullscreen"] = val
-        self._save()
-    
+        self.set("fullscreen", val)
+
     def set_show_fps(self, val):
-        self.settings["show_fps"] = val
-        self._save()
-    
+        self.set("show_fps", val)
+
     def reset_to_default(self):
-        self.settings = self.DEFAULT.copy()
-        self._save()
\ No newline at end of file
+        self.update(**self.DEFAULT)
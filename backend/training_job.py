@@ -0,0 +1,82 @@
+"""
+Training Job - Jalankan train/sync/enroll FaceRecognition di background thread
+
+Model lama tetap dipakai untuk rekognisi selama job berjalan; FaceRecognition
+baru mengganti model-nya (atomic) setelah semua histogram selesai dihitung.
+UI cukup polling status/progress dan bisa membatalkan job kapan saja.
+"""
+import threading
+
+
+class TrainingCancelled(Exception):
+    """Dilempar dari callback progress saat job dibatalkan"""
+
+
+class TrainingJob:
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, target, *args, name="training"):
+        """target(*args, progress=callback) -> bool (True = berhasil)"""
+        self.target = target
+        self.args = args
+        self.name = name
+
+        self.status = self.PENDING
+        self.done = 0
+        self.total = 0
+        self.result = None
+
+        self.thread = None
+        self._cancel_event = threading.Event()
+        self._finished_event = threading.Event()
+
+    @property
+    def progress(self):
+        """Fraksi 0.0 - 1.0"""
+        return self.done / self.total if self.total else 0.0
+
+    @property
+    def is_finished(self):
+        return self._finished_event.is_set()
+
+    def start(self):
+        """Start job thread"""
+        if self.thread is not None:
+            return self
+
+        self.status = self.RUNNING
+        self.thread = threading.Thread(target=self._run, name=f"{self.name}-job", daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Minta job berhenti di chunk berikutnya (model lama tidak diubah)"""
+        self._cancel_event.set()
+
+    def wait(self, timeout=None):
+        return self._finished_event.wait(timeout)
+
+    def _progress(self, done, total):
+        if self._cancel_event.is_set():
+            raise TrainingCancelled()
+        self.done = done
+        self.total = total
+
+    def _run(self):
+        try:
+            self.result = self.target(*self.args, progress=self._progress)
+            if self._cancel_event.is_set():
+                self.status = self.CANCELLED
+            else:
+                self.status = self.DONE if self.result else self.FAILED
+
+        except Exception as e:
+            print(f"❌ Error in {self.name} job: {e}")
+            self.status = self.FAILED
+
+        finally:
+            self._finished_event.set()
@@ -0,0 +1,108 @@
+"""
+Training Manifest - Catatan file wajah yang sudah masuk ke model
+
+Disimpan di samping model (config.MODEL_DIR). Berisi parameter LBPH dan,
+per user, daftar file .jpg beserta ukuran + mtime. Saat startup dibandingkan
+dengan isi data/faces supaya hanya user yang berubah yang di-train ulang.
+"""
+import json
+import os
+import config
+from .persistence import write_json
+
+
+class TrainingManifest:
+    VERSION = 1
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(config.MODEL_DIR, config.MODEL_MANIFEST_NAME)
+        self.params = None
+        self.users = {}
+        self.loaded = False
+
+    def load(self):
+        """Load manifest dari file"""
+        try:
+            if not os.path.exists(self.path):
+                return False
+
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get("version") != self.VERSION:
+                print("⚠️ Manifest version mismatch, ignoring")
+                return False
+
+            self.params = data.get("params")
+            self.users = data.get("users", {})
+            self.loaded = True
+            return True
+
+        except Exception as e:
+            print(f"❌ Error loading manifest: {e}")
+            return False
+
+    def save(self):
+        """Save manifest ke file"""
+        try:
+            data = {
+                "version": self.VERSION,
+                "params": self.params,
+                "users": self.users
+            }
+            write_json(self.path, data)
+            self.loaded = True
+            return True
+
+        except Exception as e:
+            print(f"❌ Error saving manifest: {e}")
+            return False
+
+    def reset(self, params):
+        """Kosongkan manifest (dipakai sebelum full train)"""
+        self.params = dict(params)
+        self.users = {}
+
+    def matches_params(self, params):
+        return self.loaded and self.params == dict(params)
+
+    @staticmethod
+    def scan_user(user):
+        """Snapshot file wajah satu user: {filename: [size, mtime_ns]}"""
+        files = {}
+        face_dir = user["face_dir"]
+
+        if os.path.isdir(face_dir):
+            with os.scandir(face_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.jpg') and entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = [stat.st_size, stat.st_mtime_ns]
+
+        return {"face_dir": face_dir, "files": files}
+
+    def set_user(self, user, snapshot=None):
+        """Catat snapshot user yang baru saja di-train"""
+        self.users[str(user["id"])] = snapshot or self.scan_user(user)
+
+    def remove_user(self, user_id):
+        self.users.pop(str(user_id), None)
+
+    def diff(self, users):
+        """
+        Bandingkan manifest dengan dataset sekarang.
+        Return (changed, removed_ids): changed = list of (user, snapshot)
+        """
+        changed = []
+        current_ids = set()
+
+        for user in users:
+            key = str(user["id"])
+            current_ids.add(key)
+
+            snapshot = self.scan_user(user)
+            if self.users.get(key) != snapshot:
+                changed.append((user, snapshot))
+
+        removed = [int(key) for key in self.users if key not in current_ids]
+        return changed, removed
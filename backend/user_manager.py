@@ -1,54 +1,35 @@
 """
 User Manager - Mengelola data pengguna
 """
-import json
 import os
+import shutil
+import threading
 from datetime import datetime
 import config
+from .user_store import create_user_store
 
 
 class UserManager:
-    def __init__(self):
-        self.users = []
+    def __init__(self, attendance_log=None, backend=None):
+        self.delete_callbacks = []
+        self.attendance_log = attendance_log
+        self.lock = threading.RLock()  # alokasi ID + insert (dan cek nama di pemanggil) atomik
         self._ensure_directories()
-        self._load()
+        self.store = create_user_store(backend)
     
     def _ensure_directories(self):
         """Buat folder yang diperlukan"""
         os.makedirs(config.DATA_DIR, exist_ok=True)
         os.makedirs(config.FACES_DIR, exist_ok=True)
     
-    def _load(self):
-        """Load data users"""
-        try:
-            if os.path.exists(config.USERS_FILE):
-                with open(config.USERS_FILE, 'r', encoding='utf-8') as f:
-                    self.users = json.load(f)
-                print(f"✅ Loaded {len(self.users)} users")
-            else:
-                self.users = []
-                self._save()
-        except Exception as e:
-            print(f"❌ Error loading users: {e}")
-            self.users = []
-    
-    def _save(self):
-        """Save data users"""
-        try:
-            with open(config.USERS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.users, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"❌ Error saving users: {e}")
-            return False
-    
     def add_user(self, nama_ortu, nama_anak, kelas):
-        """Tambah user baru"""
-        user_id = len(self.users) + 1
-        
-        # Buat folder untuk wajah user
+        """Tambah user baru. Return user, atau None jika gagal disimpan"""
+        with self.lock:
+            return self._add_user(nama_ortu, nama_anak, kelas)
+    
+    def _add_user(self, nama_ortu, nama_anak, kelas):
+        user_id = self.store.next_id()
         user_face_dir = os.path.join(config.FACES_DIR, f"user_{user_id}")
-        os.makedirs(user_face_dir, exist_ok=True)
         
         user = {
             "id": user_id,
@@ -61,65 +42,71 @@ class UserManager:
             "last_seen": None
         }
         
-        self.users.append(user)
-        self._save()
+        # Folder wajah baru dibuat setelah user tersimpan (jangan pakai folder user lain)
+        if not self.store.insert(user):
+            print(f"❌ User not added: {nama_anak} (ID: {user_id})")
+            return None
+        os.makedirs(user_face_dir, exist_ok=True)
         
         print(f"✅ User added: {nama_anak} (ID: {user_id})")
         return user
     
     def get_user(self, user_id):
         """Get user by ID"""
-        for user in self.users:
-            if user["id"] == user_id:
-                return user
-        return None
+        return self.store.get(user_id)
     
     def get_user_by_name(self, nama_anak):
         """Get user by nama anak"""
-        for user in self.users:
-            if user["nama_anak"].lower() == nama_anak.lower():
-                return user
-        return None
+        return self.store.get_by_name(nama_anak)
     
     def get_all_users(self):
         """Get semua users"""
-        return self.users.copy()
+        return self.store.all()
     
     def update_face_count(self, user_id, count):
         """Update jumlah foto wajah"""
-        for user in self.users:
-            if user["id"] == user_id:
-                user["face_count"] = count
-                self._save()
-                return True
-        return False
+        return self.store.update(user_id, face_count=count)
     
-    def update_last_seen(self, user_id):
-        """Update waktu terakhir terlihat"""
-        for user in self.users:
-            if user["id"] == user_id:
-                user["last_seen"] = datetime.now().isoformat()
-                self._save()
-                return True
-        return False
+    def update_last_seen(self, user_id, confidence=None, camera=None, ts=None):
+        """Update waktu terakhir terlihat (ts: epoch sighting, default sekarang)"""
+        # Dengan attendance log: tidak menulis ke penyimpanan user
+        if self.attendance_log is not None:
+            self.attendance_log.record(user_id, confidence, camera, ts=ts)
+            return self.get_user(user_id) is not None
+        
+        seen = datetime.fromtimestamp(ts) if ts is not None else datetime.now()
+        return self.store.update(user_id, last_seen=seen.isoformat())
+    
+    def get_last_seen(self, user_id):
+        """Waktu terakhir terlihat (dari attendance log jika ada)"""
+        if self.attendance_log is not None:
+            return self.attendance_log.get_last_seen(user_id)
+        
+        user = self.get_user(user_id)
+        return user.get("last_seen") if user else None
     
     def delete_user(self, user_id):
         """Hapus user"""
-        import shutil
+        user = self.store.get(user_id)
+        if user is None:
+            return False
         
-        for i, user in enumerate(self.users):
-            if user["id"] == user_id:
-                # Hapus folder wajah
-                if os.path.exists(user["face_dir"]):
-                    shutil.rmtree(user["face_dir"])
-                
-                # Hapus dari list
-                self.users.pop(i)
-                self._save()
-                print(f"✅ User deleted: ID {user_id}")
-                return True
-        return False
+        # Hapus folder wajah
+        if os.path.exists(user["face_dir"]):
+            shutil.rmtree(user["face_dir"])
+        
+        self.store.delete(user_id)
+        print(f"✅ User deleted: ID {user_id}")
+        
+        # Beri tahu listener (mis. hapus histogram dari model)
+        for callback in self.delete_callbacks:
+            callback(user_id)
+        return True
+    
+    def add_delete_callback(self, callback):
+        """Daftarkan callback(user_id) yang dipanggil setelah user dihapus"""
+        self.delete_callbacks.append(callback)
     
     def get_user_count(self):
         """Get jumlah user"""
-        return len(self.users)
\ No newline at end of file
+        return self.store.count()
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""
+User Store - Backend penyimpanan data user (JSON atau SQLite)
+
+Kedua backend punya method yang sama sehingga UserManager tidak perlu tahu
+data disimpan di mana. SQLite: lookup lewat index (id, nama_anak lowercase)
+dan setiap perubahan hanya menyentuh satu baris dalam satu transaksi.
+"""
+import json
+import os
+import sqlite3
+import threading
+import config
+from .persistence import write_json
+
+
+USER_FIELDS = (
+    "id", "nama_ortu", "nama_anak", "kelas", "face_dir",
+    "face_count", "registered_at", "last_seen"
+)
+
+
+class JsonUserStore:
+    """Semua user di satu file JSON (format lama users.json)"""
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath or config.USERS_FILE
+        self.users = []
+        self.by_id = {}
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.filepath):
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    self.users = json.load(f)
+                print(f"✅ Loaded {len(self.users)} users")
+            else:
+                self.users = []
+                self._save()
+        except Exception as e:
+            print(f"❌ Error loading users: {e}")
+            self.users = []
+
+        self.by_id = {user["id"]: user for user in self.users}
+
+    def _save(self):
+        try:
+            write_json(self.filepath, self.users)
+            return True
+        except Exception as e:
+            print(f"❌ Error saving users: {e}")
+            return False
+
+    def next_id(self):
+        return max(self.by_id, default=0) + 1
+
+    def insert(self, user):
+        if user["id"] in self.by_id:
+            print(f"❌ Error saving user: ID {user['id']} sudah ada")
+            return False
+
+        self.users.append(user)
+        self.by_id[user["id"]] = user
+        if self._save():
+            return True
+
+        # Gagal ditulis: jangan tinggalkan user yang tidak tersimpan di memory
+        self.users.remove(user)
+        del self.by_id[user["id"]]
+        return False
+
+    def get(self, user_id):
+        return self.by_id.get(user_id)
+
+    def get_by_name(self, nama_anak):
+        key = nama_anak.lower()
+        for user in self.users:
+            if user["nama_anak"].lower() == key:
+                return user
+        return None
+
+    def all(self):
+        return self.users.copy()
+
+    def update(self, user_id, **fields):
+        user = self.by_id.get(user_id)
+        if user is None:
+            return False
+        user.update(fields)
+        return self._save()
+
+    def delete(self, user_id):
+        user = self.by_id.pop(user_id, None)
+        if user is None:
+            return False
+        self.users.remove(user)
+        return self._save()
+
+    def count(self):
+        return len(self.users)
+
+
+class SqliteUserStore:
+    """User di SQLite (stdlib), satu baris per user"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY,
+            nama_ortu TEXT NOT NULL,
+            nama_anak TEXT NOT NULL,
+            nama_anak_lower TEXT NOT NULL,
+            kelas TEXT,
+            face_dir TEXT,
+            face_count INTEGER NOT NULL DEFAULT 0,
+            registered_at TEXT,
+            last_seen TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_users_nama_anak_lower ON users (nama_anak_lower);
+    """
+
+    def __init__(self, db_path=None, json_path=None):
+        self.db_path = db_path or config.USERS_DB
+        self.json_path = json_path or config.USERS_FILE
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+        self._migrate_from_json()
+        print(f"✅ Loaded {self.count()} users (SQLite)")
+
+    def _migrate_from_json(self):
+        """Import users.json sekali saat database masih kosong"""
+        if self.count() > 0 or not os.path.exists(self.json_path):
+            return
+
+        try:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                users = json.load(f)
+
+            with self.lock, self.conn:
+                for user in users:
+                    self._insert(user)
+
+            print(f"✅ Migrated {len(users)} users from {self.json_path}")
+
+        except Exception as e:
+            print(f"❌ Error migrating users: {e}")
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        return {field: row[field] for field in USER_FIELDS}
+
+    def _insert(self, user):
+        row = {field: user.get(field) for field in USER_FIELDS}
+        row["face_count"] = row["face_count"] or 0
+        row["nama_anak_lower"] = user["nama_anak"].lower()
+        self.conn.execute(
+            "INSERT INTO users (id, nama_ortu, nama_anak, nama_anak_lower, kelas, face_dir, "
+            "face_count, registered_at, last_seen) VALUES (:id, :nama_ortu, :nama_anak, "
+            ":nama_anak_lower, :kelas, :face_dir, :face_count, :registered_at, :last_seen)",
+            row
+        )
+
+    def next_id(self):
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(id) FROM users").fetchone()
+        return (row[0] or 0) + 1
+
+    def insert(self, user):
+        try:
+            with self.lock, self.conn:
+                self._insert(user)
+            return True
+        except Exception as e:
+            print(f"❌ Error saving user: {e}")
+            return False
+
+    def get(self, user_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        return self._to_dict(row)
+
+    def get_by_name(self, nama_anak):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM users WHERE nama_anak_lower = ? LIMIT 1", (nama_anak.lower(),)
+            ).fetchone()
+        return self._to_dict(row)
+
+    def all(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM users ORDER BY id").fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def update(self, user_id, **fields):
+        unknown = set(fields) - set(USER_FIELDS[1:])
+        if unknown:
+            raise ValueError(f"Field tidak dikenal: {sorted(unknown)}")
+
+        if "nama_anak" in fields:
+            fields["nama_anak_lower"] = fields["nama_anak"].lower()
+
+        assignments = ", ".join(f"{name} = :{name}" for name in fields)
+        try:
+            with self.lock, self.conn:
+                cur = self.conn.execute(
+                    f"UPDATE users SET {assignments} WHERE id = :id", dict(fields, id=user_id)
+                )
+            return cur.rowcount > 0
+        except Exception as e:
+            print(f"❌ Error updating user: {e}")
+            return False
+
+    def delete(self, user_id):
+        try:
+            with self.lock, self.conn:
+                cur = self.conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            return cur.rowcount > 0
+        except Exception as e:
+            print(f"❌ Error deleting user: {e}")
+            return False
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def create_user_store(backend=None):
+    """Buat store sesuai config.USER_STORAGE_BACKEND ("json" / "sqlite")"""
+    backend = backend or config.USER_STORAGE_BACKEND
+
+    if backend == "sqlite":
+        return SqliteUserStore()
+    if backend == "json":
+        return JsonUserStore()
+    raise ValueError(f"Backend user tidak dikenal: {backend}")
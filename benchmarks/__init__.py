@@ -0,0 +1,3 @@
+"""
+Benchmarks Package
+"""
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Benchmark - Waktu deteksi per frame dan recall pada beberapa DETECTION_WIDTH
+
+Setiap foto wajah di data/faces ditempel ke frame sintetis 1920x1080
+(posisi & ukuran acak tapi deterministik), lalu detect_faces dijalankan
+untuk setiap lebar deteksi. Recall = frame dengan box yang overlap ground truth
+(IoU >= --iou) dibagi jumlah frame.
+
+    python -m benchmarks.detection_scale
+    python -m benchmarks.detection_scale --widths 0 960 640 480 --json
+"""
+import argparse
+import glob
+import json
+import os
+import time
+import cv2
+import numpy as np
+import config
+from backend.face_recognition import FaceRecognition
+from backend.face_tracker import iou
+
+
+def load_samples(faces_dir):
+    """Semua foto wajah (RGB) dari data/faces/*/*.jpg"""
+    samples = []
+    for path in sorted(glob.glob(os.path.join(faces_dir, "*", "*.jpg"))):
+        img = cv2.imread(path)
+        if img is not None:
+            samples.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    return samples
+
+
+def make_frames(samples, width, height, seed=0):
+    """Tempel setiap sample ke background noise -> list of (frame, ground_truth_box)"""
+    rng = np.random.default_rng(seed)
+    frames = []
+
+    for face in samples:
+        frame = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+
+        size = int(rng.integers(height // 5, height // 2))
+        x = int(rng.integers(0, width - size))
+        y = int(rng.integers(0, height - size))
+        frame[y:y + size, x:x + size] = cv2.resize(face, (size, size))
+
+        frames.append((frame, (x, y, size, size)))
+
+    return frames
+
+
+def run(widths, frames, face_recognition, iou_threshold, repeat):
+    results = []
+
+    for width in widths:
+        timings = []
+        hits = 0
+
+        for frame, truth in frames:
+            for i in range(repeat):
+                t0 = time.perf_counter()
+                faces = face_recognition.detect_faces(frame, detection_width=width or 0)
+                timings.append((time.perf_counter() - t0) * 1000)
+
+            if any(iou(tuple(face), truth) >= iou_threshold for face in faces):
+                hits += 1
+
+        timings = np.array(timings)
+        results.append({
+            "detection_width": width or frames[0][0].shape[1],
+            "frames": len(frames),
+            "ms_mean": round(float(timings.mean()), 2),
+            "ms_p50": round(float(np.percentile(timings, 50)), 2),
+            "ms_p95": round(float(np.percentile(timings, 95)), 2),
+            "recall": round(hits / len(frames), 3) if frames else 0.0
+        })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detection scale benchmark")
+    parser.add_argument("--widths", type=int, nargs="+", default=[0, 1280, 960, 640, 480],
+                        help="lebar deteksi (0 = resolusi penuh)")
+    parser.add_argument("--faces-dir", default=config.FACES_DIR)
+    parser.add_argument("--frame-width", type=int, default=config.CAMERA_WIDTH)
+    parser.add_argument("--frame-height", type=int, default=config.CAMERA_HEIGHT)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--iou", type=float, default=0.3)
+    parser.add_argument("--json", action="store_true", help="output JSON")
+    args = parser.parse_args()
+
+    samples = load_samples(args.faces_dir)
+    if not samples:
+        print(f"❌ No face samples in {args.faces_dir}")
+        return
+
+    frames = make_frames(samples, args.frame_width, args.frame_height)
+    face_recognition = FaceRecognition()
+
+    results = run(args.widths, frames, face_recognition, args.iou, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n{'width':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7}")
+    for r in results:
+        print(f"{r['detection_width']:>6} {r['ms_mean']:>9.2f} {r['ms_p50']:>8.2f} "
+              f"{r['ms_p95']:>8.2f} {r['recall']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
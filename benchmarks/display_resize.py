@@ -0,0 +1,140 @@
+"""
+Benchmark - ms/frame jalur display CameraFrame (sebelum vs sesudah)
+
+"before" = pipeline lama update_frame: PIL fromarray + resize LANCZOS +
+background RGBA baru + paste frame & icon (+ PhotoImage baru jika ada display).
+"after"  = FrameCompositor: cv2.resize INTER_AREA ke buffer persisten + blend
+icon yang sudah di-premultiply (+ PhotoImage.paste jika ada display).
+
+Tanpa $DISPLAY hanya bagian compositing yang diukur (Tk dilewati).
+
+    python -m benchmarks.display_resize
+    python -m benchmarks.display_resize --display 480x320 --json
+"""
+import argparse
+import json
+import time
+import numpy as np
+from PIL import Image, ImageEnhance, ImageTk
+import config
+from frontend.components.camera_frame import FrameCompositor
+
+
+def make_icon(size):
+    """Icon RGBA semi-transparan seukuran icon settings"""
+    rng = np.random.default_rng(1)
+    rgba = rng.integers(0, 256, size=(size, size, 4), dtype=np.uint8)
+    icon = Image.fromarray(rgba, "RGBA")
+    return icon, ImageEnhance.Brightness(icon).enhance(1.5)
+
+
+def render_before(frame, display_w, display_h, icon, icon_pos):
+    """Salinan pipeline lama CameraFrame.update_frame (tanpa Tk)"""
+    pil_image = Image.fromarray(frame)
+    img_w, img_h = pil_image.size
+
+    scale = min(display_w / img_w, display_h / img_h)
+    new_w = int(img_w * scale)
+    new_h = int(img_h * scale)
+
+    resized = pil_image.resize((new_w, new_h), Image.Resampling.LANCZOS)
+
+    background = Image.new('RGBA', (display_w, display_h), (0, 0, 0, 255))
+    offset_x = (display_w - new_w) // 2
+    offset_y = (display_h - new_h) // 2
+    background.paste(resized, (offset_x, offset_y))
+    background.paste(icon, icon_pos, icon)
+    return background
+
+
+def summarize(timings):
+    timings = np.array(timings)
+    return {
+        "ms_mean": round(float(timings.mean()), 3),
+        "ms_p50": round(float(np.percentile(timings, 50)), 3),
+        "ms_p95": round(float(np.percentile(timings, 95)), 3)
+    }
+
+
+def run(frames, display_w, display_h, repeat, root=None):
+    icon_normal, icon_hover = make_icon(40)
+    icon_pos = (15, 15)
+    compositor = FrameCompositor()
+    photo = None
+
+    before, after = [], []
+    for i in range(repeat):
+        frame = frames[i % len(frames)]
+        # Hover berganti sesekali, seperti mouse yang melintas
+        icon = icon_hover if (i // 30) % 2 else icon_normal
+
+        t0 = time.perf_counter()
+        image = render_before(frame, display_w, display_h, icon, icon_pos)
+        if root is not None:
+            ImageTk.PhotoImage(image)
+        before.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        canvas = compositor.render(frame, display_w, display_h, icon, icon_pos)
+        if root is not None:
+            image = Image.fromarray(canvas)
+            if photo is None:
+                photo = ImageTk.PhotoImage(image)
+            else:
+                photo.paste(image)
+        after.append((time.perf_counter() - t0) * 1000)
+
+    return {
+        "frame": f"{frames[0].shape[1]}x{frames[0].shape[0]}",
+        "display": f"{display_w}x{display_h}",
+        "frames": repeat,
+        "includes_tk": root is not None,
+        "before": summarize(before),
+        "after": summarize(after)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Display path benchmark")
+    parser.add_argument("--display", default="480x320", help="ukuran area display WxH")
+    parser.add_argument("--frame-width", type=int, default=config.CAMERA_WIDTH)
+    parser.add_argument("--frame-height", type=int, default=config.CAMERA_HEIGHT)
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--json", action="store_true", help="output JSON")
+    args = parser.parse_args()
+
+    display_w, display_h = (int(v) for v in args.display.lower().split("x"))
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, size=(args.frame_height, args.frame_width, 3), dtype=np.uint8)
+              for _ in range(4)]
+
+    # PhotoImage butuh Tk root; tanpa display hanya compositing yang diukur
+    root = None
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception:
+        root = None
+
+    try:
+        result = run(frames, display_w, display_h, args.repeat, root)
+    finally:
+        if root is not None:
+            root.destroy()
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"\nframe {result['frame']} -> display {result['display']}, "
+          f"{result['frames']} frames, Tk: {'yes' if result['includes_tk'] else 'no'}")
+    print(f"{'':>8} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for name in ("before", "after"):
+        r = result[name]
+        print(f"{name:>8} {r['ms_mean']:>9.3f} {r['ms_p50']:>8.3f} {r['ms_p95']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
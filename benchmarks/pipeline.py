@@ -0,0 +1,280 @@
+"""
+Benchmark - Pipeline deteksi -> rekognisi -> display tanpa kamera / layar
+
+Frame diambil dari folder gambar (--frames), file video (--video), atau
+dibuat sintetis dari foto di data/faces. Setiap frame dibungkus Frame (seperti
+CameraHandler) lalu melewati tahap yang sama dengan MainUI:
+
+    detect     FaceRecognition.detect_faces
+    extract    FaceRecognition.extract_face (semua wajah)
+    recognize  FaceRecognition.recognize_faces
+    draw       FaceRecognition.draw_faces
+    display    FrameCompositor.render (jalur resize CameraFrame.update_frame)
+
+User ter-enroll dibuat sintetis dari data/faces (augmentasi flip / geser /
+brightness), jadi model di data/model tidak disentuh. Output per kombinasi
+resolusi x jumlah user: p50/p95/p99 ms per tahap, frames/sec, peak RSS.
+Setiap kombinasi dijalankan di process sendiri (spawn), jadi peak RSS adalah
+puncak konfigurasi itu saja, bukan puncak semua baris sebelumnya.
+
+    python -m benchmarks.pipeline
+    python -m benchmarks.pipeline --video gate.mp4 --resolutions 1920x1080 1280x720 \\
+        --users 10 100 500 --output results.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+import cv2
+import numpy as np
+import config
+from backend import lbph
+from backend.face_recognition import FaceRecognition
+from backend.frame import Frame
+from backend.frame_sources import open_source, FAST
+from frontend.components.camera_frame import FrameCompositor
+from .detection_scale import load_samples, make_frames
+
+STAGES = ("detect", "extract", "recognize", "draw", "display")
+
+
+def peak_rss_mb():
+    """Peak resident set size proses ini sejak start (MB), None jika tidak didukung OS"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def load_source_frames(spec, limit):
+    """Frame BGR dari folder gambar / file video (FrameSource, tanpa pacing & loop)"""
+    source = open_source(spec, pacing=FAST, loop=False)
+    frames = []
+    if not source.open():
+        return frames
+    try:
+        while len(frames) < limit and source.grab():
+            ok, frame = source.retrieve()
+            if ok:
+                frames.append(frame)
+    finally:
+        source.release()
+    return frames
+
+
+def synthetic_frames(samples, limit):
+    """Foto wajah ditempel ke background noise (BGR, resolusi kamera)"""
+    frames = make_frames(samples, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    return [cv2.cvtColor(frame, cv2.COLOR_RGB2BGR) for frame, _ in frames[:limit]]
+
+
+def load_frames(source, samples, limit):
+    """Frame dari folder gambar / file video, atau sintetis jika source None"""
+    if source:
+        return load_source_frames(source, limit)
+    return synthetic_frames(samples, limit)
+
+
+def resize_frames(frames, width, height):
+    return [frame if frame.shape[1::-1] == (width, height)
+            else cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            for frame in frames]
+
+
+def augment(face, rng):
+    """Variasi satu foto wajah 200x200 (flip, geser, brightness)"""
+    if rng.random() < 0.5:
+        face = cv2.flip(face, 1)
+    dx, dy = (int(v) for v in rng.integers(-8, 9, size=2))
+    matrix = np.float32([[1, 0, dx], [0, 1, dy]])
+    face = cv2.warpAffine(face, matrix, (200, 200), borderMode=cv2.BORDER_REFLECT)
+    gain = float(rng.uniform(0.8, 1.2))
+    return cv2.convertScaleAbs(face, alpha=gain, beta=float(rng.integers(-15, 16)))
+
+
+def enroll_synthetic(face_recognition, samples, user_count, faces_per_user, seed=0):
+    """Isi matcher dengan user sintetis (tanpa menulis model ke disk)"""
+    rng = np.random.default_rng(seed)
+    gray = [cv2.resize(cv2.cvtColor(s, cv2.COLOR_RGB2GRAY), (200, 200)) for s in samples]
+
+    histograms = []
+    labels = []
+    label_to_user = {}
+    for user_id in range(1, user_count + 1):
+        for _ in range(faces_per_user):
+            face = augment(gray[int(rng.integers(len(gray)))], rng)
+            histograms.append(lbph.compute_histogram(face, face_recognition.params))
+            labels.append(user_id)
+        label_to_user[user_id] = {"id": user_id, "nama_anak": f"Siswa {user_id}"}
+
+    face_recognition.label_to_user = label_to_user
+    face_recognition.matcher.set_model(np.vstack(histograms), np.array(labels, dtype=np.int32))
+    face_recognition.is_trained = True
+
+
+def summarize(timings):
+    timings = np.asarray(timings, dtype=np.float64)
+    if timings.size == 0:
+        return {"ms_p50": None, "ms_p95": None, "ms_p99": None, "ms_mean": None}
+    return {
+        "ms_p50": round(float(np.percentile(timings, 50)), 3),
+        "ms_p95": round(float(np.percentile(timings, 95)), 3),
+        "ms_p99": round(float(np.percentile(timings, 99)), 3),
+        "ms_mean": round(float(timings.mean()), 3)
+    }
+
+
+def run_pipeline(face_recognition, frames, repeat, display_size):
+    """Satu pass semua frame x repeat. Return (timings per tahap, total detik, jumlah wajah)"""
+    compositor = FrameCompositor()
+    display_w, display_h = display_size
+    timings = {stage: [] for stage in STAGES}
+    face_count = 0
+
+    started = time.perf_counter()
+    for i in range(repeat):
+        for seq, bgr in enumerate(frames):
+            # Frame baru setiap iterasi: cache konversi warna tidak terbawa
+            frame = Frame(bgr, seq=seq)
+
+            t0 = time.perf_counter()
+            faces = face_recognition.detect_faces(frame)
+            t1 = time.perf_counter()
+            for rect in faces:
+                face_recognition.extract_face(frame, rect)
+            t2 = time.perf_counter()
+            recognized = face_recognition.recognize_faces(frame, faces)
+            t3 = time.perf_counter()
+            drawn = face_recognition.draw_faces(frame.rgb, faces, recognized) if len(faces) else frame.rgb
+            t4 = time.perf_counter()
+            compositor.render(drawn, display_w, display_h)
+            t5 = time.perf_counter()
+
+            timings["detect"].append((t1 - t0) * 1000)
+            timings["extract"].append((t2 - t1) * 1000)
+            timings["recognize"].append((t3 - t2) * 1000)
+            timings["draw"].append((t4 - t3) * 1000)
+            timings["display"].append((t5 - t4) * 1000)
+            face_count += len(faces)
+
+    return timings, time.perf_counter() - started, face_count
+
+
+def measure(source, faces_dir, max_frames, resolution, user_count, faces_per_user, repeat, display_size):
+    """Satu kombinasi resolusi x jumlah user (dijalankan di process sendiri oleh run)"""
+    samples = load_samples(faces_dir)
+    width, height = resolution
+    frames = resize_frames(load_frames(source, samples, max_frames), width, height)
+
+    face_recognition = FaceRecognition()
+    enroll_synthetic(face_recognition, samples, user_count, faces_per_user)
+
+    # Warm-up (alokasi buffer compositor, cache OpenCV)
+    run_pipeline(face_recognition, frames[:2], 1, display_size)
+    timings, elapsed, face_count = run_pipeline(face_recognition, frames, repeat, display_size)
+
+    processed = len(frames) * repeat
+    return {
+        "resolution": f"{width}x{height}",
+        "users": user_count,
+        "samples": user_count * faces_per_user,
+        "frames": processed,
+        "faces": face_count,
+        "fps": round(processed / elapsed, 2) if elapsed > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": {stage: summarize(timings[stage]) for stage in STAGES}
+    }
+
+
+def run(source, faces_dir, max_frames, resolutions, user_counts, faces_per_user, repeat, display_size):
+    """Semua kombinasi, masing-masing di process baru (peak RSS per konfigurasi)"""
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    for user_count in user_counts:
+        for resolution in resolutions:
+            with context.Pool(1) as pool:
+                results.append(pool.apply(measure, (source, faces_dir, max_frames, resolution, user_count,
+                                                    faces_per_user, repeat, display_size)))
+
+    return results
+
+
+def parse_size(text):
+    width, height = (int(v) for v in text.lower().split("x"))
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detection -> recognition -> display pipeline benchmark")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--frames", help="folder frame .jpg/.png")
+    source.add_argument("--video", help="file video")
+    parser.add_argument("--faces-dir", default=config.FACES_DIR,
+                        help="foto wajah untuk user sintetis (dan frame sintetis)")
+    parser.add_argument("--max-frames", type=int, default=100)
+    parser.add_argument("--resolutions", type=parse_size, nargs="+",
+                        default=[(config.CAMERA_WIDTH, config.CAMERA_HEIGHT), (1280, 720), (640, 480)],
+                        help="resolusi frame WxH")
+    parser.add_argument("--users", type=int, nargs="+", default=[10, 100],
+                        help="jumlah user ter-enroll")
+    parser.add_argument("--faces-per-user", type=int, default=10)
+    parser.add_argument("--display", type=parse_size, default=(config.SCREEN_WIDTH, config.SCREEN_HEIGHT),
+                        help="ukuran area display WxH")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="tulis hasil JSON ke file")
+    parser.add_argument("--json", action="store_true", help="output JSON ke stdout")
+    args = parser.parse_args()
+
+    samples = load_samples(args.faces_dir)
+    if not samples:
+        print(f"❌ No face samples in {args.faces_dir}")
+        return
+
+    source = args.frames or args.video
+    frame_count = len(load_frames(source, samples, args.max_frames))
+    if not frame_count:
+        print("❌ No frames to replay")
+        return
+
+    results = run(source, args.faces_dir, args.max_frames, args.resolutions, args.users,
+                  args.faces_per_user, args.repeat, args.display)
+
+    report = {
+        "app_version": config.APP_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "cpu_count": os.cpu_count(),
+        "source": args.frames or args.video or "synthetic",
+        "display": f"{args.display[0]}x{args.display[1]}",
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n{frame_count} frames from {report['source']}, display {report['display']}")
+    print(f"{'resolution':>10} {'users':>6} {'fps':>7} {'rss MB':>7}  "
+          + " ".join(f"{stage + ' p95':>13}" for stage in STAGES))
+    for r in results:
+        stages = " ".join(f"{r['stages'][stage]['ms_p95'] or 0:>13.2f}" for stage in STAGES)
+        print(f"{r['resolution']:>10} {r['users']:>6} {r['fps'] or 0:>7.1f} "
+              f"{r['peak_rss_mb'] or 0:>7.1f}  {stages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark - Throughput RecognitionPool (wajah/detik) per jumlah process
+
+Model sintetis (--users x --samples histogram acak) disimpan ke ModelStore di
+folder sementara, lalu batch crop wajah 200x200 (--faces per frame)
+diprediksi dengan 1 process (di process ini, jalur tanpa pool) dan dengan
+RecognitionPool N process yang memory-map model yang sama. Output per N:
+wajah/detik, speedup terhadap 1 process dan efisiensi (speedup / N).
+
+    python -m benchmarks.recognition_pool
+    python -m benchmarks.recognition_pool --processes 1 2 4 --users 600 --samples 10 --json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import numpy as np
+from backend import lbph
+from backend.matcher import LBPHMatcher
+from backend.model_store import ModelStore
+from backend.recognition_pool import RecognitionPool
+
+
+def build_model(model_dir, users, samples, params, seed=0):
+    """Histogram acak ter-normalisasi (float32) untuk users x samples, simpan ke ModelStore"""
+    rng = np.random.default_rng(seed)
+    size = lbph.histogram_size(params)
+    histograms = rng.random((users * samples, size), dtype=np.float32)
+    histograms /= histograms.sum(axis=1, keepdims=True)
+    labels = np.repeat(np.arange(1, users + 1, dtype=np.int32), samples)
+    return ModelStore(model_dir).save(histograms, labels, params)
+
+
+def make_batches(count, faces, seed=1):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, size=(faces, 200, 200), dtype=np.uint8) for _ in range(count)]
+
+
+def predict_local(matcher, params, faces):
+    """Jalur tanpa pool (sama dengan FaceRecognition.recognize_faces)"""
+    queries = np.vstack([lbph.compute_histogram(face, params) for face in faces])
+    return [candidates[0] for candidates in matcher.search_users(queries, k=1)]
+
+
+def run(processes, model_dir, generation, params, batches):
+    results = []
+    histograms, labels, _ = ModelStore(model_dir).load(mmap=True)
+    matcher = LBPHMatcher(histograms, labels)
+
+    for count in processes:
+        pool = None
+        if count > 1:
+            pool = RecognitionPool(processes=count, min_faces=1)
+            pool.start()
+            predict = lambda faces: pool.predict(model_dir, generation, params, faces)
+        else:
+            predict = lambda faces: predict_local(matcher, params, faces)
+
+        try:
+            # Warm-up: spawn worker + mmap model di setiap process
+            for _ in range(max(1, count)):
+                predict(batches[0])
+
+            t0 = time.perf_counter()
+            faces = 0
+            for batch in batches:
+                if predict(batch) is None:
+                    raise RuntimeError(f"model generasi {generation} tidak tersedia")
+                faces += len(batch)
+            elapsed = time.perf_counter() - t0
+        finally:
+            if pool is not None:
+                pool.stop()
+
+        results.append({"processes": count, "faces": faces,
+                        "faces_per_sec": round(faces / elapsed, 1)})
+
+    base = next((r["faces_per_sec"] for r in results if r["processes"] == 1), None)
+    for r in results:
+        r["speedup"] = round(r["faces_per_sec"] / base, 2) if base else None
+        r["efficiency"] = round(r["speedup"] / r["processes"], 2) if base else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recognition pool throughput benchmark")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=600)
+    parser.add_argument("--samples", type=int, default=10, help="foto per user")
+    parser.add_argument("--faces", type=int, default=8, help="wajah per frame (batch)")
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="output JSON")
+    args = parser.parse_args()
+
+    params = lbph.default_params()
+    batches = make_batches(args.batches, args.faces)
+
+    with tempfile.TemporaryDirectory(prefix="pool-bench-") as model_dir:
+        header = build_model(model_dir, args.users, args.samples, params)
+        results = run(args.processes, model_dir, header["generation"], params, batches)
+
+    report = {
+        "machine": {"platform": platform.platform(), "cpu_count": os.cpu_count()},
+        "model": {"users": args.users, "samples": args.users * args.samples},
+        "faces_per_batch": args.faces,
+        "results": results
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n{report['machine']['cpu_count']} CPU, {report['model']['samples']} samples, "
+          f"{args.faces} faces/batch")
+    print(f"{'procs':>6} {'faces/s':>9} {'speedup':>8} {'effic.':>7}")
+    for r in results:
+        print(f"{r['processes']:>6} {r['faces_per_sec']:>9.1f} {r['speedup'] or 0:>8.2f} "
+              f"{r['efficiency'] or 0:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,8 +16,17 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 FACES_DIR = os.path.join(DATA_DIR, "faces")
 MODEL_DIR = os.path.join(DATA_DIR, "model")
 USERS_FILE = os.path.join(DATA_DIR, "users.json")
-MODEL_FILE = os.path.join(MODEL_DIR, "face_model.yml")
+USERS_DB = os.path.join(DATA_DIR, "users.db")
+USER_STORAGE_BACKEND = "sqlite"  # "sqlite" atau "json" (users.json lama)
+ATTENDANCE_DB = os.path.join(DATA_DIR, "attendance.db")
 LABELS_FILE = os.path.join(MODEL_DIR, "labels.json")
+LEGACY_MODEL_FILE = os.path.join(MODEL_DIR, "face_model.yml")  # OpenCV YAML lama
+
+# Binary model (lihat backend/model_store.py)
+MODEL_HISTOGRAMS_NAME = "histograms.npy"
+MODEL_LABELS_VECTOR_NAME = "labels.npy"
+MODEL_HEADER_NAME = "model_header.json"
+MODEL_MANIFEST_NAME = "manifest.json"
 
 # Icon paths
 ICON_SETTINGS = os.path.join(ICONS_DIR, "settings_icon.png")
@@ -33,16 +42,84 @@ SCREEN_HEIGHT = 320
 CAMERA_WIDTH = 1920
 CAMERA_HEIGHT = 1080
 CAMERA_INDEX = 0
+CAMERA_FPS = 30
+CAMERA_MAX_FAILURES = 5  # grab gagal berturut-turut sebelum reconnect
+CAMERA_RECONNECT_BACKOFF = (0.5, 8.0)  # detik, awal & maksimum (dobel setiap gagal)
+FRAME_RING_SIZE = 4  # slot ring buffer frame (lihat backend/frame_ring.py)
+FRAME_WAIT_TIMEOUT = 0.2  # detik, batas tunggu frame baru
+CAMERA_PROBE_TIMEOUT = 2.0  # detik, batas probe paralel saat mencari kamera
+CAMERA_PROBE_MAX = 3  # index yang di-probe jika tidak ada sysfs (Windows / macOS)
+
+# Frame Source Settings (file video / folder gambar / synthetic, lihat backend/frame_sources.py)
+SOURCE_PACING = "realtime"  # "realtime" = tempo asli, "fast" = secepat mungkin (profiling)
+SOURCE_LOOP = True  # putar ulang saat habis; False = capture berhenti di akhir
+SYNTHETIC_FRAMES = 300  # panjang satu putaran sumber synthetic
+SYNTHETIC_MAX_FACES = 20  # foto dari data/faces yang ditempel ke frame synthetic
 
 # Face Recognition Settings
 FACE_MIN_SIZE = (100, 100)
 FACE_SCALE_FACTOR = 1.2
 FACE_MIN_NEIGHBORS = 5
+DETECTION_WIDTH = 640  # lebar frame untuk Haar detection (None = resolusi penuh)
 LBPH_RADIUS = 1
 LBPH_NEIGHBORS = 8
 LBPH_GRID_X = 8
 LBPH_GRID_Y = 8
 CONFIDENCE_THRESHOLD = 70
+MATCHER_BLOCK_BYTES = 32 * 1024 * 1024  # buffer maksimum per blok chi-square
+
+# Training Loader Settings (lihat backend/face_loader.py)
+FACE_CACHE_DIR = os.path.join(MODEL_DIR, "face_cache")  # .npy packed per user
+FACE_LOADER_THREADS = 0  # 0 = otomatis (jumlah core)
+FACE_LOADER_CHUNK_SIZE = 32  # foto per chunk yang dikirim ke training
+
+# Frame Scheduler Settings (lihat backend/frame_scheduler.py)
+DISPLAY_FPS = 30
+RECOGNITION_FPS = 10
+RECOGNITION_MIN_FPS = 2  # batas bawah saat display kewalahan
+DISPLAY_MIN_IDLE_MS = 5  # jeda minimal antar tick supaya input Tk tetap responsif
+SCHEDULER_LOAD_HIGH = 0.75  # lama tick / periode: di atas ini rekognisi diturunkan
+SCHEDULER_LOAD_LOW = 0.4  # di bawah ini rekognisi dinaikkan lagi
+
+# Settings Manager
+SETTINGS_FLUSH_DELAY = 1.0  # detik, perubahan setting dikumpulkan sebelum ditulis ke file
+
+# Recognition Worker Settings
+RESULT_MAX_AGE = 0.5  # detik, hasil lebih lama tidak di-overlay
+RECOGNITION_POOL_PROCESSES = 0  # 0 = otomatis (jumlah core - 1), < 2 = tanpa pool
+RECOGNITION_POOL_MIN_FACES = 2  # di bawah ini prediksi di thread worker saja
+
+# Face Tracking Settings (ROI antar full-frame scan)
+TRACK_FULL_SCAN_INTERVAL = 10  # full-frame scan setiap N frame
+TRACK_ROI_MARGIN = 0.5  # perluasan ROI per sisi, relatif ke ukuran box
+TRACK_SIZE_RANGE = (0.6, 1.6)  # rentang ukuran wajah yang dicari di ROI, relatif ke track
+TRACK_MAX_MISSES = 3  # track dibuang setelah N frame tidak ditemukan
+TRACK_IOU_THRESHOLD = 0.3
+TRACK_LOCK_CONFIDENCE = 50  # identitas dengan jarak <= ini tidak di-recognize ulang
+TRACK_RECHECK_SECONDS = 2.0  # identitas terkunci tetap dicek ulang setiap N detik
+
+# Headless Service / HTTP API (lihat backend/gate_service.py, backend/http_api.py)
+API_HOST = "127.0.0.1"  # hanya lokal; ganti "0.0.0.0" untuk layar kantor di jaringan
+API_PORT = 8080
+API_MAX_BODY_BYTES = 16 * 1024 * 1024  # batas body /enroll (foto base64)
+API_REQUEST_TIMEOUT = 10.0  # detik, batas baca satu request
+API_MAX_EVENTS = 500
+SERVICE_RESULT_MAX_AGE = 1.0  # detik, /recognitions kosong jika hasil lebih lama
+ENROLL_MIN_FACES = 3
+MULTI_CAMERA_WORKERS = 0  # thread rekognisi bersama semua kamera; 0 = otomatis (min(kamera, core))
+
+# Event Bus Settings (lihat backend/event_bus.py, backend/event_consumers.py)
+EVENT_QUEUE_SIZE = 256  # antrian per subscriber; jika penuh event dibuang sesuai drop policy
+EVENT_STOP_TIMEOUT = 2.0  # detik, batas menunggu consumer menghabiskan antrian saat stop
+OVERLAY_HOLD_SECONDS = 3.0  # banner "Selamat datang" tampil N detik setelah sighting terakhir
+WEBHOOK_URL = None  # mis. "http://127.0.0.1:8090/notify" (stub: python main.py --webhook-stub)
+WEBHOOK_STUB_PORT = 8090
+WEBHOOK_TIMEOUT = 3.0  # detik per request notifikasi
+WEBHOOK_DEBOUNCE_SECONDS = 5 * 60  # satu notifikasi per siswa per 5 menit
+
+# Attendance Log Settings
+ATTENDANCE_DEBOUNCE_SECONDS = 5 * 60  # satu "arrival" per siswa per 5 menit
+ATTENDANCE_FLUSH_INTERVAL = 2.0  # detik, commit batch ke SQLite
 
 # Colors
 COLOR_BLACK = "#000000"
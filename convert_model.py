@@ -0,0 +1,16 @@
+"""
+Face Gate Siswa - Konversi model YAML lama (face_model.yml) ke format biner
+"""
+import sys
+from backend.model_store import convert_legacy_model
+import config
+
+def main():
+    yaml_path = sys.argv[1] if len(sys.argv) > 1 else config.LEGACY_MODEL_FILE
+    labels_path = sys.argv[2] if len(sys.argv) > 2 else config.LABELS_FILE
+    
+    ok = convert_legacy_model(yaml_path, labels_path)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ Camera Frame Component - dengan Face Detection overlay
 """
 import tkinter as tk
 from PIL import Image, ImageTk, ImageEnhance
+import cv2
+import numpy as np
 import config
 import os
 
@@ -13,6 +15,9 @@ class CameraFrame(tk.Frame):
         
         self.on_settings_click = on_settings_click
         self.photo = None
+        self.compositor = FrameCompositor()
+        self.fps_label = None
+        self.banner_label = None
         self.settings_icon_normal = None
         self.settings_icon_hover = None
         self.is_hovering = False
@@ -93,6 +98,45 @@ class CameraFrame(tk.Frame):
             self.is_hovering = over_icon
             self.camera_label.config(cursor="hand2" if over_icon else "arrow")
     
+    def set_fps_text(self, text):
+        """Tampilkan (text) / sembunyikan (None) overlay FPS di pojok kiri bawah"""
+        if text is None:
+            if self.fps_label is not None:
+                self.fps_label.place_forget()
+            return
+        
+        if self.fps_label is None:
+            self.fps_label = tk.Label(
+                self,
+                bg=config.COLOR_BLACK,
+                fg=config.COLOR_SUCCESS,
+                font=(config.FONT_FAMILY, 9)
+            )
+        
+        if not self.fps_label.winfo_ismapped():
+            self.fps_label.place(x=10, rely=1.0, y=-10, anchor="sw")
+        self.fps_label.config(text=text)
+    
+    def set_banner(self, text, color=None):
+        """Tampilkan (text) / sembunyikan (None) banner di tengah atas"""
+        if text is None:
+            if self.banner_label is not None:
+                self.banner_label.place_forget()
+            return
+        
+        if self.banner_label is None:
+            self.banner_label = tk.Label(
+                self,
+                fg=config.COLOR_WHITE,
+                font=(config.FONT_FAMILY, 20, "bold"),
+                padx=20,
+                pady=8
+            )
+        
+        self.banner_label.config(text=text, bg=color or config.COLOR_PRIMARY)
+        if not self.banner_label.winfo_ismapped():
+            self.banner_label.place(relx=0.5, y=15, anchor="n")
+    
     def update_frame(self, frame, draw_icon=True):
         """Update camera display"""
         if frame is None:
@@ -105,35 +149,91 @@ class CameraFrame(tk.Frame):
             if display_w < 10 or display_h < 10:
                 return
             
-            # Convert to PIL
-            pil_image = Image.fromarray(frame)
-            img_w, img_h = pil_image.size
-            
-            # Calculate scale
-            scale = min(display_w / img_w, display_h / img_h)
-            new_w = int(img_w * scale)
-            new_h = int(img_h * scale)
-            
-            # Resize
-            resized = pil_image.resize((new_w, new_h), Image.Resampling.LANCZOS)
-            
-            # Create background
-            background = Image.new('RGBA', (display_w, display_h), (0, 0, 0, 255))
-            
-            # Center paste
-            offset_x = (display_w - new_w) // 2
-            offset_y = (display_h - new_h) // 2
-            background.paste(resized, (offset_x, offset_y))
-            
-            # Overlay settings icon
+            icon = None
             if draw_icon:
                 icon = self.settings_icon_hover if self.is_hovering else self.settings_icon_normal
-                if icon:
-                    background.paste(icon, (self.icon_x, self.icon_y), icon)
             
-            # Update
-            self.photo = ImageTk.PhotoImage(background)
-            self.camera_label.configure(image=self.photo)
+            canvas = self.compositor.render(frame, display_w, display_h, icon, (self.icon_x, self.icon_y))
+            image = Image.fromarray(canvas)
+            
+            # PhotoImage dibuat ulang hanya saat ukuran display berubah, selain itu paste()
+            if self.photo is None or (self.photo.width(), self.photo.height()) != (display_w, display_h):
+                self.photo = ImageTk.PhotoImage(image)
+                self.camera_label.configure(image=self.photo)
+            else:
+                self.photo.paste(image)
             
         except Exception as e:
-            pass
\ No newline at end of file
+            pass
+
+
+class FrameCompositor:
+    """
+    Frame RGB -> buffer display (letterbox + icon), tanpa alokasi per frame.
+    
+    Layout (skala, offset) dan buffer dihitung ulang hanya saat ukuran frame
+    atau display berubah. Icon RGBA di-premultiply sekali per icon, lalu
+    setiap frame cukup blend area kecil di bawah icon.
+    """
+    
+    def __init__(self):
+        self.canvas = None
+        self._layout_key = None
+        self._resized = None
+        self._region = None
+        self._icon = None
+        self._icon_blend = None
+        self._icon_area = None
+    
+    def _layout(self, frame_w, frame_h, display_w, display_h):
+        key = (frame_w, frame_h, display_w, display_h)
+        if key == self._layout_key:
+            return
+        
+        scale = min(display_w / frame_w, display_h / frame_h)
+        new_w = max(1, int(frame_w * scale))
+        new_h = max(1, int(frame_h * scale))
+        offset_x = (display_w - new_w) // 2
+        offset_y = (display_h - new_h) // 2
+        
+        self.canvas = np.zeros((display_h, display_w, 3), dtype=np.uint8)
+        self._resized = np.empty((new_h, new_w, 3), dtype=np.uint8)
+        self._region = (slice(offset_y, offset_y + new_h), slice(offset_x, offset_x + new_w))
+        self._layout_key = key
+        self._icon_area = None
+    
+    def _icon_arrays(self, icon):
+        """(premultiplied RGB, 255 - alpha) sebagai uint16, di-cache per icon"""
+        if icon is not self._icon:
+            rgba = np.asarray(icon.convert('RGBA'), dtype=np.uint16)
+            alpha = rgba[:, :, 3:4]
+            self._icon_blend = (rgba[:, :, :3] * alpha, 255 - alpha)
+            self._icon = icon
+        return self._icon_blend
+    
+    def render(self, frame, display_w, display_h, icon=None, icon_pos=(0, 0)):
+        """Return buffer RGB (display_h, display_w, 3) milik compositor"""
+        frame_h, frame_w = frame.shape[:2]
+        self._layout(frame_w, frame_h, display_w, display_h)
+        
+        # Area icon frame sebelumnya bisa jatuh di letterbox (tidak ditimpa frame) - reset dulu
+        if self._icon_area is not None:
+            self.canvas[self._icon_area] = 0
+            self._icon_area = None
+        
+        new_h, new_w = self._resized.shape[:2]
+        if (new_w, new_h) == (frame_w, frame_h):
+            self.canvas[self._region] = frame
+        else:
+            cv2.resize(frame, (new_w, new_h), dst=self._resized, interpolation=cv2.INTER_AREA)
+            self.canvas[self._region] = self._resized
+        
+        if icon is not None:
+            premultiplied, inverse_alpha = self._icon_arrays(icon)
+            x, y = icon_pos
+            self._icon_area = (slice(y, y + premultiplied.shape[0]), slice(x, x + premultiplied.shape[1]))
+            area = self.canvas[self._icon_area]
+            h, w = area.shape[:2]
+            area[...] = (area * inverse_alpha[:h, :w] + premultiplied[:h, :w] + 127) // 255
+        
+        return self.canvas
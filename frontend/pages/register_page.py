@@ -1,29 +1,35 @@
 """
 Register Page - Halaman Pendaftaran User
 """
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 import config
 import cv2
+from backend import FrameScheduler
 
 
 class RegisterPage(tk.Frame):
-    def __init__(self, parent, on_back, camera_handler, user_manager, face_recognition):
+    def __init__(self, parent, on_back, camera_handler, user_manager, face_recognition, scheduler=None):
         super().__init__(parent, bg=config.COLOR_SURFACE)
         
         self.on_back = on_back
         self.camera_handler = camera_handler
         self.user_manager = user_manager
         self.face_recognition = face_recognition
+        self.scheduler = scheduler or FrameScheduler()
         
         self.current_user = None
         self.capture_count = 0
         self.max_captures = 10
         self.is_capturing = False
         self.photo = None
+        self.preview_seq = 0
+        self.training_job = None
         
         self._create_ui()
+        self.scheduler.reset_display()
         self._update_preview()
     
     def _create_ui(self):
@@ -185,6 +191,13 @@ class RegisterPage(tk.Frame):
         self.btn_finish.pack(fill=tk.X)
         self.btn_finish.bind("<Button-1>", lambda e: self._finish_registration())
         
+        # Progress training (tampil saat enroll)
+        self.progress_training = ttk.Progressbar(
+            self.capture_frame,
+            orient=tk.HORIZONTAL,
+            mode="determinate"
+        )
+        
         # Status label
         self.lbl_status = tk.Label(
             form,
@@ -215,17 +228,27 @@ class RegisterPage(tk.Frame):
     
     def _update_preview(self):
         """Update camera preview"""
+        started = time.perf_counter()
+        rendered = False
+        
         try:
-            frame = self.camera_handler.get_frame()
+            # Slot dipinjam selama deteksi + konversi RGB (tidak ditimpa capture thread)
+            with self.camera_handler.borrow_frame() as (seq, latest):
+                # Hanya proses frame yang belum pernah ditampilkan
+                if latest is None or seq == self.preview_seq:
+                    frame = None
+                else:
+                    self.preview_seq = seq
+                    
+                    # Detect faces (grayscale di-cache di Frame)
+                    faces = self.face_recognition.detect_faces(latest)
+                    
+                    # Draw face rectangles (draw_faces membuat copy sendiri)
+                    frame = latest.rgb
+                    if len(faces) > 0:
+                        frame = self.face_recognition.draw_faces(frame, faces)
             
             if frame is not None:
-                # Detect faces
-                faces = self.face_recognition.detect_faces(frame)
-                
-                # Draw face rectangles
-                if len(faces) > 0:
-                    frame = self.face_recognition.draw_faces(frame, faces)
-                
                 # Resize for preview
                 preview_w = 170
                 preview_h = 130
@@ -236,12 +259,13 @@ class RegisterPage(tk.Frame):
                 
                 self.photo = ImageTk.PhotoImage(img)
                 self.preview_label.config(image=self.photo)
+                rendered = True
                 
         except Exception as e:
             pass
         
-        # Continue updating
-        self.after(50, self._update_preview)
+        # Continue updating (delay dari scheduler, tick yang terlambat dibuang)
+        self.after(self.scheduler.display_tick(started, rendered), self._update_preview)
     
     def _register_user(self):
         """Register new user"""
@@ -265,6 +289,9 @@ class RegisterPage(tk.Frame):
         
         # Add user
         self.current_user = self.user_manager.add_user(nama_ortu, nama_anak, kelas)
+        if self.current_user is None:
+            self._show_status("❌ Gagal menyimpan user!", config.COLOR_DANGER)
+            return
         
         # Show capture section
         self.btn_register.pack_forget()
@@ -282,29 +309,30 @@ class RegisterPage(tk.Frame):
         if not self.current_user:
             return
         
-        frame = self.camera_handler.get_frame()
-        if frame is None:
-            self._show_status("❌ Tidak ada frame kamera!", config.COLOR_DANGER)
-            return
-        
-        # Detect faces
-        faces = self.face_recognition.detect_faces(frame)
-        
-        if len(faces) == 0:
-            self._show_status("❌ Wajah tidak terdeteksi!", config.COLOR_DANGER)
-            return
-        
-        if len(faces) > 1:
-            self._show_status("❌ Terdeteksi lebih dari 1 wajah!", config.COLOR_DANGER)
-            return
-        
-        # Save face
-        count = self.face_recognition.save_face(
-            frame,
-            faces[0],
-            self.current_user["id"],
-            self.current_user["face_dir"]
-        )
+        # Frame dipinjam: deteksi dan crop yang disimpan dari frame yang sama
+        with self.camera_handler.borrow_frame() as (seq, frame):
+            if frame is None:
+                self._show_status("❌ Tidak ada frame kamera!", config.COLOR_DANGER)
+                return
+            
+            # Detect faces
+            faces = self.face_recognition.detect_faces(frame)
+            
+            if len(faces) == 0:
+                self._show_status("❌ Wajah tidak terdeteksi!", config.COLOR_DANGER)
+                return
+            
+            if len(faces) > 1:
+                self._show_status("❌ Terdeteksi lebih dari 1 wajah!", config.COLOR_DANGER)
+                return
+            
+            # Save face
+            count = self.face_recognition.save_face(
+                frame,
+                faces[0],
+                self.current_user["id"],
+                self.current_user["face_dir"]
+            )
         
         if count > 0:
             self.capture_count = count
@@ -321,14 +349,34 @@ class RegisterPage(tk.Frame):
             self._show_status("❌ Minimal capture 3 wajah!", config.COLOR_DANGER)
             return
         
-        # Train recognizer
+        if self.training_job is not None:
+            return
+        
+        # Enroll hanya user baru di background; kamera & rekognisi tetap jalan
         self._show_status("🔄 Training model...", config.COLOR_WARNING)
-        self.update()
+        self.progress_training.config(value=0, maximum=1)
+        self.progress_training.pack(fill=tk.X, pady=(10, 0))
+        
+        user = self.user_manager.get_user(self.current_user["id"])
+        self.training_job = self.face_recognition.start_job("add_user", user)
+        self._poll_training()
+    
+    def _poll_training(self):
+        """Update progress bar sampai training job selesai"""
+        job = self.training_job
+        if job is None:
+            return
+        
+        if not job.is_finished:
+            self.progress_training.config(value=job.done, maximum=max(1, job.total))
+            self._show_status(f"🔄 Training model... {job.done}/{job.total}", config.COLOR_WARNING)
+            self.after(100, self._poll_training)
+            return
         
-        users = self.user_manager.get_all_users()
-        success = self.face_recognition.train(users)
+        self.training_job = None
+        self.progress_training.pack_forget()
         
-        if success:
+        if job.status == job.DONE:
             messagebox.showinfo("Berhasil", f"User {self.current_user['nama_anak']} berhasil didaftarkan!")
             self._go_back()
         else:
@@ -341,4 +389,5 @@ class RegisterPage(tk.Frame):
     def _go_back(self):
         """Go back to main page"""
         self.is_capturing = False
+        self.training_job = None  # job tetap selesai di background
         self.on_back()
\ No newline at end of file
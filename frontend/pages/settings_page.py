@@ -12,6 +12,8 @@ class SettingsPage(tk.Frame):
         self.on_back = on_back
         self.camera_handler = camera_handler
         self.settings_manager = settings_manager
+        self.camera_scan = None          # thread discovery yang sedang jalan
+        self.camera_scan_result = None   # diisi callback dari thread discovery
         
         self._create_ui()
     
@@ -84,7 +86,7 @@ class SettingsPage(tk.Frame):
             bg=config.COLOR_WHITE
         ).pack(side=tk.LEFT)
         
-        # Use current camera index, don't scan for others yet
+        # Mulai dengan kamera aktif; daftar lengkap diisi scan di background
         current_cam = self.settings_manager.get_camera_index()
         
         self.camera_var = tk.StringVar(value=f"Kamera {current_cam}")
@@ -93,11 +95,11 @@ class SettingsPage(tk.Frame):
             textvariable=self.camera_var,
             values=[f"Kamera {current_cam}"],  # Start with current only
             state="readonly",
-            width=12
+            width=28
         )
         self.camera_combo.pack(side=tk.LEFT, padx=10)
         
-        # Refresh button - scan cameras only when clicked
+        # Refresh button - scan ulang tanpa cache
         refresh_btn = tk.Label(
             row1,
             text=" 🔄 ",
@@ -108,7 +110,7 @@ class SettingsPage(tk.Frame):
             padx=5
         )
         refresh_btn.pack(side=tk.LEFT, padx=2)
-        refresh_btn.bind("<Button-1>", lambda e: self._refresh_cameras())
+        refresh_btn.bind("<Button-1>", lambda e: self._refresh_cameras(refresh=True))
         
         # Apply button
         apply_btn = tk.Label(
@@ -124,6 +126,10 @@ class SettingsPage(tk.Frame):
         apply_btn.pack(side=tk.LEFT, padx=5)
         apply_btn.bind("<Button-1>", lambda e: self._apply_camera())
         
+        # Hasil cache (set device sama) langsung tampil, selain itu probe di background.
+        # after_idle: status label dibuat setelah section ini
+        self.after_idle(self._refresh_cameras)
+        
         # Row 2: Flip options
         row2 = tk.Frame(section, bg=config.COLOR_WHITE)
         row2.pack(fill=tk.X, pady=5)
@@ -234,25 +240,57 @@ class SettingsPage(tk.Frame):
         ).pack(side=tk.RIGHT)
     
     # ===== Handlers =====
-    def _refresh_cameras(self):
-        """Refresh camera list"""
+    def _refresh_cameras(self, refresh=False):
+        """Scan kamera di background (Tk tetap responsif), combobox diupdate saat selesai"""
+        if self.camera_scan is not None:
+            return
+        
         self._show_status("🔄 Mencari kamera...", config.COLOR_WARNING)
-        self.update()
+        self.camera_scan_result = None
+        self.camera_scan = self.camera_handler.discover_cameras_async(
+            self._on_cameras_found, refresh=refresh
+        )
+        self._poll_cameras()
+    
+    def _on_cameras_found(self, cameras):
+        # Dipanggil dari thread discovery: hanya simpan, widget diupdate oleh _poll_cameras
+        self.camera_scan_result = cameras
+    
+    def _poll_cameras(self):
+        """Tunggu hasil discovery lalu isi combobox (di thread Tk)"""
+        if not self.winfo_exists():
+            return
+        
+        cameras = self.camera_scan_result
+        if cameras is None:
+            self.after(100, self._poll_cameras)
+            return
         
-        # Clear cache and get cameras
-        from backend import CameraHandler
-        CameraHandler.clear_camera_cache()
+        self.camera_scan = None
+        self.camera_combo['values'] = [self._camera_label(camera) for camera in cameras]
         
-        cameras = self.camera_handler.get_available_cameras()
-        self.camera_combo['values'] = [f"Kamera {i}" for i in cameras]
+        # Label kamera aktif ikut nama device
+        current = self.settings_manager.get_camera_index()
+        for camera in cameras:
+            if camera["index"] == current:
+                self.camera_var.set(self._camera_label(camera))
         
         self._show_status(f"✅ Ditemukan {len(cameras)} kamera", config.COLOR_SUCCESS)
     
+    @staticmethod
+    def _camera_label(camera):
+        label = f"Kamera {camera['index']}"
+        if camera["name"] != label:
+            label += f" - {camera['name']}"
+        if camera.get("in_use"):
+            label += " (aktif)"
+        return label
+    
     def _apply_camera(self):
         """Apply camera selection"""
         try:
             selected = self.camera_var.get()
-            idx = int(selected.replace("Kamera ", ""))
+            idx = int(selected.split()[1])  # "Kamera 0 - <nama device>"
             
             if idx == self.camera_handler.camera_index:
                 self._show_status("ℹ️ Kamera sudah aktif", config.COLOR_SECONDARY)
@@ -272,12 +310,10 @@ class SettingsPage(tk.Frame):
     def _on_flip_h(self):
         val = self.flip_h_var.get()
         self.settings_manager.set_camera_flip_horizontal(val)
-        self.camera_handler.flip_horizontal = val
     
     def _on_flip_v(self):
         val = self.flip_v_var.get()
         self.settings_manager.set_camera_flip_vertical(val)
-        self.camera_handler.flip_vertical = val
     
     def _on_fullscreen(self):
         self.settings_manager.set_fullscreen(self.fullscreen_var.get())
@@ -288,7 +324,12 @@ class SettingsPage(tk.Frame):
     def _reset(self):
         if messagebox.askyesno("Konfirmasi", "Reset semua pengaturan?"):
             self.settings_manager.reset_to_default()
-            messagebox.showinfo("Info", "Pengaturan direset. Restart aplikasi.")
+            self.flip_h_var.set(self.settings_manager.get_camera_flip_horizontal())
+            self.flip_v_var.set(self.settings_manager.get_camera_flip_vertical())
+            self.fullscreen_var.set(self.settings_manager.get_fullscreen())
+            self.fps_var.set(self.settings_manager.get_show_fps())
+            self.camera_var.set(f"Kamera {self.settings_manager.get_camera_index()}")
+            messagebox.showinfo("Info", "Pengaturan direset.")
     
     def _show_status(self, text, color):
         self.status_label.config(text=text, fg=color)
@@ -1,10 +1,13 @@
 """
 Main UI - dengan Button Panel dan Face Recognition
 """
+import time
 import tkinter as tk
 from .components import CameraFrame, ButtonPanel
 from .pages import SettingsPage, RegisterPage
-from backend import CameraHandler, SettingsManager, UserManager, FaceRecognition
+from backend import (CameraHandler, SettingsManager, UserManager, FaceRecognition,
+                     RecognitionWorker, AttendanceLog, FrameScheduler, RecognitionPool, EventBus)
+from backend.event_consumers import OverlayConsumer, AttendanceConsumer, WebhookConsumer, MetricsConsumer
 import config
 
 
@@ -16,14 +19,20 @@ class MainUI:
         self.button_panel = None
         self.is_main_page = False
         self.scan_active = False
+        self.last_display_key = None
+        self.last_banner = None
+        self.fps_updated_at = 0.0
         
         # Setup window
         self._setup_window()
         
         # Initialize managers
         self.settings_manager = SettingsManager()
-        self.user_manager = UserManager()
+        self.attendance_log = AttendanceLog()
+        self.attendance_log.start()
+        self.user_manager = UserManager(attendance_log=self.attendance_log)
         self.face_recognition = FaceRecognition()
+        self.user_manager.add_delete_callback(self.face_recognition.remove_user)
         
         # Initialize camera
         self.camera_handler = CameraHandler(
@@ -34,11 +43,34 @@ class MainUI:
         self.camera_handler.flip_horizontal = self.settings_manager.get_camera_flip_horizontal()
         self.camera_handler.flip_vertical = self.settings_manager.get_camera_flip_vertical()
         
+        # Event bus: hasil rekognisi & status kamera ke overlay, attendance, webhook, metrics
+        self._start_event_bus()
+        
+        # Tuning deteksi/rekognisi dari settings (berubah live lewat subscriber)
+        for key, value in self.settings_manager.get_recognition_settings().items():
+            self.face_recognition.apply_settings(key, value)
+        self._subscribe_settings()
+        
         # Start camera
         self.camera_handler.start()
         
-        # Train face recognition if users exist
-        self._train_recognizer()
+        # Sync model dengan dataset di background; worker mulai dengan generasi model sebelumnya
+        self._sync_recognizer()
+        
+        # Process pool untuk frame dengan banyak wajah (nonaktif di mesin 1-2 core)
+        self.recognition_pool = RecognitionPool()
+        if self.recognition_pool.start():
+            self.face_recognition.recognition_pool = self.recognition_pool
+        
+        # Scheduler bersama loop display & recognition worker
+        self.frame_scheduler = FrameScheduler()
+        
+        # Start recognition worker (scan off sampai tombol ditekan)
+        self.recognition_worker = RecognitionWorker(
+            self.camera_handler, self.face_recognition, scheduler=self.frame_scheduler,
+            event_bus=self.event_bus
+        )
+        self.recognition_worker.start()
         
         # Show main page
         self._show_main_page()
@@ -69,11 +101,25 @@ class MainUI:
         y = (self.root.winfo_screenheight() - config.SCREEN_HEIGHT) // 2
         self.root.geometry(f"+{x}+{y}")
     
-    def _train_recognizer(self):
-        """Train face recognizer"""
+    def _start_event_bus(self):
+        """Consumer dengan antrian sendiri - yang lambat tidak menahan kamera / UI"""
+        self.event_bus = EventBus()
+        self.overlay = OverlayConsumer()
+        self.overlay.attach(self.event_bus)
+        AttendanceConsumer(self.user_manager).attach(self.event_bus)
+        self.metrics = MetricsConsumer()
+        self.metrics.attach(self.event_bus)
+        if config.WEBHOOK_URL:
+            WebhookConsumer().attach(self.event_bus)
+        
+        self.event_bus.start()
+        self.camera_handler.event_bus = self.event_bus
+    
+    def _sync_recognizer(self):
+        """Sync model dengan data/faces sebagai background job (hanya user yang berubah di-train)"""
         users = self.user_manager.get_all_users()
         if users:
-            self.face_recognition.train(users)
+            self.face_recognition.start_job("sync", users)
     
     def _show_main_page(self):
         """Show main page"""
@@ -83,6 +129,10 @@ class MainUI:
             self.current_page.destroy()
         
         self.is_main_page = True
+        self.last_display_key = None
+        self.last_banner = None
+        self.fps_updated_at = 0.0
+        self.frame_scheduler.reset_display()
         
         # Main container
         self.current_page = tk.Frame(self.root, bg=config.COLOR_BLACK)
@@ -142,14 +192,18 @@ class MainUI:
             on_back=self._on_register_back,
             camera_handler=self.camera_handler,
             user_manager=self.user_manager,
-            face_recognition=self.face_recognition
+            face_recognition=self.face_recognition,
+            scheduler=self.frame_scheduler
         )
         self.current_page.pack(fill=tk.BOTH, expand=True)
     
     def _on_register_back(self):
         """Callback when back from register"""
-        # Retrain recognizer
-        self._train_recognizer()
+        # User baru sudah di-enroll RegisterPage; sync di background hanya
+        # menangkap foto yang belum masuk model (mis. kembali sebelum selesai)
+        users = self.user_manager.get_all_users()
+        if users:
+            self.face_recognition.start_job("sync", users)
         self._show_main_page()
     
     def _show_info(self):
@@ -166,56 +220,128 @@ class MainUI:
         for user in users:
             info += f"• {user['nama_anak']} ({user['kelas']})\n"
             info += f"  Ortu: {user['nama_ortu']}\n"
-            info += f"  Foto: {user['face_count']} wajah\n\n"
+            info += f"  Foto: {user['face_count']} wajah\n"
+            
+            last_seen = self.user_manager.get_last_seen(user['id'])
+            if last_seen:
+                info += f"  Terakhir: {last_seen[:16].replace('T', ' ')}\n"
+            info += "\n"
         
         messagebox.showinfo("Daftar User", info)
     
     def _on_scan_toggle(self, active):
         """Handle scan toggle"""
         self.scan_active = active
+        self.recognition_worker.set_active(active)
         print(f"🔍 Scan: {'ON' if active else 'OFF'}")
     
     def _update_loop(self):
         """Update camera display"""
+        started = time.perf_counter()
+        rendered = False
+        
         try:
             if self.is_main_page and self.camera_frame:
-                frame = self.camera_handler.get_frame()
-                
-                if frame is not None:
-                    # If scanning, detect and recognize faces
-                    if self.scan_active:
-                        faces = self.face_recognition.detect_faces(frame)
+                # Slot dipinjam selama konversi RGB (tidak ditimpa capture thread)
+                with self.camera_handler.borrow_frame() as (seq, latest):
+                    if latest is not None:
+                        result = None
+                        if self.scan_active:
+                            result = self.recognition_worker.get_result(max_age=config.RESULT_MAX_AGE)
                         
-                        if len(faces) > 0:
-                            recognized = []
-                            for face in faces:
-                                user, conf = self.face_recognition.recognize(frame, face)
-                                recognized.append((user, conf))
-                                
-                                # Update last seen
-                                if user:
-                                    self.user_manager.update_last_seen(user["id"])
+                        # Frame & overlay sama dengan yang sudah ditampilkan - tidak perlu render ulang
+                        display_key = (seq, result.result_id if result is not None else None)
+                        if display_key != self.last_display_key:
+                            self.last_display_key = display_key
                             
-                            frame = self.face_recognition.draw_faces(frame, faces, recognized)
-                    
-                    self.camera_frame.update_frame(frame)
+                            # RGB di-cache di Frame; draw_faces membuat copy sendiri
+                            frame = latest.rgb
+                            
+                            # If scanning, overlay hasil terakhir dari recognition worker
+                            if result is not None and result.faces:
+                                frame = self.face_recognition.draw_faces(frame, result.faces, result.recognized)
+                            
+                            self.camera_frame.update_frame(frame)
+                            rendered = True
+                
+                self._update_fps_overlay()
+                self._update_banner()
                     
         except tk.TclError:
             pass
         except Exception as e:
             pass
         
-        self.root.after(33, self._update_loop)
+        # Halaman lain (register/settings) punya loop sendiri - cukup cek berkala
+        if not self.is_main_page:
+            self.root.after(100, self._update_loop)
+            return
+        
+        # Delay berikutnya dihitung dari lama tick ini (tick yang terlambat dibuang)
+        self.root.after(self.frame_scheduler.display_tick(started, rendered), self._update_loop)
+    
+    def _update_fps_overlay(self):
+        """Overlay FPS display & rekognisi terukur (setting show_fps)"""
+        if not self.settings_manager.get_show_fps():
+            self.camera_frame.set_fps_text(None)
+            return
+        
+        now = time.time()
+        if now - self.fps_updated_at < 0.5:
+            return
+        self.fps_updated_at = now
+        
+        rates = self.frame_scheduler.get_rates()
+        text = f"Display {rates['display_fps']:.1f} fps"
+        if self.scan_active:
+            text += f"  |  Scan {rates['recognition_fps']:.1f} fps"
+        self.camera_frame.set_fps_text(text)
+    
+    def _update_banner(self):
+        """Banner dari event bus: siswa terakhir dikenali / kamera terputus"""
+        banner = self.overlay.get_banner()
+        if banner is not None and banner[1] != config.COLOR_DANGER and not self.scan_active:
+            banner = None
+        if banner != self.last_banner:
+            self.last_banner = banner
+            self.camera_frame.set_banner(*(banner or (None,)))
+    
+    def _subscribe_settings(self):
+        """Kamera, rekognisi & tampilan mengikuti perubahan setting tanpa restart"""
+        settings = self.settings_manager
+        settings.subscribe(self._on_camera_setting,
+                           ("camera_index", "flip_horizontal", "flip_vertical"))
+        settings.subscribe(self.face_recognition.apply_settings,
+                           settings.get_recognition_settings().keys())
+        settings.subscribe(lambda key, value: self._set_fullscreen(value), ("fullscreen",))
+    
+    def _on_camera_setting(self, key, value):
+        if key == "camera_index":
+            self.camera_handler.change_camera(value)
+        elif key == "flip_horizontal":
+            self.camera_handler.flip_horizontal = value
+        elif key == "flip_vertical":
+            self.camera_handler.flip_vertical = value
+    
+    def _set_fullscreen(self, value):
+        self.is_fullscreen = value
+        self.root.attributes('-fullscreen', value)
+        print(f"🖥️ Fullscreen: {'ON' if value else 'OFF'}")
     
     def _toggle_fullscreen(self):
         """Toggle fullscreen"""
-        self.is_fullscreen = not self.is_fullscreen
-        self.root.attributes('-fullscreen', self.is_fullscreen)
-        self.settings_manager.set_fullscreen(self.is_fullscreen)
-        print(f"🖥️ Fullscreen: {'ON' if self.is_fullscreen else 'OFF'}")
+        self.settings_manager.set_fullscreen(not self.is_fullscreen)
     
     def _on_close(self):
         """Close app"""
         print("👋 Closing...")
+        # Lepas pool dulu: rekognisi yang masih jalan (preview, job) kembali ke jalur in-process
+        self.face_recognition.recognition_pool = None
+        self.recognition_worker.stop()
+        self.face_recognition.cancel_jobs()
+        self.recognition_pool.stop()
         self.camera_handler.stop()
+        self.event_bus.stop()
+        self.attendance_log.stop()
+        self.settings_manager.close()
         self.root.destroy()
\ No newline at end of file
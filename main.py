@@ -1,24 +1,102 @@
 """
 Face Gate Siswa - Main Entry Point
+
+    python main.py                              UI Tkinter
+    python main.py --headless                   tanpa display + HTTP API lokal
+    python main.py --headless --source gate.mp4 pakai video rekaman sebagai kamera
+    python main.py --headless --source masuk=0 --source keluar=1
+                                                beberapa kamera gate dalam satu proses
+    python main.py --headless --source synthetic --pacing fast --start-time 0
+                                                tanpa kamera (CI / profiling, timestamp deterministik)
+    python main.py --webhook-stub               penerima webhook lokal (config.WEBHOOK_URL)
 """
-import tkinter as tk
-from frontend import MainUI
+import argparse
+import asyncio
 import config
 
+def run_ui():
+    import tkinter as tk
+    from frontend import MainUI
+
+    print("Press ESC to exit | Press F for fullscreen")
+    print("=" * 50)
+
+    root = tk.Tk()
+    app = MainUI(root)
+    root.mainloop()
+
+def run_headless(source, host, port, pacing=None, loop=None, start_time=None):
+    from backend import GateService, GateAPI
+
+    print(f"🌐 Headless mode, cameras: {'settings' if source is None else source}")
+    print("=" * 50)
+
+    service = GateService(source=source, pacing=pacing, loop=loop, start_time=start_time)
+    api = GateAPI(service, host=host, port=port)
+    service.start()
+    try:
+        asyncio.run(api.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+
+def run_webhook_stub(port):
+    from backend.http_api import WebhookStub
+
+    stub = WebhookStub(port=port)
+    try:
+        asyncio.run(stub.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+def parse_source(value):
+    """Index kamera (angka) atau path file video, opsional dengan id: masuk=0"""
+    camera_id, sep, source = value.partition("=")
+    if not sep:
+        camera_id, source = None, value
+    return camera_id, int(source) if source.isdigit() else source
+
+def source_map(sources):
+    """[(id, sumber), ...] dari --source -> argumen GateService"""
+    if not sources:
+        return None
+    return {camera_id if camera_id is not None else str(source): source
+            for camera_id, source in sources}
+
 def main():
+    parser = argparse.ArgumentParser(description=config.APP_NAME)
+    parser.add_argument("--headless", action="store_true", help="jalankan tanpa UI + HTTP API")
+    parser.add_argument("--source", type=parse_source, action="append",
+                        help="[id=]index kamera, file video, folder gambar atau 'synthetic'; "
+                             "bisa diulang untuk beberapa kamera (default: dari settings)")
+    parser.add_argument("--pacing", choices=("realtime", "fast"), default=None,
+                        help=f"tempo sumber non-device (default: {config.SOURCE_PACING})")
+    parser.add_argument("--no-loop", dest="loop", action="store_false", default=None,
+                        help="jangan putar ulang file / folder saat habis")
+    parser.add_argument("--start-time", type=float, default=None,
+                        help="timestamp frame pertama sumber non-device (default: waktu start)")
+    parser.add_argument("--webhook-stub", action="store_true",
+                        help="hanya jalankan penerima webhook lokal untuk uji notifikasi")
+    parser.add_argument("--host", default=config.API_HOST)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+
     print("=" * 50)
     print(f"🚀 {config.APP_NAME} v{config.APP_VERSION}")
     print(f"📺 Window: {config.SCREEN_WIDTH}x{config.SCREEN_HEIGHT}")
     print(f"📷 Camera: {config.CAMERA_WIDTH}x{config.CAMERA_HEIGHT}")
     print("=" * 50)
-    print("Press ESC to exit | Press F for fullscreen")
-    print("=" * 50)
-    
-    root = tk.Tk()
-    app = MainUI(root)
-    root.mainloop()
-    
+
+    if args.webhook_stub:
+        run_webhook_stub(config.WEBHOOK_STUB_PORT if args.port is None else args.port)
+    elif args.headless:
+        run_headless(source_map(args.source), args.host, config.API_PORT if args.port is None else args.port,
+                     pacing=args.pacing, loop=args.loop, start_time=args.start_time)
+    else:
+        run_ui()
+
     print("✅ Application closed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()